@@ -1,6 +1,52 @@
+import sys
+
+import click
 from src import create_app
+from src.api.figures.perft import REFERENCE_POSITIONS, run_perft
 
 app = create_app()
 
+
+@app.cli.command("perft")
+@click.option("--fen", default=None, help="Position in Forsyth-Edwards Notation.")
+@click.option("--depth", default=3, show_default=True, help="Plies to enumerate.")
+def perft_command(fen, depth):
+    """Count perft nodes of the position or benchmark the reference positions"""
+    if fen is not None:
+        try:
+            nodes, seconds = run_perft(fen=fen, depth=depth)
+        except ValueError as error:
+            raise click.BadParameter(str(error), param_hint="--fen")
+        nodes_per_second = int(nodes / seconds) if seconds else 0
+        click.echo(f"nodes {nodes} in {seconds:.3f}s ({nodes_per_second} nps)")
+        return
+
+    failed = False
+    total_nodes, total_seconds = 0, 0.0
+    for name, reference_fen, expected in REFERENCE_POSITIONS:
+        for reference_depth, expected_nodes in enumerate(expected[:depth], 1):
+            nodes, seconds = run_perft(fen=reference_fen, depth=reference_depth)
+            total_nodes += nodes
+            total_seconds += seconds
+            status = "ok" if nodes == expected_nodes else f"FAIL ({expected_nodes})"
+            failed = failed or nodes != expected_nodes
+            click.echo(
+                f"{name:<12} depth {reference_depth} nodes {nodes:<9} "
+                f"{seconds:.3f}s {status}",
+            )
+    nodes_per_second = int(total_nodes / total_seconds) if total_seconds else 0
+    click.echo(f"total {total_nodes} nodes ({nodes_per_second} nps)")
+    if failed:
+        sys.exit(1)
+
+
+@app.cli.command("serve")
+def serve_command():
+    """Run the application in the production server with pre-forked workers"""
+    from src.server import ProductionServer
+
+    ProductionServer(app).run()
+
+
 if __name__ == "__main__":
     app.run(host="0.0.0.0")
@@ -6,11 +6,18 @@ from flask import Flask
 def create_app(script_info=None):
     app = Flask(__name__)
 
-    app_settings = os.getenv("APP_SETTINGS")
+    app_settings = os.getenv("APP_SETTINGS", "src.config.DevelopmentConfig")
     app.config.from_object(app_settings)
 
     from src.api import api
+    from src.api.figures.transposition import legal_moves_table, perft_table
+    from src.api.metrics import metrics
+    from src.api.moves.cache import moves_cache
 
     api.init_app(app)
+    moves_cache.init_app(app)
+    metrics.init_app(app)
+    perft_table.init_app(app)
+    legal_moves_table.init_app(app, config_key="LEGAL_MOVES_TABLE_SIZE")
 
     return app
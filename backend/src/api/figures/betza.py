@@ -0,0 +1,253 @@
+"""Compiler of the Betza notation describing how the figures move"""
+from typing import NamedTuple, Tuple
+
+from src.api.figures.board import STANDARD_BOARD, Board
+
+# Leap of every atom as (row, col) offset, the other leaps are its symmetries
+ATOMS = {
+    "W": (0, 1),
+    "F": (1, 1),
+    "D": (0, 2),
+    "N": (1, 2),
+    "A": (2, 2),
+    "H": (0, 3),
+    "C": (1, 3),
+    "L": (1, 3),
+    "Z": (2, 3),
+    "J": (2, 3),
+    "G": (3, 3),
+}
+# Shorthands of the compound atoms as their atoms and True if they are riders
+SHORTHANDS = {
+    "K": (("W", "F"), False),
+    "R": (("W",), True),
+    "B": (("F",), True),
+    "Q": (("W", "F"), True),
+}
+
+DIRECTIONS = "fblrvs"
+MODES = "mc"
+# Row index of the initial squares, where the moves with "i" modifier are allowed
+INITIAL_ROW = 1
+
+
+class Movement(NamedTuple):
+    """Compiled component of the notation, a leaper or a rider"""
+
+    leaps: Tuple[Tuple[int, int], ...]
+    # 1 for leapers, the number of steps for limited riders, 0 if unlimited
+    max_range: int
+    moves: bool
+    captures: bool
+    initial: bool
+
+
+def symmetric_leaps(leap: Tuple[int, int]) -> Tuple[Tuple[int, int], ...]:
+    """
+    Helper method to collect all symmetries of the leap
+
+    :param leap: leap of the atom as (row, col) offset
+    :return: distinct leaps in all directions
+    """
+    row, col = leap
+    leaps = []
+    for candidate in (
+        (row, col),
+        (col, row),
+        (col, -row),
+        (row, -col),
+        (-row, -col),
+        (-col, -row),
+        (-col, row),
+        (-row, col),
+    ):
+        if candidate not in leaps:
+            leaps.append(candidate)
+    return tuple(leaps)
+
+
+def match_direction(leap: Tuple[int, int], letter: str, doubled: bool) -> bool:
+    """
+    Helper method to check if the leap goes in the direction of the modifier letter.
+    Doubled letter selects only the leaps leaning the most to the direction
+
+    :param leap: leap as (row, col) offset, rows grow forward
+    :param letter: directional modifier
+    :param doubled: True if the letter is doubled
+    :return: True if matches, False if not
+    """
+    row, col = leap
+    vertical, sideways = abs(row) > abs(col), abs(col) > abs(row)
+    matches = {
+        "f": row > 0,
+        "b": row < 0,
+        "l": col < 0,
+        "r": col > 0,
+        "v": col == 0 or vertical,
+        "s": row == 0 or sideways,
+    }[letter]
+    if doubled:
+        return matches and (vertical if letter in "fbv" else sideways)
+    return matches
+
+
+def select_leaps(
+    leaps: Tuple[Tuple[int, int], ...],
+    directions: str,
+) -> Tuple[Tuple[int, int], ...]:
+    """
+    Helper method to select the leaps of the directional modifiers. Every pair of
+    vertical and horizontal letter (e.g. "fl") selects the leaps matching both
+    of them, if there are any, otherwise the leaps matching either of them
+
+    :param leaps: all leaps of the atom
+    :param directions: directional modifiers of the component
+    :return: selected leaps, all of them if there are no directional modifiers
+    """
+    if not directions:
+        return leaps
+
+    groups = []
+    index = 0
+    while index < len(directions):
+        letter = directions[index]
+        following = directions[index + 1] if index + 1 < len(directions) else ""
+        if following == letter:
+            groups.append(((letter, True),))
+            index += 2
+        elif letter in "fbv" and following and following in "lrs":
+            groups.append(((letter, False), (following, False)))
+            index += 2
+        else:
+            groups.append(((letter, False),))
+            index += 1
+
+    selected = set()
+    for group in groups:
+        matching = {
+            leap
+            for leap in leaps
+            if all(match_direction(leap, letter, doubled) for letter, doubled in group)
+        }
+        if not matching:
+            matching = {
+                leap
+                for leap in leaps
+                if any(
+                    match_direction(leap, letter, doubled) for letter, doubled in group
+                )
+            }
+        selected |= matching
+    return tuple(leap for leap in leaps if leap in selected)
+
+
+def compile_betza(notation: str) -> Tuple[Movement, ...]:
+    """
+    Compile the Betza notation to the movement components of the figure.
+    Supported are the atoms W, F, D, N, A, H, C (L), Z (J), G, shorthands K, R,
+    B, Q with the riders R, B, Q, riders (doubled atom or range digits),
+    directional modifiers f, b, l, r, v, s, modes m (move only) and c (capture
+    only), initial i and lame n modifiers. Modifiers of a shorthand apply to all
+    its atoms. Lame modifier does not restrict the moves on the empty board
+
+    :param notation: Betza notation, e.g. "QN" for the amazon
+    :return: movement components of the figure
+    """
+    movements = []
+    index = 0
+    while index < len(notation):
+        modifiers = ""
+        while index < len(notation) and notation[index].islower():
+            modifiers += notation[index]
+            index += 1
+        letter = notation[index] if index < len(notation) else ""
+        if letter in ATOMS:
+            atoms, rider = (letter,), False
+        elif letter in SHORTHANDS:
+            atoms, rider = SHORTHANDS[letter]
+        else:
+            raise ValueError(f"Betza notation - {notation} - is not valid.")
+        index += 1
+
+        max_range = 0 if rider else 1
+        suffix = notation[index] if index < len(notation) else ""
+        if suffix == letter and not rider:
+            max_range = 0
+            index += 1
+        elif suffix.isdigit():
+            digits = ""
+            while index < len(notation) and notation[index].isdigit():
+                digits += notation[index]
+                index += 1
+            max_range = int(digits)
+
+        unknown = set(modifiers) - set(DIRECTIONS + MODES + "in")
+        if unknown:
+            raise ValueError(f"Betza notation - {notation} - is not valid.")
+        modes = "".join(letter for letter in modifiers if letter in MODES) or MODES
+        directions = "".join(letter for letter in modifiers if letter in DIRECTIONS)
+        # Modifiers of the shorthand apply to every atom of its expansion
+        for atom in atoms:
+            movements.append(
+                Movement(
+                    leaps=select_leaps(
+                        leaps=symmetric_leaps(leap=ATOMS[atom]),
+                        directions=directions,
+                    ),
+                    max_range=max_range,
+                    moves="m" in modes,
+                    captures="c" in modes,
+                    initial="i" in modifiers,
+                ),
+            )
+    return tuple(movements)
+
+
+def betza_moves_mask(
+    square: int,
+    movements: Tuple[Movement, ...],
+    board: Board = STANDARD_BOARD,
+) -> int:
+    """
+    Helper method to collect all available moves of the compiled figure on
+    the empty board, where the capture only components have no moves
+
+    :param square: index of the square
+    :param movements: movement components of the figure
+    :param board: geometry of the board
+    :return: bitboard of available moves for the current position
+    """
+    mask = 0
+    curr_row, curr_col = board.square_to_indexes(square=square)
+    for movement in movements:
+        if not movement.moves or (movement.initial and curr_row != INITIAL_ROW):
+            continue
+        for row_step, col_step in movement.leaps:
+            temp_row, temp_col, steps = curr_row, curr_col, 0
+            while not movement.max_range or steps < movement.max_range:
+                temp_row += row_step
+                temp_col += col_step
+                steps += 1
+                if not board.check_if_figure_in_board(row=temp_row, col=temp_col):
+                    break
+                mask |= board.square_masks[
+                    board.indexes_to_square(row=temp_row, col=temp_col)
+                ]
+    return mask
+
+
+def build_betza_moves_masks(
+    movements: Tuple[Movement, ...],
+    board: Board = STANDARD_BOARD,
+) -> Tuple[int, ...]:
+    """
+    Precompute the bitboards of available moves of the compiled figure
+
+    :param movements: movement components of the figure
+    :param board: geometry of the board
+    :return: bitboards of available moves indexed by square
+    """
+    return tuple(
+        betza_moves_mask(square=square, movements=movements, board=board)
+        for square in range(board.size)
+    )
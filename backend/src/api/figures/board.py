@@ -0,0 +1,188 @@
+"""Geometry of the boards of any size, shared by the queries of the same size"""
+from collections import OrderedDict
+from functools import lru_cache
+from sys import intern
+from threading import Lock
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+# Files are named with consecutive letters, so boards have at most 26 files
+FILES = "abcdefghijklmnopqrstuvwxyz"
+MAX_BOARD_SIZE = len(FILES)
+# Number of boards of other than standard size whose tables are kept in memory
+MAX_CACHED_BOARDS = 8
+
+
+class Board:
+    """
+    Geometry of the board with given number of files and ranks. Squares are indexed
+    from 0 (a1) rank by rank, so the square of row (rank) index and column (file)
+    index is row * files + col. Sets of squares are represented as integers
+    (bitboards) with bit n set for square n, not limited to 64 bits
+    """
+
+    __slots__ = (
+        "files",
+        "ranks",
+        "size",
+        "square_masks",
+        "square_names",
+        "fields_to_squares",
+    )
+
+    def __init__(self, files: int, ranks: int):
+        if not (1 <= files <= MAX_BOARD_SIZE and 1 <= ranks <= MAX_BOARD_SIZE):
+            raise ValueError("Board size is not valid.")
+        self.files = files
+        self.ranks = ranks
+        self.size = files * ranks
+        self.square_masks: Tuple[int, ...] = tuple(
+            1 << square for square in range(self.size)
+        )
+        # Names are interned, so the responses share the same string constants
+        self.square_names: Tuple[str, ...] = tuple(
+            intern(FILES[col] + str(row + 1))
+            for row in range(ranks)
+            for col in range(files)
+        )
+        self.fields_to_squares: Dict[str, int] = {
+            name: square for square, name in enumerate(self.square_names)
+        }
+
+    def __repr__(self) -> str:
+        return f"Board({self.files}x{self.ranks})"
+
+    def check_if_figure_in_board(self, row: int, col: int) -> bool:
+        """
+        Helper method to check if the current position of figure is in board
+
+        :param row: index of row
+        :param col: index of column
+        :return: True if valid, False if not valid
+        """
+        return 0 <= row < self.ranks and 0 <= col < self.files
+
+    def square_to_indexes(self, square: int) -> Tuple[int, int]:
+        """
+        Helper method to change the square index to row and column indices
+
+        :param square: index of the square
+        :return: row and column indices of the square
+        """
+        return divmod(square, self.files)
+
+    def indexes_to_square(self, row: int, col: int) -> int:
+        """
+        Helper method to change row and column indices to the square index
+
+        :param row: index of row
+        :param col: index of column
+        :return: index of the square
+        """
+        return row * self.files + col
+
+    def field_to_square(self, field: str) -> int:
+        """
+        Helper method to change the string representation of position to square index
+
+        :param field: current position on the board represented in string
+        :return: index of the square
+        """
+        try:
+            return self.fields_to_squares[field]
+        except KeyError:
+            raise ValueError("Field does not exist.")
+
+
+@lru_cache(maxsize=MAX_CACHED_BOARDS)
+def build_board(files: int, ranks: int) -> Board:
+    """
+    Helper method to compute the geometry of the board of other than standard size,
+    the recently used ones are kept as there are hundreds of the sizes
+
+    :param files: number of files (columns) of the board
+    :param ranks: number of ranks (rows) of the board
+    :return: geometry of the board
+    """
+    return Board(files=files, ranks=ranks)
+
+
+def get_board(files: int = 8, ranks: int = 8) -> Board:
+    """
+    Retrieve the shared geometry of the board, computed on its first use
+
+    :param files: number of files (columns) of the board
+    :param ranks: number of ranks (rows) of the board
+    :return: geometry of the board
+    """
+    if files == STANDARD_BOARD.files and ranks == STANDARD_BOARD.ranks:
+        return STANDARD_BOARD
+    return build_board(files=files, ranks=ranks)
+
+
+def parse_board_size(board_size: str) -> Board:
+    """
+    Helper method to retrieve the board of the size given as <files>x<ranks>
+
+    :param board_size: size of the board, e.g. 10x10
+    :return: geometry of the board
+    """
+    files, separator, ranks = board_size.lower().partition("x")
+    if not separator or not files.isdigit() or not ranks.isdigit():
+        raise ValueError("Board size is not valid.")
+    return get_board(files=int(files), ranks=int(ranks))
+
+
+STANDARD_BOARD = Board(files=8, ranks=8)
+
+
+class BoardCache:
+    """
+    Thread safe cache of the tables computed per board. Tables of the standard
+    board are kept for the lifetime of the process, tables of the other sizes
+    are bounded and evicted least recently used first, since any of the sizes
+    may be requested
+    """
+
+    def __init__(self, max_size: int = MAX_CACHED_BOARDS):
+        self.max_size = max_size
+        self._standard: Dict[Hashable, Any] = {}
+        self._others: "OrderedDict[Tuple[Board, Hashable], Any]" = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, board: Board, key: Hashable = None) -> Optional[Any]:
+        """
+        Retrieve the tables of the board and mark them as recently used
+
+        :param board: geometry of the board
+        :param key: key of the tables within the board
+        :return: tables or None if they are not cached
+        """
+        if board is STANDARD_BOARD:
+            return self._standard.get(key)
+        with self._lock:
+            value = self._others.get((board, key))
+            if value is not None:
+                self._others.move_to_end((board, key))
+            return value
+
+    def set(self, board: Board, value: Any, key: Hashable = None) -> Any:
+        """
+        Store the tables of the board, evicting the least recently used ones if full
+
+        :param board: geometry of the board
+        :param value: tables of the board
+        :param key: key of the tables within the board
+        :return: the stored tables
+        """
+        if board is STANDARD_BOARD:
+            self._standard[key] = value
+            return value
+        with self._lock:
+            self._others[(board, key)] = value
+            self._others.move_to_end((board, key))
+            while len(self._others) > self.max_size:
+                self._others.popitem(last=False)
+        return value
+
+    def __len__(self) -> int:
+        return len(self._standard) + len(self._others)
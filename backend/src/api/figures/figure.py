@@ -1,248 +1,323 @@
 from abc import ABC, abstractmethod
-from typing import List, Union
+from typing import NamedTuple, Tuple, Type
 
+from src.api.figures.betza import Movement, build_betza_moves_masks, compile_betza
+from src.api.figures.board import STANDARD_BOARD, Board, BoardCache
 from src.api.figures.utils import (
-    check_if_valid_field,
-    check_if_valid_move_pawn,
-    check_if_valid_multiple_squares,
-    check_if_valid_single_point_move,
-    list_available_moves_multiple_squares,
-    list_available_moves_pawn,
-    list_available_moves_single_square,
+    build_available_fields_table,
+    build_available_moves_table,
+    build_origins_masks,
+    build_rays,
 )
 
 
-class Figure(ABC):
-    """Abstract class of figure"""
+class FigureTables(NamedTuple):
+    """Precomputed moves of the figure on the board of given size"""
+
+    moves_masks: Tuple[int, ...]
+    available_moves_table: Tuple[Tuple[int, ...], ...]
+    # Names of the available squares, shared with the square names of the board
+    available_fields_table: Tuple[Tuple[str, ...], ...]
+    # Inverse of the available moves: squares from which the figure reaches
+    # the square, indexed by the destination square
+    origins_masks: Tuple[int, ...]
+    origins_table: Tuple[Tuple[int, ...], ...]
+
+
+def build_figure_tables(moves_masks: Tuple[int, ...], board: Board) -> FigureTables:
+    """
+    Helper method to precompute the tables of the figure from its moves bitboards
+
+    :param moves_masks: bitboards of available moves indexed by square
+    :param board: geometry of the board
+    :return: tables of available moves and their origins
+    """
+    available_moves_table = build_available_moves_table(moves_masks=moves_masks)
+    origins_masks = build_origins_masks(moves_masks=moves_masks)
+    return FigureTables(
+        moves_masks=moves_masks,
+        available_moves_table=available_moves_table,
+        available_fields_table=build_available_fields_table(
+            available_moves_table=available_moves_table,
+            square_names=board.square_names,
+        ),
+        origins_masks=origins_masks,
+        origins_table=build_available_moves_table(moves_masks=origins_masks),
+    )
 
-    @abstractmethod
-    def __init__(self, field: str):
-        if not check_if_valid_field(field=field):
-            raise ValueError("Field does not exist.")
-        self.field = field
 
-    @abstractmethod
-    def list_available_moves(self):
-        """Abstract method to retrieve available moves"""
-        pass
+class Figure(ABC):
+    """
+    Abstract class of figure. Figures are immutable flyweights, a single instance
+    of every figure on every square is created on its first use and shared by
+    all requests through the at method. Subclasses describe their moves with
+    the Betza notation, compiled once into the move tables of the class
+    """
+
+    __slots__ = (
+        "square",
+        "board",
+        "moves_mask",
+        "available_moves",
+        "available_fields",
+        "origins",
+    )
+
+    betza: str = ""
+    movements: Tuple[Movement, ...] = ()
+    directions: Tuple[Tuple[int, int], ...] = ()
+    capture_directions: Tuple[Tuple[int, int], ...] = ()
+    moves_masks: Tuple[int, ...] = ()
+    available_moves_table: Tuple[Tuple[int, ...], ...] = ()
+    rays: Tuple[Tuple[Tuple[int, ...], bool], ...] = ()
+    # Instances by square and tables of every board, bounded for other sizes
+    instances = BoardCache()
+    board_tables = BoardCache()
+    # Row indices where the figure never stands and has no moves
+    immobile_rows: Tuple[int, ...] = ()
 
     @abstractmethod
-    def validate_move(self, dest_field: str):
-        """Abstract method to check if the desired move is valid"""
-        pass
-
-
-class King(Figure):
-    """Class of King's figure that implements figure's methods"""
-
-    def __init__(self, field: str):
-        super(King, self).__init__(field=field)
-        self.directions = [
-            (0, 1),
-            (1, 1),
-            (1, 0),
-            (1, -1),
-            (0, -1),
-            (-1, -1),
-            (-1, 0),
-            (-1, 1),
-        ]
-
-    def list_available_moves(self) -> Union[None, List[str]]:
+    def __init__(self, square: int, board: Board = STANDARD_BOARD):
+        if not 0 <= square < board.size:
+            raise ValueError("Field does not exist.")
+        tables = self.tables(board=board)
+        object.__setattr__(self, "square", square)
+        object.__setattr__(self, "board", board)
+        object.__setattr__(self, "moves_mask", tables.moves_masks[square])
+        object.__setattr__(
+            self,
+            "available_moves",
+            tables.available_moves_table[square],
+        )
+        object.__setattr__(
+            self,
+            "available_fields",
+            tables.available_fields_table[square],
+        )
+        object.__setattr__(self, "origins", tables.origins_table[square])
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.instances = BoardCache()
+        cls.board_tables = BoardCache()
+        if "betza" in cls.__dict__:
+            cls.compile_tables()
+        elif "moves_masks" in cls.__dict__:
+            cls.board_tables.set(
+                board=STANDARD_BOARD,
+                value=build_figure_tables(
+                    moves_masks=cls.moves_masks,
+                    board=STANDARD_BOARD,
+                ),
+            )
+
+    @classmethod
+    def compile_tables(cls):
         """
-        Class method to retrieve available moves for the king
-
-        :return: list of available moves
+        Compile the Betza notation of the figure into its directions and the tables
+        of available moves. Sliding rays are built for the unlimited riders
         """
-        return list_available_moves_single_square(
-            field=self.field,
-            directions=self.directions,
+        cls.movements = compile_betza(notation=cls.betza)
+        regular = [movement for movement in cls.movements if not movement.initial]
+        cls.directions = tuple(
+            leap for movement in regular if movement.moves for leap in movement.leaps
+        )
+        cls.capture_directions = tuple(
+            leap for movement in regular if movement.captures for leap in movement.leaps
+        )
+        tables = cls.tables(board=STANDARD_BOARD)
+        cls.moves_masks = tables.moves_masks
+        cls.available_moves_table = tables.available_moves_table
+        cls.rays = build_rays(
+            directions=tuple(
+                leap
+                for movement in regular
+                if movement.moves and movement.captures and not movement.max_range
+                for leap in movement.leaps
+            ),
         )
 
-    def validate_move(self, dest_field: str) -> bool:
+    @classmethod
+    def tables(cls, board: Board) -> FigureTables:
         """
-        Check if the desired move is valid for king
+        Retrieve the moves of the figure on the board of given size, compiled on
+        the first use of the size and shared afterwards
 
-        :param dest_field: destination field in string
-        :return: True if valid, False if not valid
+        :param board: geometry of the board
+        :return: bitboards and tuples of available moves indexed by square
         """
-        return check_if_valid_single_point_move(
-            curr_field=self.field,
-            dest_field=dest_field,
-            directions=self.directions,
-        )
+        tables = cls.board_tables.get(board=board)
+        if tables is None:
+            moves_masks = tuple(
+                0
+                if board.square_to_indexes(square=square)[0] in cls.immobile_rows
+                else mask
+                for square, mask in enumerate(
+                    build_betza_moves_masks(movements=cls.movements, board=board),
+                )
+            )
+            tables = cls.board_tables.set(
+                board=board,
+                value=build_figure_tables(moves_masks=moves_masks, board=board),
+            )
+        return tables
+
+    def __setattr__(self, name: str, value):
+        raise AttributeError("Figure is immutable.")
+
+    @classmethod
+    def at(cls, square: int, board: Board = STANDARD_BOARD) -> "Figure":
+        """
+        Retrieve the shared instance of the figure on the square
 
+        :param square: index of the square
+        :param board: geometry of the board
+        :return: figure on the square
+        """
+        board_instances = cls.instances.get(board=board)
+        if board_instances is None:
+            board_instances = cls.instances.set(board=board, value={})
+        figure = board_instances.get(square)
+        if figure is None:
+            figure = board_instances[square] = cls(square=square, board=board)
+        return figure
+
+    def list_available_moves(self) -> Tuple[int, ...]:
+        """
+        Retrieve available moves from the table precomputed for the figure
 
-class Rook(Figure):
-    """Class of Rook's figure that implements figure's methods"""
+        :return: tuple of available squares
+        """
+        return self.available_moves
 
-    def __init__(self, field: str):
-        super(Rook, self).__init__(field=field)
-        self.directions = [(0, 1), (1, 0), (0, -1), (-1, 0)]
+    def list_available_fields(self) -> Tuple[str, ...]:
+        """
+        Retrieve names of the available squares from the table precomputed for
+        the figure, no strings are built on the call
 
-    def list_available_moves(self) -> Union[None, List[str]]:
+        :return: tuple of names of available squares
         """
-        Class method to retrieve available moves for the rook
+        return self.available_fields
 
-        :return: list of available moves
+    def list_origins(self) -> Tuple[int, ...]:
         """
-        return list_available_moves_multiple_squares(
-            field=self.field,
-            directions=self.directions,
-        )
+        Retrieve the squares from which the figure moves to its square, from
+        the table precomputed for the figure
 
-    def validate_move(self, dest_field: str) -> bool:
+        :return: tuple of origin squares
         """
-        Check if the desired move is valid for rook
+        return self.origins
 
-        :param dest_field: destination field in string
+    def validate_move(self, dest_square: int) -> bool:
+        """
+        Check if the desired move is valid with a single test of the moves bitboard
+
+        :param dest_square: index of the destination square
         :return: True if valid, False if not valid
         """
-        return check_if_valid_multiple_squares(
-            curr_field=self.field,
-            dest_field=dest_field,
-            directions=self.directions,
-        )
+        return bool(self.moves_mask & self.board.square_masks[dest_square])
 
 
-class Bishop(Figure):
-    """Class of Bishop's figure that implements figure's methods"""
+class King(Figure):
+    """Class of King's figure that implements figure's methods"""
 
-    def __init__(self, field: str):
-        super(Bishop, self).__init__(field=field)
-        self.directions = [(1, 1), (1, -1), (-1, -1), (-1, 1)]
+    __slots__ = ()
 
-    def list_available_moves(self) -> Union[None, List[str]]:
-        """
-        Class method to retrieve available moves for the bishop
+    betza = "K"
 
-        :return: list of available moves
-        """
-        return list_available_moves_multiple_squares(
-            field=self.field,
-            directions=self.directions,
-        )
+    def __init__(self, square: int, board: Board = STANDARD_BOARD):
+        super(King, self).__init__(square=square, board=board)
 
-    def validate_move(self, dest_field: str) -> bool:
-        """
-        Check if the desired move is valid for bishop
 
-        :param dest_field: destination field in string
-        :return: True if valid, False if not valid
-        """
-        return check_if_valid_multiple_squares(
-            curr_field=self.field,
-            dest_field=dest_field,
-            directions=self.directions,
-        )
+class Rook(Figure):
+    """Class of Rook's figure that implements figure's methods"""
 
+    __slots__ = ()
 
-class Queen(Figure):
-    """Class of Queen's figure that implements figure's methods"""
+    betza = "R"
 
-    def __init__(self, field: str):
-        super(Queen, self).__init__(field=field)
-        self.directions = [
-            (0, 1),
-            (1, 1),
-            (1, 0),
-            (1, -1),
-            (0, -1),
-            (-1, -1),
-            (-1, 0),
-            (-1, 1),
-        ]
-
-    def list_available_moves(self) -> Union[None, List[str]]:
-        """
-        Class method to retrieve available moves for the queen
+    def __init__(self, square: int, board: Board = STANDARD_BOARD):
+        super(Rook, self).__init__(square=square, board=board)
 
-        :return: list of available moves
-        """
-        return list_available_moves_multiple_squares(
-            field=self.field,
-            directions=self.directions,
-        )
 
-    def validate_move(self, dest_field: str) -> bool:
-        """
-        Check if the desired move is valid for queen
+class Bishop(Figure):
+    """Class of Bishop's figure that implements figure's methods"""
 
-        :param dest_field: destination field in string
-        :return: True if valid, False if not valid
-        """
-        return check_if_valid_multiple_squares(
-            curr_field=self.field,
-            dest_field=dest_field,
-            directions=self.directions,
-        )
+    __slots__ = ()
 
+    betza = "B"
 
-class Knight(Figure):
-    """Class of Knight's figure that implements figure's methods"""
+    def __init__(self, square: int, board: Board = STANDARD_BOARD):
+        super(Bishop, self).__init__(square=square, board=board)
 
-    def __init__(self, field: str):
-        super(Knight, self).__init__(field=field)
-        self.directions = [
-            (1, 2),
-            (2, -1),
-            (1, -2),
-            (2, 1),
-            (-1, -2),
-            (-2, -1),
-            (-2, 1),
-            (-1, 2),
-        ]
-
-    def list_available_moves(self) -> Union[None, List[str]]:
-        """
-        Class method to retrieve available moves for the knight
 
-        :return: list of available moves
-        """
-        return list_available_moves_single_square(
-            field=self.field,
-            directions=self.directions,
-        )
+class Queen(Figure):
+    """Class of Queen's figure that implements figure's methods"""
 
-    def validate_move(self, dest_field: str) -> bool:
-        """
-        Check if the desired move is valid for knight
+    __slots__ = ()
 
-        :param dest_field: destination field in string
-        :return: True if valid, False if not valid
-        """
-        return check_if_valid_single_point_move(
-            curr_field=self.field,
-            dest_field=dest_field,
-            directions=self.directions,
-        )
+    betza = "Q"
 
+    def __init__(self, square: int, board: Board = STANDARD_BOARD):
+        super(Queen, self).__init__(square=square, board=board)
 
-class Pawn(Figure):
-    """Class of Pawn's figure that implements figure's methods"""
 
-    def __init__(self, field: str):
-        super(Pawn, self).__init__(field=field)
-        self.directions = [(-1, 0)]
+class Knight(Figure):
+    """Class of Knight's figure that implements figure's methods"""
+
+    __slots__ = ()
 
-    def list_available_moves(self) -> Union[None, List[str]]:
-        """
-        Class method to retrieve available moves for the pawn
+    betza = "N"
 
-        :return: list of available moves
-        """
-        return list_available_moves_pawn(field=self.field, directions=self.directions)
+    def __init__(self, square: int, board: Board = STANDARD_BOARD):
+        super(Knight, self).__init__(square=square, board=board)
 
-    def validate_move(self, dest_field: str) -> bool:
-        """
-        Check if the desired move is valid for pawn
 
-        :param dest_field: destination field in string
-        :return: True if valid, False if not valid
-        """
-        return check_if_valid_move_pawn(
-            curr_field=self.field,
-            dest_field=dest_field,
-            directions=self.directions,
-        )
+class Pawn(Figure):
+    """
+    Class of Pawn's figure that implements figure's methods. Pawn moves forward,
+    captures diagonally and has the double step from the 2nd row. There are no
+    available moves when the pawn is on the first row from the bottom of the board
+    """
+
+    __slots__ = ()
+
+    immobile_rows = (0,)
+    betza = "fmWfcFifmnD"
+
+    def __init__(self, square: int, board: Board = STANDARD_BOARD):
+        super(Pawn, self).__init__(square=square, board=board)
+
+
+def create_figure_class(name: str, betza: str) -> Type[Figure]:
+    """
+    Create the class of the figure moving as described by the Betza notation,
+    e.g. the fairy pieces of chess variants
+
+    :param name: name of the class
+    :param betza: Betza notation of the moves
+    :return: class of the figure
+    """
+
+    def __init__(self, square: int, board: Board = STANDARD_BOARD):
+        Figure.__init__(self, square=square, board=board)
+
+    return type(
+        name,
+        (Figure,),
+        {
+            "__module__": __name__,
+            "__slots__": (),
+            "__doc__": f"Class of {name}'s figure moving as {betza}",
+            "__init__": __init__,
+            "betza": betza,
+        },
+    )
+
+
+Amazon = create_figure_class(name="Amazon", betza="QN")
+Archbishop = create_figure_class(name="Archbishop", betza="BN")
+Chancellor = create_figure_class(name="Chancellor", betza="RN")
+Camel = create_figure_class(name="Camel", betza="C")
+Zebra = create_figure_class(name="Zebra", betza="Z")
+Nightrider = create_figure_class(name="Nightrider", betza="NN")
@@ -0,0 +1,253 @@
+"""Shortest paths and reachability of the figures on the empty board"""
+from collections import deque
+from typing import Dict, Iterator, NamedTuple, Optional, Tuple, Type
+
+from src.api.figures.board import STANDARD_BOARD, Board
+from src.api.figures.figure import Figure
+from src.api.figures.utils import list_squares_from_mask
+
+
+class DistanceTables(NamedTuple):
+    """Distances of the figure between all squares of the board"""
+
+    # Minimal numbers of moves indexed by source and destination, -1 if unreachable
+    distances: Tuple[Tuple[int, ...], ...]
+    # The same numbers of moves indexed by destination and source
+    distances_to: Tuple[Tuple[int, ...], ...]
+    # Bitboards of squares reachable within n moves indexed by source and n,
+    # the last one holds all reachable squares
+    reach_masks: Tuple[Tuple[int, ...], ...]
+
+
+def search_distances(
+    available_moves_table: Tuple[Tuple[int, ...], ...],
+    square: int,
+) -> Tuple[Tuple[int, ...], Tuple[int, ...]]:
+    """
+    Helper method to compute the distances from the square with the breadth-first
+    search over the available moves
+
+    :param available_moves_table: tuples of available squares indexed by square
+    :param square: index of the source square
+    :return: numbers of moves indexed by square, -1 if unreachable, and bitboards
+        of squares reachable within n moves indexed by n
+    """
+    distances = [-1] * len(available_moves_table)
+    distances[square] = 0
+    masks = [0]
+    queue = deque((square,))
+    while queue:
+        current = queue.popleft()
+        distance = distances[current] + 1
+        for move in available_moves_table[current]:
+            if distances[move] == -1:
+                distances[move] = distance
+                if distance == len(masks):
+                    masks.append(masks[-1])
+                masks[distance] |= 1 << move
+                queue.append(move)
+    return tuple(distances), tuple(masks)
+
+
+def build_distance_tables(
+    available_moves_table: Tuple[Tuple[int, ...], ...],
+) -> DistanceTables:
+    """
+    Helper method to compute the distances between every pair of squares
+
+    :param available_moves_table: tuples of available squares indexed by square
+    :return: distances and reachable squares of every square
+    """
+    searches = [
+        search_distances(available_moves_table=available_moves_table, square=square)
+        for square in range(len(available_moves_table))
+    ]
+    distances = tuple(source_distances for source_distances, _ in searches)
+    return DistanceTables(
+        distances=distances,
+        distances_to=tuple(zip(*distances)),
+        reach_masks=tuple(masks for _, masks in searches),
+    )
+
+
+# Distance tables of the standard board, boards of other sizes are searched per
+# query, as the tables grow with the square of the number of squares
+distance_tables: Dict[Type[Figure], DistanceTables] = {}
+
+
+def get_distance_tables(figure_class: Type[Figure]) -> DistanceTables:
+    """
+    Retrieve the distance tables of the figure on the standard board, computed on
+    their first use
+
+    :param figure_class: class of the figure
+    :return: distances and reachable squares of every square
+    """
+    tables = distance_tables.get(figure_class)
+    if tables is None:
+        tables = distance_tables[figure_class] = build_distance_tables(
+            available_moves_table=figure_class.available_moves_table,
+        )
+    return tables
+
+
+def get_distances_from(
+    figure_class: Type[Figure],
+    square: int,
+    board: Board = STANDARD_BOARD,
+) -> Tuple[Tuple[int, ...], Tuple[int, ...]]:
+    """
+    Retrieve the distances from the square, read from the tables on the standard
+    board and searched on the other boards
+
+    :param figure_class: class of the figure
+    :param square: index of the source square
+    :param board: geometry of the board
+    :return: numbers of moves indexed by square, -1 if unreachable, and bitboards
+        of squares reachable within n moves indexed by n
+    """
+    if board is STANDARD_BOARD:
+        tables = get_distance_tables(figure_class=figure_class)
+        return tables.distances[square], tables.reach_masks[square]
+    return search_distances(
+        available_moves_table=figure_class.tables(board=board).available_moves_table,
+        square=square,
+    )
+
+
+def get_distances_to(
+    figure_class: Type[Figure],
+    dest_square: int,
+    board: Board = STANDARD_BOARD,
+) -> Tuple[int, ...]:
+    """
+    Retrieve the distances to the square, read from the tables on the standard
+    board and searched backwards over the origins on the other boards
+
+    :param figure_class: class of the figure
+    :param dest_square: index of the destination square
+    :param board: geometry of the board
+    :return: numbers of moves indexed by source square, -1 if unreachable
+    """
+    if board is STANDARD_BOARD:
+        return get_distance_tables(figure_class=figure_class).distances_to[dest_square]
+    distances, _ = search_distances(
+        available_moves_table=figure_class.tables(board=board).origins_table,
+        square=dest_square,
+    )
+    return distances
+
+
+def get_distance(
+    figure_class: Type[Figure],
+    square: int,
+    dest_square: int,
+    board: Board = STANDARD_BOARD,
+) -> int:
+    """
+    Retrieve the minimal number of moves between the squares
+
+    :param figure_class: class of the figure
+    :param square: index of the source square
+    :param dest_square: index of the destination square
+    :param board: geometry of the board
+    :return: number of moves, -1 if the destination is not reachable
+    """
+    distances, _ = get_distances_from(
+        figure_class=figure_class,
+        square=square,
+        board=board,
+    )
+    return distances[dest_square]
+
+
+def iter_shortest_paths(
+    figure_class: Type[Figure],
+    square: int,
+    dest_square: int,
+    board: Board = STANDARD_BOARD,
+) -> Iterator[Tuple[int, ...]]:
+    """
+    Generate the shortest paths between the squares lazily. Every step goes to
+    the square one move closer to the destination, so no step is taken back
+
+    :param figure_class: class of the figure
+    :param square: index of the source square
+    :param dest_square: index of the destination square
+    :param board: geometry of the board
+    :return: generator of the paths including the source and destination squares
+    """
+    to_destination = get_distances_to(
+        figure_class=figure_class,
+        dest_square=dest_square,
+        board=board,
+    )
+    if to_destination[square] == -1:
+        return
+    if square == dest_square:
+        yield (square,)
+        return
+    available_moves_table = figure_class.tables(board=board).available_moves_table
+
+    def closer_moves(current: int) -> Iterator[int]:
+        return (
+            move
+            for move in available_moves_table[current]
+            if to_destination[move] == to_destination[current] - 1
+        )
+
+    path = [square]
+    stack = [closer_moves(current=square)]
+    while stack:
+        move = next(stack[-1], None)
+        if move is None:
+            stack.pop()
+            path.pop()
+        elif move == dest_square:
+            yield (*path, move)
+        else:
+            path.append(move)
+            stack.append(closer_moves(current=move))
+
+
+def get_shortest_path(
+    figure_class: Type[Figure],
+    square: int,
+    dest_square: int,
+    board: Board = STANDARD_BOARD,
+) -> Optional[Tuple[int, ...]]:
+    """
+    Retrieve one of the shortest paths between the squares
+
+    :param figure_class: class of the figure
+    :param square: index of the source square
+    :param dest_square: index of the destination square
+    :param board: geometry of the board
+    :return: path including the source and destination squares, None if unreachable
+    """
+    paths = iter_shortest_paths(
+        figure_class=figure_class,
+        square=square,
+        dest_square=dest_square,
+        board=board,
+    )
+    return next(paths, None)
+
+
+def list_reachable_squares(
+    figure_class: Type[Figure],
+    square: int,
+    moves: int,
+    board: Board = STANDARD_BOARD,
+) -> Tuple[int, ...]:
+    """
+    List the squares reachable from the square within the number of moves
+
+    :param figure_class: class of the figure
+    :param square: index of the source square
+    :param moves: maximal number of moves
+    :param board: geometry of the board
+    :return: tuple of reachable squares in ascending order, without the source
+    """
+    _, masks = get_distances_from(figure_class=figure_class, square=square, board=board)
+    return list_squares_from_mask(mask=masks[min(moves, len(masks) - 1)])
@@ -0,0 +1,125 @@
+from time import perf_counter
+from typing import Optional, Tuple
+
+from src.api.figures.position import Position
+from src.api.figures.transposition import TranspositionTable
+
+# Standard perft reference positions with the expected node counts at depth 1, 2, ...
+REFERENCE_POSITIONS: Tuple[Tuple[str, str, Tuple[int, ...]], ...] = (
+    (
+        "initial",
+        "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+        (20, 400, 8902, 197281),
+    ),
+    (
+        "kiwipete",
+        "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+        (48, 2039, 97862),
+    ),
+    (
+        "position 3",
+        "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+        (14, 191, 2812, 43238),
+    ),
+    (
+        "position 4",
+        "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+        (6, 264, 9467),
+    ),
+    (
+        "position 5",
+        "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8",
+        (44, 1486, 62379),
+    ),
+    (
+        "position 6",
+        "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10",
+        (46, 2079, 89890),
+    ),
+)
+
+
+class PerftLimitError(Exception):
+    """Count of the perft nodes generated the moves of too many positions"""
+
+
+def perft(
+    position: Position,
+    depth: int,
+    table: Optional[TranspositionTable] = None,
+    search_limit: Optional[int] = None,
+) -> int:
+    """
+    Count the leaf nodes of the legal move tree of the position to the given depth.
+    Moves of the last ply are counted without being played
+
+    :param position: position to enumerate, restored after the count
+    :param depth: number of plies to enumerate
+    :param table: transposition table of the node counts, not used if not given
+    :param search_limit: the highest number of positions whose moves are
+        generated, unlimited if None
+    :return: number of leaf nodes
+    :raises PerftLimitError: if the limit is reached before the count ends
+    """
+    searched = 0
+
+    def count(depth: int) -> int:
+        nonlocal searched
+        if depth == 0:
+            return 1
+        if table is not None and depth > 1:
+            nodes = table.get(key=position.hash, depth=depth)
+            if nodes is not None:
+                return nodes
+        searched += 1
+        if search_limit is not None and searched > search_limit:
+            # Moves already played are taken back by the callers' finally blocks
+            raise PerftLimitError("Perft search limit reached.")
+        moves = position.generate_legal_moves()
+        if depth == 1:
+            return len(moves)
+        nodes = 0
+        for move in moves:
+            position.make_move(move=move)
+            try:
+                nodes += count(depth=depth - 1)
+            finally:
+                position.unmake_move()
+        if table is not None:
+            table.set(key=position.hash, depth=depth, value=nodes)
+        return nodes
+
+    return count(depth=depth)
+
+
+def run_perft(
+    fen: str,
+    depth: int,
+    table: Optional[TranspositionTable] = None,
+    search_limit: Optional[int] = None,
+) -> Tuple[int, Optional[float]]:
+    """
+    Count the perft nodes of the position and measure the time of the count.
+    The count is always measured without the table, which only keeps the counts
+    of the whole positions, so the timings measure the move generation
+
+    :param fen: position in the Forsyth-Edwards Notation
+    :param depth: number of plies to enumerate
+    :param table: transposition table of the node counts, not used if not given
+    :param search_limit: the highest number of positions whose moves are
+        generated, unlimited if None
+    :return: number of leaf nodes and the elapsed time in seconds, None if the
+        count was read from the table
+    :raises PerftLimitError: if the limit is reached before the count ends
+    """
+    position = Position(fen=fen)
+    if table is not None:
+        nodes = table.get(key=position.hash, depth=depth)
+        if nodes is not None:
+            return nodes, None
+    start = perf_counter()
+    nodes = perft(position=position, depth=depth, search_limit=search_limit)
+    seconds = perf_counter() - start
+    if table is not None:
+        table.set(key=position.hash, depth=depth, value=nodes)
+    return nodes, seconds
@@ -0,0 +1,630 @@
+from random import Random
+from sys import intern
+from typing import Dict, List, Optional, Tuple
+
+from src.api.figures.figure import Bishop, King, Knight, Pawn, Queen, Rook
+from src.api.figures.utils import (
+    FIELDS_TO_SQUARES,
+    SQUARE_MASKS,
+    SQUARE_NAMES,
+    build_moves_masks,
+    indexes_to_square,
+    list_squares_from_mask,
+    single_square_moves_mask,
+    sliding_moves_mask,
+)
+
+WHITE, BLACK = 0, 1
+COLORS = ("white", "black")
+
+PIECES = "PNBRQKpnbrqk"
+FIGURE_NAMES = {
+    "p": "pawn",
+    "n": "knight",
+    "b": "bishop",
+    "r": "rook",
+    "q": "queen",
+    "k": "king",
+}
+
+# Move is represented by the source square, the destination square and
+# the FEN letter of the promotion piece (None if the move is not a promotion)
+Move = Tuple[int, int, Optional[str]]
+
+# UCI names of the moves without promotion indexed by from_square * 64 + to_square
+UCI_MOVES = tuple(
+    intern(from_name + to_name)
+    for from_name in SQUARE_NAMES
+    for to_name in SQUARE_NAMES
+)
+
+# Pawn tables of both colors, black ones mirror the white directions vertically
+PAWN_PUSHES = (
+    indexes_to_square(*Pawn.directions[0]),
+    -indexes_to_square(*Pawn.directions[0]),
+)
+PAWN_START_ROWS = (1, 6)
+PAWN_PROMOTION_ROWS = (7, 0)
+PAWN_CAPTURES_MASKS = (
+    build_moves_masks(
+        moves_mask=single_square_moves_mask,
+        directions=Pawn.capture_directions,
+    ),
+    build_moves_masks(
+        moves_mask=single_square_moves_mask,
+        directions=tuple((-row, col) for row, col in Pawn.capture_directions),
+    ),
+)
+PROMOTION_PIECES = ("QRBN", "qrbn")
+
+BACK_RANKS_MASK = 0xFF | 0xFF << 56
+
+# Castling rights are kept as bits in the order of FEN letters "KQkq"
+CASTLING_LETTERS = "KQkq"
+# King's destination square mapped to the rook's source and destination squares
+CASTLING_ROOK_MOVES = {6: (7, 5), 2: (0, 3), 62: (63, 61), 58: (56, 59)}
+# Right bit, king's source and destination squares, squares to be empty and
+# squares the king passes that must not be attacked, for every castling
+CASTLINGS = (
+    (
+        (1, 4, 6, SQUARE_MASKS[5] | SQUARE_MASKS[6], (5, 6)),
+        (2, 4, 2, SQUARE_MASKS[1] | SQUARE_MASKS[2] | SQUARE_MASKS[3], (3, 2)),
+    ),
+    (
+        (4, 60, 62, SQUARE_MASKS[61] | SQUARE_MASKS[62], (61, 62)),
+        (8, 60, 58, SQUARE_MASKS[57] | SQUARE_MASKS[58] | SQUARE_MASKS[59], (59, 58)),
+    ),
+)
+# Castling rights kept after a move from or to the square
+CASTLING_RIGHTS_MASKS = tuple(
+    {0: 0b1101, 4: 0b1100, 7: 0b1110, 56: 0b0111, 60: 0b0011, 63: 0b1011}.get(
+        square,
+        0b1111,
+    )
+    for square in range(64)
+)
+
+
+# Zobrist keys of the pieces on the squares, the side to move, the castling rights
+# and the file of the en passant square. Keys are generated from the fixed seed,
+# so the hashes of the positions are the same in every process
+zobrist_random = Random(0x5A0B)
+ZOBRIST_PIECES: Dict[str, Tuple[int, ...]] = {
+    piece: tuple(zobrist_random.getrandbits(64) for _ in range(64)) for piece in PIECES
+}
+ZOBRIST_BLACK_TO_MOVE = zobrist_random.getrandbits(64)
+ZOBRIST_CASTLING = tuple(zobrist_random.getrandbits(64) for _ in range(16))
+ZOBRIST_EN_PASSANT_FILES = tuple(zobrist_random.getrandbits(64) for _ in range(8))
+ZOBRIST_EN_PASSANT: Dict[Optional[int], int] = {
+    None: 0,
+    **{
+        square: ZOBRIST_EN_PASSANT_FILES[square % 8]
+        for square in range(64)
+        if square // 8 in (2, 5)
+    },
+}
+
+
+class Position:
+    """
+    Class of the occupied board parsed from the Forsyth-Edwards Notation.
+    The Zobrist hash of the position is updated incrementally by every change
+    of the board, so equal positions reached by different moves share the hash
+    """
+
+    def __init__(self, fen: str):
+        self.board: List[Optional[str]] = [None] * 64
+        self.bitboards: Dict[str, int] = {piece: 0 for piece in PIECES}
+        self.occupied = [0, 0]
+        self.history: List[tuple] = []
+        self.hash = 0
+
+        parts = fen.split()
+        if not parts or len(parts) > 6:
+            raise ValueError("FEN is not valid.")
+        # Missing trailing fields are filled with the defaults of the FEN
+        defaults = ("w", "-", "-", "0", "1")
+        given = len(parts) - 1
+        placement, side, castling, en_passant, halfmove, fullmove = (
+            *parts,
+            *defaults[given:],
+        )
+
+        self.parse_placement(placement=placement)
+        if side not in ("w", "b"):
+            raise ValueError("FEN is not valid.")
+        self.side_to_move = WHITE if side == "w" else BLACK
+        self.castling_rights = self.parse_castling(castling=castling)
+        if en_passant == "-":
+            self.en_passant: Optional[int] = None
+        # The en passant square lies behind the pawn the opponent just pushed
+        elif (
+            en_passant in FIELDS_TO_SQUARES and en_passant[1] == "63"[self.side_to_move]
+        ):
+            self.en_passant = FIELDS_TO_SQUARES[en_passant]
+        else:
+            raise ValueError("FEN is not valid.")
+        if not self.is_consistent():
+            raise ValueError("FEN is not valid.")
+        if not (halfmove.isdigit() and fullmove.isdigit()):
+            raise ValueError("FEN is not valid.")
+        self.halfmove_clock = int(halfmove)
+        self.fullmove_number = int(fullmove)
+        self.hash ^= (
+            ZOBRIST_BLACK_TO_MOVE * self.side_to_move
+            ^ ZOBRIST_CASTLING[self.castling_rights]
+            ^ ZOBRIST_EN_PASSANT[self.en_passant]
+        )
+
+    def parse_placement(self, placement: str):
+        """
+        Put the pieces on the board from the placement part of FEN
+
+        :param placement: ranks of FEN from the 8th to the 1st separated by slash
+        """
+        ranks = placement.split("/")
+        if len(ranks) != 8:
+            raise ValueError("FEN is not valid.")
+        for row, rank in zip(range(7, -1, -1), ranks):
+            col = 0
+            for char in rank:
+                if char.isdigit():
+                    col += int(char)
+                elif char in PIECES and col < 8:
+                    self.put_piece(piece=char, square=indexes_to_square(row, col))
+                    col += 1
+                else:
+                    raise ValueError("FEN is not valid.")
+            if col != 8:
+                raise ValueError("FEN is not valid.")
+        if (self.bitboards["P"] | self.bitboards["p"]) & BACK_RANKS_MASK:
+            raise ValueError("FEN is not valid.")
+
+    def is_consistent(self) -> bool:
+        """
+        Check if the pieces agree with the castling rights and the en passant
+        square, and if each side has exactly one king
+
+        :return: True if the position can be played from
+        """
+        if bin(self.bitboards["K"]).count("1") != 1:
+            return False
+        if bin(self.bitboards["k"]).count("1") != 1:
+            return False
+        # The king and the rook of every castling right are on their home squares
+        for color, castlings in enumerate(CASTLINGS):
+            for right, from_square, to_square, _, _ in castlings:
+                rook_square = CASTLING_ROOK_MOVES[to_square][0]
+                if self.castling_rights & right and (
+                    self.board[from_square] != "Kk"[color]
+                    or self.board[rook_square] != "Rr"[color]
+                ):
+                    return False
+        if self.en_passant is None:
+            return True
+        # The pawn just pushed two squares stands in front of the en passant
+        # square and both squares it passed are empty
+        push = PAWN_PUSHES[self.side_to_move]
+        return (
+            self.board[self.en_passant] is None
+            and self.board[self.en_passant + push] is None
+            and self.board[self.en_passant - push] == "pP"[self.side_to_move]
+        )
+
+    @staticmethod
+    def parse_castling(castling: str) -> int:
+        """
+        Change the castling part of FEN to the bits of castling rights
+
+        :param castling: castling rights in FEN, e.g. "KQkq" or "-"
+        :return: bits of castling rights
+        """
+        if castling == "-":
+            return 0
+        rights = 0
+        for char in castling:
+            if char not in CASTLING_LETTERS or rights & 1 << CASTLING_LETTERS.index(
+                char,
+            ):
+                raise ValueError("FEN is not valid.")
+            rights |= 1 << CASTLING_LETTERS.index(char)
+        return rights
+
+    def to_fen(self) -> str:
+        """
+        Represent the position in the Forsyth-Edwards Notation
+
+        :return: FEN of the position
+        """
+        ranks = []
+        for row in range(7, -1, -1):
+            rank, empty = "", 0
+            for col in range(8):
+                piece = self.board[indexes_to_square(row=row, col=col)]
+                if piece is None:
+                    empty += 1
+                    continue
+                if empty:
+                    rank += str(empty)
+                    empty = 0
+                rank += piece
+            ranks.append(rank + (str(empty) if empty else ""))
+        castling = "".join(
+            char
+            for index, char in enumerate(CASTLING_LETTERS)
+            if self.castling_rights & 1 << index
+        )
+        return " ".join(
+            (
+                "/".join(ranks),
+                "wb"[self.side_to_move],
+                castling or "-",
+                "-" if self.en_passant is None else SQUARE_NAMES[self.en_passant],
+                str(self.halfmove_clock),
+                str(self.fullmove_number),
+            ),
+        )
+
+    def compute_hash(self) -> int:
+        """
+        Compute the Zobrist hash of the position from scratch
+
+        :return: hash of the position
+        """
+        position_hash = (
+            ZOBRIST_BLACK_TO_MOVE * self.side_to_move
+            ^ ZOBRIST_CASTLING[self.castling_rights]
+            ^ ZOBRIST_EN_PASSANT[self.en_passant]
+        )
+        for square, piece in self.list_pieces():
+            position_hash ^= ZOBRIST_PIECES[piece][square]
+        return position_hash
+
+    def put_piece(self, piece: str, square: int):
+        """
+        Put the piece on the empty square
+
+        :param piece: FEN letter of the piece
+        :param square: index of the square
+        """
+        self.board[square] = piece
+        self.bitboards[piece] |= SQUARE_MASKS[square]
+        self.occupied[BLACK if piece.islower() else WHITE] |= SQUARE_MASKS[square]
+        self.hash ^= ZOBRIST_PIECES[piece][square]
+
+    def remove_piece(self, square: int) -> str:
+        """
+        Remove the piece from the occupied square
+
+        :param square: index of the square
+        :return: FEN letter of the removed piece
+        """
+        piece = self.board[square]
+        self.board[square] = None
+        self.bitboards[piece] ^= SQUARE_MASKS[square]
+        self.occupied[BLACK if piece.islower() else WHITE] ^= SQUARE_MASKS[square]
+        self.hash ^= ZOBRIST_PIECES[piece][square]
+        return piece
+
+    def list_pieces(self) -> Tuple[Tuple[int, str], ...]:
+        """
+        List the pieces on the board
+
+        :return: tuple of squares with the FEN letters of their pieces
+        """
+        return tuple(
+            (square, piece) for square, piece in enumerate(self.board) if piece
+        )
+
+    def moves_mask(self, square: int) -> int:
+        """
+        Collect moves of the piece standing on the square. Sliding pieces stop at
+        the first blocker and the squares of enemy pieces are included as captures
+
+        :param square: index of the square
+        :return: bitboard of available moves
+        """
+        piece = self.board[square]
+        if piece is None:
+            return 0
+        color = BLACK if piece.islower() else WHITE
+        own, enemy = self.occupied[color], self.occupied[1 - color]
+        figure = piece.lower()
+
+        if figure == "p":
+            mask = PAWN_CAPTURES_MASKS[color][square] & enemy
+            occupied = own | enemy
+            push = square + PAWN_PUSHES[color]
+            if not occupied & SQUARE_MASKS[push]:
+                mask |= SQUARE_MASKS[push]
+                double_push = push + PAWN_PUSHES[color]
+                if square >> 3 == PAWN_START_ROWS[color] and not (
+                    occupied & SQUARE_MASKS[double_push]
+                ):
+                    mask |= SQUARE_MASKS[double_push]
+            return mask
+        if figure == "n":
+            return Knight.moves_masks[square] & ~own
+        if figure == "k":
+            return King.moves_masks[square] & ~own
+        rays = {"b": Bishop.rays, "r": Rook.rays, "q": Queen.rays}[figure]
+        return sliding_moves_mask(square=square, occupied=own | enemy, rays=rays) & ~own
+
+    def captures_mask(self, square: int) -> int:
+        """
+        Collect captures of the piece standing on the square
+
+        :param square: index of the square
+        :return: bitboard of squares with capturable enemy pieces
+        """
+        piece = self.board[square]
+        if piece is None:
+            return 0
+        enemy = self.occupied[WHITE if piece.islower() else BLACK]
+        return self.moves_mask(square=square) & enemy
+
+    def attacks_mask(self, square: int) -> int:
+        """
+        Collect squares attacked by the piece standing on the square, including
+        the squares of own pieces it defends. Pawns attack diagonally only
+
+        :param square: index of the square
+        :return: bitboard of attacked squares
+        """
+        piece = self.board[square]
+        if piece is None:
+            return 0
+        figure = piece.lower()
+        if figure == "p":
+            return PAWN_CAPTURES_MASKS[BLACK if piece.islower() else WHITE][square]
+        if figure == "n":
+            return Knight.moves_masks[square]
+        if figure == "k":
+            return King.moves_masks[square]
+        rays = {"b": Bishop.rays, "r": Rook.rays, "q": Queen.rays}[figure]
+        return sliding_moves_mask(
+            square=square,
+            occupied=self.occupied[WHITE] | self.occupied[BLACK],
+            rays=rays,
+        )
+
+    def attack_map(self) -> Tuple[List[List[int]], List[List[int]]]:
+        """
+        Collect the attackers of every square for both colors in one pass over
+        the pieces
+
+        :return: squares of the attacking pieces indexed by color and attacked square
+        """
+        attackers: Tuple[List[List[int]], List[List[int]]] = (
+            [[] for _ in range(64)],
+            [[] for _ in range(64)],
+        )
+        for square, piece in self.list_pieces():
+            color_attackers = attackers[BLACK if piece.islower() else WHITE]
+            for target in list_squares_from_mask(mask=self.attacks_mask(square=square)):
+                color_attackers[target].append(square)
+        return attackers
+
+    def is_square_attacked(self, square: int, color: int) -> bool:
+        """
+        Check if any piece of the color attacks the square. The attacks are
+        looked up in reverse, from the square with the tables of every figure
+
+        :param square: index of the square
+        :param color: color of the attacking pieces
+        :return: True if attacked, False if not attacked
+        """
+        bitboards = self.bitboards
+        if color == WHITE:
+            pawns, knights, king = bitboards["P"], bitboards["N"], bitboards["K"]
+            diagonal = bitboards["B"] | bitboards["Q"]
+            straight = bitboards["R"] | bitboards["Q"]
+        else:
+            pawns, knights, king = bitboards["p"], bitboards["n"], bitboards["k"]
+            diagonal = bitboards["b"] | bitboards["q"]
+            straight = bitboards["r"] | bitboards["q"]
+
+        if PAWN_CAPTURES_MASKS[1 - color][square] & pawns:
+            return True
+        if Knight.moves_masks[square] & knights:
+            return True
+        if King.moves_masks[square] & king:
+            return True
+        occupied = self.occupied[WHITE] | self.occupied[BLACK]
+        if diagonal and sliding_moves_mask(square, occupied, Bishop.rays) & diagonal:
+            return True
+        if straight and sliding_moves_mask(square, occupied, Rook.rays) & straight:
+            return True
+        return False
+
+    def is_in_check(self, color: int) -> bool:
+        """
+        Check if the king of the color is attacked
+
+        :param color: color of the king
+        :return: True if in check, False if not in check
+        """
+        king = self.bitboards["K" if color == WHITE else "k"]
+        if not king:
+            return False
+        return self.is_square_attacked(
+            square=king.bit_length() - 1,
+            color=1 - color,
+        )
+
+    def generate_pseudo_legal_moves(self) -> List[Move]:
+        """
+        Generate moves of the side to move without checking if its king is left
+        in check
+
+        :return: list of pseudo legal moves
+        """
+        moves: List[Move] = []
+        color = self.side_to_move
+        own, enemy = self.occupied[color], self.occupied[1 - color]
+        occupied = own | enemy
+        board = self.board
+
+        for square in list_squares_from_mask(mask=own):
+            if board[square] not in "Pp":
+                moves.extend(
+                    (square, to_square, None)
+                    for to_square in list_squares_from_mask(self.moves_mask(square))
+                )
+                continue
+
+            targets = PAWN_CAPTURES_MASKS[color][square] & enemy
+            if self.en_passant is not None:
+                targets |= (
+                    PAWN_CAPTURES_MASKS[color][square] & SQUARE_MASKS[self.en_passant]
+                )
+            push = square + PAWN_PUSHES[color]
+            if not occupied & SQUARE_MASKS[push]:
+                targets |= SQUARE_MASKS[push]
+                double_push = push + PAWN_PUSHES[color]
+                if square >> 3 == PAWN_START_ROWS[color] and not (
+                    occupied & SQUARE_MASKS[double_push]
+                ):
+                    targets |= SQUARE_MASKS[double_push]
+            for to_square in list_squares_from_mask(mask=targets):
+                if to_square >> 3 == PAWN_PROMOTION_ROWS[color]:
+                    moves.extend(
+                        (square, to_square, promotion)
+                        for promotion in PROMOTION_PIECES[color]
+                    )
+                else:
+                    moves.append((square, to_square, None))
+
+        for right, king_from, king_to, between, passed in CASTLINGS[color]:
+            if (
+                self.castling_rights & right
+                and board[king_from] == "Kk"[color]
+                and board[CASTLING_ROOK_MOVES[king_to][0]] == "Rr"[color]
+                and not occupied & between
+                and not self.is_square_attacked(square=king_from, color=1 - color)
+                and not any(
+                    self.is_square_attacked(square=square, color=1 - color)
+                    for square in passed
+                )
+            ):
+                moves.append((king_from, king_to, None))
+        return moves
+
+    def generate_legal_moves(self) -> List[Move]:
+        """
+        Generate moves of the side to move that do not leave its king in check
+
+        :return: list of legal moves
+        """
+        color = self.side_to_move
+        legal_moves = []
+        for move in self.generate_pseudo_legal_moves():
+            self.make_move(move=move)
+            if not self.is_in_check(color=color):
+                legal_moves.append(move)
+            self.unmake_move()
+        return legal_moves
+
+    def make_move(self, move: Move):
+        """
+        Play the move on the board, the move is expected to be pseudo legal
+
+        :param move: move to play
+        """
+        from_square, to_square, promotion = move
+        color = self.side_to_move
+        piece = self.board[from_square]
+        capture_square = to_square
+        if (
+            piece in "Pp"
+            and to_square == self.en_passant
+            and to_square % 8 != from_square % 8
+        ):
+            capture_square = to_square - PAWN_PUSHES[color]
+        captured = self.board[capture_square]
+
+        self.history.append(
+            (
+                move,
+                captured,
+                capture_square,
+                self.castling_rights,
+                self.en_passant,
+                self.halfmove_clock,
+            ),
+        )
+
+        if captured:
+            self.remove_piece(square=capture_square)
+        self.remove_piece(square=from_square)
+        self.put_piece(piece=promotion or piece, square=to_square)
+
+        if piece in "Kk" and abs(to_square - from_square) == 2:
+            rook_from, rook_to = CASTLING_ROOK_MOVES[to_square]
+            self.put_piece(piece=self.remove_piece(square=rook_from), square=rook_to)
+
+        self.hash ^= (
+            ZOBRIST_BLACK_TO_MOVE
+            ^ ZOBRIST_CASTLING[self.castling_rights]
+            ^ ZOBRIST_EN_PASSANT[self.en_passant]
+        )
+        self.en_passant = None
+        if piece in "Pp" and abs(to_square - from_square) == 16:
+            self.en_passant = from_square + PAWN_PUSHES[color]
+        self.castling_rights &= (
+            CASTLING_RIGHTS_MASKS[from_square] & CASTLING_RIGHTS_MASKS[to_square]
+        )
+        self.hash ^= (
+            ZOBRIST_CASTLING[self.castling_rights] ^ ZOBRIST_EN_PASSANT[self.en_passant]
+        )
+        self.halfmove_clock = (
+            0 if piece in "Pp" or captured else self.halfmove_clock + 1
+        )
+        self.fullmove_number += color
+        self.side_to_move = 1 - color
+
+    def unmake_move(self):
+        """Take back the last move played on the board"""
+        self.hash ^= (
+            ZOBRIST_BLACK_TO_MOVE
+            ^ ZOBRIST_CASTLING[self.castling_rights]
+            ^ ZOBRIST_EN_PASSANT[self.en_passant]
+        )
+        (
+            move,
+            captured,
+            capture_square,
+            self.castling_rights,
+            self.en_passant,
+            self.halfmove_clock,
+        ) = self.history.pop()
+        self.hash ^= (
+            ZOBRIST_CASTLING[self.castling_rights] ^ ZOBRIST_EN_PASSANT[self.en_passant]
+        )
+        from_square, to_square, promotion = move
+        self.side_to_move = color = 1 - self.side_to_move
+        self.fullmove_number -= color
+
+        piece = self.remove_piece(square=to_square)
+        if promotion:
+            piece = "Pp"[color]
+        self.put_piece(piece=piece, square=from_square)
+        if captured:
+            self.put_piece(piece=captured, square=capture_square)
+
+        if piece in "Kk" and abs(to_square - from_square) == 2:
+            rook_from, rook_to = CASTLING_ROOK_MOVES[to_square]
+            self.put_piece(piece=self.remove_piece(square=rook_to), square=rook_from)
+
+
+def move_to_uci(move: Move) -> str:
+    """
+    Represent the move in the UCI long algebraic notation, e.g. "e7e8q"
+
+    :param move: move to represent
+    :return: string representation of the move
+    """
+    from_square, to_square, promotion = move
+    if promotion:
+        return UCI_MOVES[from_square * 64 + to_square] + promotion.lower()
+    return UCI_MOVES[from_square * 64 + to_square]
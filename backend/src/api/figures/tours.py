@@ -0,0 +1,138 @@
+"""Tours of the figures visiting every square of the empty board exactly once"""
+from typing import Iterator, Optional, Tuple, Type
+
+from src.api.figures.board import STANDARD_BOARD, Board
+from src.api.figures.figure import Figure, Knight
+from src.api.figures.paths import get_distances_from
+
+
+class SearchLimitError(Exception):
+    """Search of the tours tried the highest allowed number of moves"""
+
+
+def iter_tours(
+    square: int,
+    figure_class: Type[Figure] = Knight,
+    closed: bool = False,
+    board: Board = STANDARD_BOARD,
+    search_limit: Optional[int] = None,
+) -> Iterator[Tuple[int, ...]]:
+    """
+    Generate the tours of the figure lazily with the depth-first search. Moves
+    are tried in the order of the Warnsdorff heuristic, to the square with the
+    fewest onward moves first, so the first tour is usually found without
+    backtracking. Only the current path and one iterator of moves per step are
+    kept in memory
+
+    :param square: index of the starting square
+    :param figure_class: class of the figure
+    :param closed: True if the last square should be one move from the start
+    :param board: geometry of the board
+    :param search_limit: the highest number of tried moves, unlimited if None
+    :return: generator of the tours as tuples of squares
+    :raises SearchLimitError: if the limit is reached before the search ends
+    """
+    if board.size == 1:
+        yield (square,)
+        return
+
+    moves_table = tuple(
+        figure_class.at(square=current, board=board).list_available_moves()
+        for current in range(board.size)
+    )
+    # Moves of the directional figures are not always reversible, so the squares
+    # a square is entered from are looked up in the origins apart from its moves
+    origins_table = tuple(
+        figure_class.at(square=current, board=board).list_origins()
+        for current in range(board.size)
+    )
+    # Squares from which the closed tour returns to the start
+    returns = figure_class.at(square=square, board=board).list_origins()
+    # No tour exists if some square is not reachable from the start at all
+    _, reach_masks = get_distances_from(
+        figure_class=figure_class,
+        square=square,
+        board=board,
+    )
+    if reach_masks[-1] | board.square_masks[square] != (1 << board.size) - 1:
+        return
+
+    visited = bytearray(board.size)
+
+    def warnsdorff_moves(current: int) -> Iterator[int]:
+        moves = [move for move in moves_table[current] if not visited[move]]
+        moves.sort(
+            key=lambda move: (
+                sum(not visited[onward] for onward in moves_table[move]),
+                move,
+            ),
+        )
+        return iter(moves)
+
+    def can_continue(current: int, remaining: int) -> bool:
+        # A square left without unvisited origins can only be entered from
+        # the current square and without unvisited moves only as the last one,
+        # and the closed tour needs a square left to return to the start from
+        if remaining > 1:
+            for move in moves_table[current]:
+                if (
+                    not visited[move]
+                    and all(visited[origin] for origin in origins_table[move])
+                    and all(visited[onward] for onward in moves_table[move])
+                ):
+                    return False
+        return not closed or not all(visited[origin] for origin in returns)
+
+    visited[square] = 1
+    path = [square]
+    stack = [warnsdorff_moves(current=square)]
+    tried = 0
+    while stack:
+        move = next(stack[-1], None)
+        if move is None:
+            stack.pop()
+            visited[path.pop()] = 0
+            continue
+        tried += 1
+        if search_limit is not None and tried > search_limit:
+            raise SearchLimitError("Search limit reached.")
+        if len(path) + 1 == board.size:
+            if not closed or move in returns:
+                yield (*path, move)
+            continue
+        visited[move] = 1
+        if not can_continue(current=move, remaining=board.size - len(path) - 1):
+            visited[move] = 0
+            continue
+        path.append(move)
+        stack.append(warnsdorff_moves(current=move))
+
+
+def find_tour(
+    square: int,
+    figure_class: Type[Figure] = Knight,
+    closed: bool = False,
+    board: Board = STANDARD_BOARD,
+    search_limit: Optional[int] = None,
+) -> Optional[Tuple[int, ...]]:
+    """
+    Find the first tour of the figure in the order of the Warnsdorff heuristic
+
+    :param square: index of the starting square
+    :param figure_class: class of the figure
+    :param closed: True if the last square should be one move from the start
+    :param board: geometry of the board
+    :param search_limit: the highest number of tried moves, unlimited if None
+    :return: tour as the tuple of squares, None if not found within the limit
+    """
+    tours = iter_tours(
+        square=square,
+        figure_class=figure_class,
+        closed=closed,
+        board=board,
+        search_limit=search_limit,
+    )
+    try:
+        return next(tours, None)
+    except SearchLimitError:
+        return None
@@ -0,0 +1,113 @@
+"""Transposition tables of the analysis results keyed by the Zobrist hash"""
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.api.figures.position import Position, move_to_uci
+
+# Entry stores the hash of the position, the depth of the analysis and its result
+Entry = Tuple[int, int, Any]
+
+
+class TranspositionTable:
+    """
+    Bounded table of the analysis results of the positions. Every hash maps to
+    a bucket of two slots: the first keeps the deepest analysis of the bucket,
+    the second is always replaced by the newest one. Slots hold immutable tuples,
+    so the lookups need no lock, only the counters are approximate under threads
+    """
+
+    def __init__(self, size: int = 65536):
+        self.size = size
+        self.slots: List[Optional[Entry]] = [None] * (2 * size)
+        self.hits = 0
+        self.misses = 0
+
+    def init_app(self, app, config_key: str = "TRANSPOSITION_TABLE_SIZE"):
+        """
+        Configure the number of buckets from the application settings
+
+        :param app: flask application
+        :param config_key: setting with the number of buckets
+        """
+        size = app.config.get(config_key, self.size)
+        if size != self.size:
+            self.size = size
+            self.clear()
+
+    def get(self, key: int, depth: int) -> Optional[Any]:
+        """
+        Retrieve the result of the analysis of the position to the depth
+
+        :param key: Zobrist hash of the position
+        :param depth: depth of the analysis
+        :return: result of the analysis or None if it is not stored
+        """
+        index = 2 * (key % self.size)
+        for entry in (self.slots[index], self.slots[index + 1]):
+            if entry is not None and entry[0] == key and entry[1] == depth:
+                self.hits += 1
+                return entry[2]
+        self.misses += 1
+        return None
+
+    def set(self, key: int, depth: int, value: Any):
+        """
+        Store the result of the analysis. The deeper analyses replace the first
+        slot of the bucket, the others go to the second one
+
+        :param key: Zobrist hash of the position
+        :param depth: depth of the analysis
+        :param value: result of the analysis
+        """
+        index = 2 * (key % self.size)
+        stored = self.slots[index]
+        if stored is None or stored[1] <= depth or stored[0] == key:
+            self.slots[index] = (key, depth, value)
+        else:
+            self.slots[index + 1] = (key, depth, value)
+
+    def clear(self):
+        """Remove all entries and reset the counters"""
+        self.slots = [None] * (2 * self.size)
+        self.hits = 0
+        self.misses = 0
+
+    def info(self) -> Dict[str, int]:
+        """
+        Retrieve the counters of the table
+
+        :return: hits, misses, stored entries and capacity of the table
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": sum(entry is not None for entry in self.slots),
+            "maxSize": len(self.slots),
+        }
+
+
+# Node counts of perft and legal moves of the positions served by the API.
+# Legal moves are kept as a single string of UCI moves, a few hundred bytes
+# per entry, in a smaller table of their own
+perft_table = TranspositionTable()
+legal_moves_table = TranspositionTable(size=4096)
+
+
+def lookup_legal_moves(
+    position: Position,
+    table: TranspositionTable = legal_moves_table,
+) -> List[str]:
+    """
+    Retrieve the legal moves of the position from the table, generating them
+    on the miss
+
+    :param position: position to analyse
+    :param table: transposition table of the legal moves
+    :return: legal moves of the side to move in the UCI notation
+    """
+    moves = table.get(key=position.hash, depth=1)
+    if moves is None:
+        moves = " ".join(
+            move_to_uci(move=move) for move in position.generate_legal_moves()
+        )
+        table.set(key=position.hash, depth=1, value=moves)
+    return moves.split()
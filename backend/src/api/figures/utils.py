@@ -1,221 +1,247 @@
-from typing import List, Tuple, Union
+from typing import Callable, Dict, Tuple
 
+from src.api.figures.board import STANDARD_BOARD
 
-def list_available_moves_pawn(
-    field: str,
-    directions: List[Tuple[int, int]],
-) -> Union[None, List[str]]:
+# Squares are indexed from 0 (a1) to 63 (h8), rank by rank, so the square of
+# row (rank) index and column (file) index is row * 8 + col. Sets of squares
+# are represented as 64-bit integers (bitboards) with bit n set for square n.
+# Helpers of this module work on the standard board, boards of other sizes
+# are described by src.api.figures.board
+SQUARE_MASKS = STANDARD_BOARD.square_masks
+
+
+def check_if_figure_in_board(row: int, col: int) -> bool:
     """
-    Helper method to collect all available moves for pawn. If pawn is located on 2nd row
-    on the board from the bottom, there is additional move by two squares
+    Helper method to check if the current position of figure is in board
 
-    :param field: field represented in string
-    :param directions: possible directions for the figure
-    :return: list of available moves for the current position
+    :param row: index of row
+    :param col: index of column
+    :return: True if valid, False if not valid
     """
-    available_moves: List = []
-    curr_row, curr_col = string_field_to_indexes(field=field)
+    if 0 <= row < 8 and 0 <= col < 8:
+        return True
+    else:
+        return False
 
-    # There are no available moves when then pawn
-    # is on the first row from the bottom of the chess board
-    if curr_row == 7:
-        return available_moves
 
-    for direction in directions:
-        pos_row = curr_row + direction[0]
-        pos_col = curr_col + direction[1]
-        if check_if_figure_in_board(row=pos_row, col=pos_col):
-            available_moves.append(
-                indexes_to_field(row_index=pos_row, col_index=pos_col),
-            )
-    if curr_row == 6:
-        available_moves.append(
-            indexes_to_field(row_index=curr_row - 2, col_index=curr_col),
-        )
-    return available_moves
+def square_to_indexes(square: int) -> Tuple[int, int]:
+    """
+    Helper method to change the square index to row and column indices
+
+    :param square: index of the square
+    :return: row and column indices of the square
+    """
+    return divmod(square, 8)
 
 
-def check_if_valid_move_pawn(
-    curr_field: str,
-    dest_field: str,
-    directions: List[Tuple[int, int]],
-) -> bool:
+def indexes_to_square(row: int, col: int) -> int:
     """
-    Helper method to check if the desired move is valid for pawn
+    Helper method to change row and column indices to the square index
 
-    :param curr_field: current position of figure
-    :param dest_field: desired destination of figure
-    :param directions: possible directions for the figure
-    :return: True if is valid, False if not valid
+    :param row: index of row
+    :param col: index of column
+    :return: index of the square
     """
-    available_moves = list_available_moves_pawn(field=curr_field, directions=directions)
-    if available_moves and dest_field in available_moves:
-        return True
-    return False
+    return row * 8 + col
 
 
-def list_available_moves_single_square(
-    field: str,
-    directions: List[Tuple[int, int]],
-) -> Union[None, List[str]]:
+def list_squares_from_mask(mask: int) -> Tuple[int, ...]:
     """
-    Helper method to collect all available moves for knight and king
+    Helper method to list the squares set in the bitboard
 
-    :param field: field represented in string
-    :param directions: possible directions for the figure
-    :return: list of available moves for the current position
+    :param mask: bitboard of squares
+    :return: tuple of square indices in ascending order
     """
-    available_moves = []
-    curr_row, curr_col = string_field_to_indexes(field=field)
-    for direction in directions:
-        pos_row = curr_row + direction[0]
-        pos_col = curr_col + direction[1]
-        if check_if_figure_in_board(row=pos_row, col=pos_col):
-            available_moves.append(
-                indexes_to_field(row_index=pos_row, col_index=pos_col),
-            )
-    return available_moves
+    squares = []
+    while mask:
+        lowest_bit = mask & -mask
+        squares.append(lowest_bit.bit_length() - 1)
+        mask ^= lowest_bit
+    return tuple(squares)
 
 
-def check_if_valid_single_point_move(
-    curr_field: str,
-    dest_field: str,
-    directions: List[Tuple[int, int]],
-) -> bool:
+def single_square_moves_mask(
+    square: int,
+    directions: Tuple[Tuple[int, int], ...],
+) -> int:
     """
-    Helper method to check if the desired move is valid for knight and kind
+    Helper method to collect the squares a single leap away in the given directions
 
-    :param curr_field: current position of figure
-    :param dest_field: desired destination of figure
+    :param square: index of the square
     :param directions: possible directions for the figure
-    :return: True if is valid, False if not valid
+    :return: bitboard of available moves for the current position
     """
-    available_moves = list_available_moves_single_square(
-        field=curr_field,
-        directions=directions,
-    )
-    if available_moves and dest_field in available_moves:
-        return True
-    return False
+    mask = 0
+    curr_row, curr_col = square_to_indexes(square=square)
+    for direction in directions:
+        pos_row = curr_row + direction[0]
+        pos_col = curr_col + direction[1]
+        if check_if_figure_in_board(row=pos_row, col=pos_col):
+            mask |= SQUARE_MASKS[indexes_to_square(row=pos_row, col=pos_col)]
+    return mask
 
 
-def list_available_moves_multiple_squares(
-    field: str,
-    directions: List[Tuple[int, int]],
-) -> Union[None, List[str]]:
+def multiple_squares_moves_mask(
+    square: int,
+    directions: Tuple[Tuple[int, int], ...],
+) -> int:
     """
-    Helper method to collect all available moves for bishop, rook and queen
+    Helper method to collect the squares reachable by sliding in the given directions
 
-    :param field: field represented in string
+    :param square: index of the square
     :param directions: possible directions for the figure
-    :return: list of available moves for the current position
+    :return: bitboard of available moves for the current position
     """
-    available_moves = []
-    curr_row, curr_col = string_field_to_indexes(field=field)
+    mask = 0
+    curr_row, curr_col = square_to_indexes(square=square)
     for direction in directions:
         temp_row, temp_col = curr_row, curr_col
         while True:
             temp_row += direction[0]
             temp_col += direction[1]
             if check_if_figure_in_board(row=temp_row, col=temp_col):
-                available_moves.append(
-                    indexes_to_field(row_index=temp_row, col_index=temp_col),
-                )
+                mask |= SQUARE_MASKS[indexes_to_square(row=temp_row, col=temp_col)]
             else:
                 break
-    return available_moves
+    return mask
 
 
-def check_if_valid_multiple_squares(
-    curr_field: str,
-    dest_field: str,
-    directions: List[Tuple[int, int]],
-) -> bool:
+def build_moves_masks(
+    moves_mask: Callable[..., int],
+    directions: Tuple[Tuple[int, int], ...],
+) -> Tuple[int, ...]:
     """
-    Helper method to check if the desired move is valid for bishop, queen and rook
+    Helper method to precompute the bitboard of available moves for every square.
+    On the empty board the moves depend only on the square, so they are
+    computed once and served from the table afterwards
 
-    :param curr_field: current position of figure
-    :param dest_field: desired destination of figure
+    :param moves_mask: helper method collecting the moves bitboard of a square
     :param directions: possible directions for the figure
-    :return: True if is valid, False if not valid
+    :return: bitboards of available moves indexed by square
     """
-    available_moves = list_available_moves_multiple_squares(
-        field=curr_field,
-        directions=directions,
+    return tuple(
+        moves_mask(square=square, directions=directions) for square in range(64)
     )
-    if available_moves and dest_field in available_moves:
-        return True
-    return False
 
 
-def check_if_figure_in_board(row: int, col: int) -> bool:
+def build_rays(
+    directions: Tuple[Tuple[int, int], ...],
+) -> Tuple[Tuple[Tuple[int, ...], bool], ...]:
     """
-    Helper method to check if the current position of figure is in board
+    Helper method to precompute the ray of every direction from every square.
+    Each ray is stored with the flag telling if its square indices grow, so the
+    first blocker on the ray is the lowest or the highest set bit respectively
 
-    :param row: index of row
-    :param col: index of column
-    :return: True if valid, False if not valid
+    :param directions: possible directions for the figure
+    :return: tuple of rays indexed by square and the growing flag for every direction
+    """
+    return tuple(
+        (
+            build_moves_masks(
+                moves_mask=multiple_squares_moves_mask,
+                directions=(direction,),
+            ),
+            indexes_to_square(row=direction[0], col=direction[1]) > 0,
+        )
+        for direction in directions
+    )
+
+
+def sliding_moves_mask(
+    square: int,
+    occupied: int,
+    rays: Tuple[Tuple[Tuple[int, ...], bool], ...],
+) -> int:
+    """
+    Helper method to collect moves of bishop, rook and queen on the occupied board.
+    Every ray is cut behind its first blocker, which is included as it might be
+    captured
+
+    :param square: index of the square
+    :param occupied: bitboard of all occupied squares
+    :param rays: precomputed rays of the figure
+    :return: bitboard of reachable squares including the blockers
+    """
+    mask = 0
+    for ray_masks, growing in rays:
+        ray = ray_masks[square]
+        blockers = ray & occupied
+        if blockers:
+            if growing:
+                blocker = (blockers & -blockers).bit_length() - 1
+            else:
+                blocker = blockers.bit_length() - 1
+            ray ^= ray_masks[blocker]
+        mask |= ray
+    return mask
+
+
+def build_available_moves_table(
+    moves_masks: Tuple[int, ...],
+) -> Tuple[Tuple[int, ...], ...]:
     """
-    if 0 <= row < 8 and 0 <= col < 8:
-        return True
-    else:
-        return False
+    Helper method to precompute the available moves of every square as tuples
+
+    :param moves_masks: bitboards of available moves indexed by square
+    :return: tuples of available squares indexed by square
+    """
+    return tuple(list_squares_from_mask(mask=mask) for mask in moves_masks)
 
 
-def string_field_to_indexes(field: str) -> Tuple[int, int]:
+def build_origins_masks(moves_masks: Tuple[int, ...]) -> Tuple[int, ...]:
     """
-    Helper method to change the string representation of position to indices
+    Helper method to precompute the inverse of the moves bitboards, the squares
+    from which the figure moves to every square
 
-    :param field: current position on the board represented in string
-    :return: indices of the current position
+    :param moves_masks: bitboards of available moves indexed by square
+    :return: bitboards of origin squares indexed by destination square
     """
-    letters_to_numbers = {
-        "a": 0,
-        "b": 1,
-        "c": 2,
-        "d": 3,
-        "e": 4,
-        "f": 5,
-        "g": 6,
-        "h": 7,
-    }
-    letter = field[0]
-    number = int(field[1])
-    return 8 - number, letters_to_numbers[letter]
+    origins_masks = [0] * len(moves_masks)
+    for square, mask in enumerate(moves_masks):
+        for move in list_squares_from_mask(mask=mask):
+            origins_masks[move] |= 1 << square
+    return tuple(origins_masks)
 
 
-def indexes_to_field(row_index: int, col_index: int) -> str:
+def build_available_fields_table(
+    available_moves_table: Tuple[Tuple[int, ...], ...],
+    square_names: Tuple[str, ...],
+) -> Tuple[Tuple[str, ...], ...]:
     """
-    Helper method to represent x and y indices of current field in string
+    Helper method to precompute the names of available squares of every square
 
-    :param row_index: index of row
-    :param col_index: index of column
-    :return: string representation of current field
+    :param available_moves_table: tuples of available squares indexed by square
+    :param square_names: names of the squares of the board
+    :return: tuples of names of available squares indexed by square
     """
-    numbers_to_letters = {
-        0: "a",
-        1: "b",
-        2: "c",
-        3: "d",
-        4: "e",
-        5: "f",
-        6: "g",
-        7: "h",
-    }
-    return numbers_to_letters[col_index] + str(8 - row_index)
+    return tuple(
+        tuple(square_names[move] for move in moves) for moves in available_moves_table
+    )
+
 
+SQUARE_NAMES = STANDARD_BOARD.square_names
 
-def check_if_valid_field(field: str) -> bool:
+FIELDS_TO_SQUARES: Dict[str, int] = STANDARD_BOARD.fields_to_squares
+
+
+def field_to_square(field: str) -> int:
     """
-    Helper method to check if the passed field is valid
+    Helper method to change the string representation of position to square index
 
-    :param field: str representation of field
-    :return: True if valid, False if not valid
+    :param field: current position on the board represented in string
+    :return: index of the square
     """
-    if not len(field) == 2:
-        return False
-    if not (ord("a") <= ord(field[0]) <= ord("h")):
-        return False
-    if not (ord("1") <= ord(field[1]) <= ord("8")):
-        return False
-    return True
+    try:
+        return FIELDS_TO_SQUARES[field]
+    except KeyError:
+        raise ValueError("Field does not exist.")
+
+
+def square_to_field(square: int) -> str:
+    """
+    Helper method to represent the square index in string
+
+    :param square: index of the square
+    :return: string representation of current field
+    """
+    return SQUARE_NAMES[square]
@@ -0,0 +1,102 @@
+"""Vectorized moves of the figures for the bulk analytics of (figure, square) samples"""
+from typing import Dict, Tuple, Type
+
+import numpy as np
+from src.api.figures.figure import (
+    Amazon,
+    Archbishop,
+    Bishop,
+    Camel,
+    Chancellor,
+    Figure,
+    King,
+    Knight,
+    Nightrider,
+    Pawn,
+    Queen,
+    Rook,
+    Zebra,
+)
+
+# Figures of the standard board indexed by their codes
+FIGURES: Tuple[Type[Figure], ...] = (
+    King,
+    Queen,
+    Rook,
+    Bishop,
+    Knight,
+    Pawn,
+    Amazon,
+    Archbishop,
+    Chancellor,
+    Camel,
+    Zebra,
+    Nightrider,
+)
+FIGURE_CODES: Dict[Type[Figure], int] = {
+    figure_class: code for code, figure_class in enumerate(FIGURES)
+}
+
+# Bitboards of available moves indexed by figure code and square
+MOVES_MASKS = np.array(
+    [figure_class.moves_masks for figure_class in FIGURES],
+    dtype=np.uint64,
+)
+# Available destination squares indexed by figure code, square and destination
+MOVES_MAPS = ((MOVES_MASKS[..., np.newaxis] >> np.arange(64, dtype=np.uint64)) & 1) == 1
+MOBILITY = MOVES_MAPS.sum(axis=2, dtype=np.int64)
+
+
+def check_samples(figures, squares) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Helper method to convert the samples to the index arrays and validate them
+
+    :param figures: array of figure codes
+    :param squares: array of square indices
+    :return: figure codes and square indices as integer arrays
+    """
+    figures = np.asarray(figures, dtype=np.intp)
+    squares = np.asarray(squares, dtype=np.intp)
+    if figures.size and (figures.min() < 0 or figures.max() >= len(FIGURES)):
+        raise ValueError("Chess figure does not exist.")
+    if squares.size and (squares.min() < 0 or squares.max() >= 64):
+        raise ValueError("Field does not exist.")
+    return figures, squares
+
+
+def mobility_counts(figures, squares) -> np.ndarray:
+    """
+    Count the available moves of every (figure, square) sample
+
+    :param figures: array of figure codes
+    :param squares: array of square indices, broadcast with the figure codes
+    :return: array of the numbers of available moves
+    """
+    figures, squares = check_samples(figures=figures, squares=squares)
+    return MOBILITY[figures, squares]
+
+
+def mobility_maps(figures, squares) -> np.ndarray:
+    """
+    Retrieve the available destination squares of every (figure, square) sample
+
+    :param figures: array of figure codes
+    :param squares: array of square indices, broadcast with the figure codes
+    :return: boolean array with the last axis of 64 destination squares
+    """
+    figures, squares = check_samples(figures=figures, squares=squares)
+    return MOVES_MAPS[figures, squares]
+
+
+def validity_masks(figures, squares, dest_squares) -> np.ndarray:
+    """
+    Check if the moves of every (figure, square, destination) sample are valid
+
+    :param figures: array of figure codes
+    :param squares: array of square indices
+    :param dest_squares: array of destination square indices, all arrays broadcast
+    :return: boolean array, True where the move is valid
+    """
+    figures, squares = check_samples(figures=figures, squares=squares)
+    _, dest_squares = check_samples(figures=(), squares=dest_squares)
+    return MOVES_MAPS[figures, squares, dest_squares]
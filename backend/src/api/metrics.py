@@ -0,0 +1,279 @@
+"""Request metrics of the application exposed in the Prometheus text format"""
+from contextlib import contextmanager
+from threading import Lock
+from time import perf_counter
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from flask import Response, g, request
+from src.api.moves.cache import moves_cache
+from src.api.moves.utils import get_figure_class
+
+# Upper bounds of the latency buckets in seconds
+DEFAULT_BUCKETS = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Histogram:
+    """Cumulative histogram of the observed durations"""
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        """
+        Count the observed value in every bucket it fits in
+
+        :param value: observed duration in seconds
+        """
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+        self.count += 1
+        self.sum += value
+
+    def render(self, name: str, labels: str) -> List[str]:
+        """
+        Render the samples of the histogram
+
+        :param name: name of the metric
+        :param labels: rendered labels of the histogram without braces
+        :return: lines of the samples
+        """
+        prefix = labels + "," if labels else ""
+        lines = [
+            f'{name}_bucket{{{prefix}le="{bound}"}} {count}'
+            for bound, count in zip(self.buckets, self.counts)
+        ]
+        lines.append(f'{name}_bucket{{{prefix}le="+Inf"}} {self.count}')
+        lines.append(f"{name}_sum{{{labels}}} {self.sum}")
+        lines.append(f"{name}_count{{{labels}}} {self.count}")
+        return lines
+
+
+def escape_label(value: str) -> str:
+    """
+    Helper method to escape the label value of the text format
+
+    :param value: value of the label
+    :return: escaped value
+    """
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def figure_label(chess_figure: Optional[str]) -> str:
+    """
+    Helper method to label the requests by the figure. Aliases are labeled by
+    the figure they name and names of not existing figures by "unknown", so
+    the number of labels stays bounded
+
+    :param chess_figure: string representation of the chess figure
+    :return: label of the figure, empty if the request does not name the figure
+    """
+    if chess_figure is None:
+        return ""
+    figure_class = get_figure_class(chess_figure=chess_figure)
+    return "unknown" if figure_class is None else figure_class.__name__.lower()
+
+
+class Metrics:
+    """
+    Thread safe metrics of the requests: latency by route, counts by figure and
+    status code, time spent in the figure engine and in serialization, and the
+    counters of the moves cache. Every worker process keeps its own metrics
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.request_durations: Dict[Tuple[str, str], Histogram] = {}
+        self.request_counts: Dict[Tuple[str, str], int] = {}
+        self.stage_durations: Dict[str, Histogram] = {}
+        self._lock = Lock()
+
+    def init_app(self, app):
+        """
+        Time the requests of the application and register the metrics endpoint
+
+        :param app: flask application
+        """
+        app.before_request(self.start_request)
+        app.after_request(self.finish_request)
+        app.add_url_rule(
+            app.config.get("METRICS_PATH", "/metrics"),
+            "metrics",
+            self.metrics_view,
+        )
+
+    @staticmethod
+    def start_request():
+        """Remember the start of the request"""
+        g.request_start = perf_counter()
+
+    def finish_request(self, response: Response) -> Response:
+        """
+        Record the duration, route, figure and status code of the request
+
+        :param response: response of the request
+        :return: the same response
+        """
+        start = g.pop("request_start", None)
+        if start is not None:
+            self.observe_request(
+                route=request.url_rule.rule if request.url_rule else "unmatched",
+                method=request.method,
+                figure=figure_label((request.view_args or {}).get("chess_figure")),
+                status=response.status_code,
+                duration=perf_counter() - start,
+            )
+        return response
+
+    def observe_request(
+        self,
+        route: str,
+        method: str,
+        figure: str,
+        status: int,
+        duration: float,
+    ):
+        """
+        Record the request
+
+        :param route: rule of the matched route
+        :param method: HTTP method of the request
+        :param figure: label of the requested figure
+        :param status: status code of the response
+        :param duration: duration of the request in seconds
+        """
+        with self._lock:
+            histogram = self.request_durations.get((route, method))
+            if histogram is None:
+                histogram = self.request_durations[(route, method)] = Histogram(
+                    buckets=self.buckets,
+                )
+            histogram.observe(value=duration)
+            key = (figure, str(status))
+            self.request_counts[key] = self.request_counts.get(key, 0) + 1
+
+    @contextmanager
+    def time_stage(self, stage: str) -> Iterator[None]:
+        """
+        Record the time spent in the stage of the request, e.g. in the figure engine
+
+        :param stage: name of the stage
+        """
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            duration = perf_counter() - start
+            with self._lock:
+                histogram = self.stage_durations.get(stage)
+                if histogram is None:
+                    histogram = self.stage_durations[stage] = Histogram(
+                        buckets=self.buckets,
+                    )
+                histogram.observe(value=duration)
+
+    def clear(self):
+        """Remove all recorded metrics"""
+        with self._lock:
+            self.request_durations.clear()
+            self.request_counts.clear()
+            self.stage_durations.clear()
+
+    def render(self) -> str:
+        """
+        Render the metrics in the Prometheus text format
+
+        :return: text of the metrics
+        """
+        lines = [
+            "# HELP chess_api_request_duration_seconds Latency of the requests.",
+            "# TYPE chess_api_request_duration_seconds histogram",
+        ]
+        with self._lock:
+            for (route, method), histogram in sorted(self.request_durations.items()):
+                lines.extend(
+                    histogram.render(
+                        name="chess_api_request_duration_seconds",
+                        labels=f'route="{escape_label(route)}",method="{method}"',
+                    ),
+                )
+            lines.extend(
+                (
+                    "# HELP chess_api_requests_total Requests by figure and status.",
+                    "# TYPE chess_api_requests_total counter",
+                ),
+            )
+            for (figure, status), count in sorted(self.request_counts.items()):
+                lines.append(
+                    f'chess_api_requests_total{{figure="{escape_label(figure)}",'
+                    f'status="{status}"}} {count}',
+                )
+            lines.extend(
+                (
+                    "# HELP chess_api_stage_duration_seconds Time spent in the "
+                    "figure engine and serialization.",
+                    "# TYPE chess_api_stage_duration_seconds histogram",
+                ),
+            )
+            for stage, histogram in sorted(self.stage_durations.items()):
+                lines.extend(
+                    histogram.render(
+                        name="chess_api_stage_duration_seconds",
+                        labels=f'stage="{escape_label(stage)}"',
+                    ),
+                )
+
+        cache_info = moves_cache.info()
+        lookups = cache_info["hits"] + cache_info["misses"]
+        lines.extend(
+            (
+                "# HELP chess_api_cache_hits_total Hits of the moves cache.",
+                "# TYPE chess_api_cache_hits_total counter",
+                f"chess_api_cache_hits_total {cache_info['hits']}",
+                "# HELP chess_api_cache_misses_total Misses of the moves cache.",
+                "# TYPE chess_api_cache_misses_total counter",
+                f"chess_api_cache_misses_total {cache_info['misses']}",
+                "# HELP chess_api_cache_hit_ratio Ratio of hits to lookups.",
+                "# TYPE chess_api_cache_hit_ratio gauge",
+                f"chess_api_cache_hit_ratio "
+                f"{cache_info['hits'] / lookups if lookups else 0.0}",
+                "# HELP chess_api_cache_size Responses stored in the moves cache.",
+                "# TYPE chess_api_cache_size gauge",
+                f"chess_api_cache_size {cache_info['size']}",
+                "# HELP chess_api_cache_max_size Capacity of the moves cache.",
+                "# TYPE chess_api_cache_max_size gauge",
+                f"chess_api_cache_max_size {cache_info['maxSize']}",
+            ),
+        )
+        return "\n".join(lines) + "\n"
+
+    def metrics_view(self) -> Response:
+        """
+        Serve the metrics in the Prometheus text format
+
+        :return: response with the metrics
+        """
+        return Response(self.render(), content_type=CONTENT_TYPE)
+
+
+metrics = Metrics()
@@ -0,0 +1,88 @@
+from collections import OrderedDict
+from hashlib import sha1
+from threading import Lock
+from typing import Dict, Hashable, NamedTuple, Optional
+
+
+class CachedResponse(NamedTuple):
+    """Serialized response stored in the cache"""
+
+    body: bytes
+    status: int
+    etag: str
+
+
+class ResponseCache:
+    """Thread safe LRU cache of serialized responses with hit and miss counters"""
+
+    def __init__(self, max_size: int = 4096):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._responses: "OrderedDict[Hashable, CachedResponse]" = OrderedDict()
+        self._lock = Lock()
+
+    def init_app(self, app):
+        """
+        Configure the cache from the application settings
+
+        :param app: flask application
+        """
+        self.max_size = app.config.get("MOVES_CACHE_SIZE", self.max_size)
+
+    def get(self, key: Hashable) -> Optional[CachedResponse]:
+        """
+        Retrieve the response and mark it as recently used
+
+        :param key: key of the response
+        :return: cached response or None if it is not cached
+        """
+        with self._lock:
+            response = self._responses.get(key)
+            if response is None:
+                self.misses += 1
+                return None
+            self._responses.move_to_end(key)
+            self.hits += 1
+            return response
+
+    def set(self, key: Hashable, body: bytes, status: int) -> CachedResponse:
+        """
+        Store the serialized response, evicting the least recently used one if full
+
+        :param key: key of the response
+        :param body: serialized response
+        :param status: status code of the response
+        :return: cached response with its strong ETag
+        """
+        response = CachedResponse(body=body, status=status, etag=sha1(body).hexdigest())
+        with self._lock:
+            self._responses[key] = response
+            self._responses.move_to_end(key)
+            while len(self._responses) > self.max_size:
+                self._responses.popitem(last=False)
+        return response
+
+    def clear(self):
+        """Remove all responses and reset the counters"""
+        with self._lock:
+            self._responses.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> Dict[str, int]:
+        """
+        Retrieve the counters of the cache
+
+        :return: hits, misses, current and maximal size of the cache
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._responses),
+                "maxSize": self.max_size,
+            }
+
+
+moves_cache = ResponseCache()
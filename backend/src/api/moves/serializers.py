@@ -0,0 +1,87 @@
+import json
+from json.encoder import encode_basestring_ascii
+from typing import Any, Dict
+
+from flask import current_app
+from flask_restx import Model, fields, marshal
+from flask_restx.representations import dumps, output_json
+
+
+class TemplateEncoder:
+    """
+    Encoder of the flat response objects to JSON through the template pre-encoded
+    from the model. Produces the same bytes as marshalling with the model and
+    dumping with the default settings of flask-restx
+    """
+
+    def __init__(self, model: Model):
+        self.fields = []
+        for key, field in model.items():
+            if isinstance(field, type):
+                field = field()
+            if isinstance(field, fields.List) and isinstance(
+                field.container,
+                fields.String,
+            ):
+                self.fields.append((key, True))
+            elif isinstance(field, fields.String):
+                self.fields.append((key, False))
+            else:
+                raise TypeError(f"Field {key} of {model.name} cannot be encoded.")
+        self.template = (
+            "{"
+            + ", ".join(f"{encode_basestring_ascii(key)}: %s" for key, _ in self.fields)
+            + "}\n"
+        )
+
+    def encode(self, response_object: Dict[str, Any]) -> bytes:
+        """
+        Encode the response object filling the template
+
+        :param response_object: response object with the fields of the model
+        :return: JSON representation of the response object
+        """
+        values = []
+        for key, is_list in self.fields:
+            value = response_object.get(key)
+            if value is None:
+                values.append("null")
+            elif is_list:
+                values.append(
+                    "["
+                    + ", ".join(
+                        "null" if item is None else encode_basestring_ascii(str(item))
+                        for item in value
+                    )
+                    + "]",
+                )
+            else:
+                values.append(encode_basestring_ascii(str(value)))
+        return (self.template % tuple(values)).encode()
+
+
+encoders: Dict[str, TemplateEncoder] = {}
+
+
+def serialize(response_object: Dict[str, Any], model: Model, status: int) -> bytes:
+    """
+    Serialize the response object with the template encoder of the model. Falls back
+    to the marshalling of flask-restx when its JSON output is customised, e.g. in
+    debug mode which indents the output
+
+    :param response_object: response object with the fields of the model
+    :param model: model of the response
+    :param status: status code of the response
+    :return: JSON representation of the response object
+    """
+    if (
+        current_app.debug
+        or current_app.config.get("RESTX_JSON")
+        or dumps is not json.dumps
+    ):
+        return output_json(marshal(response_object, model), status).get_data()
+
+    encoder = encoders.get(model.name)
+    if encoder is None:
+        encoder = encoders[model.name] = TemplateEncoder(model=model)
+    return encoder.encode(response_object=response_object)
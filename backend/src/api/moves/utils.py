@@ -1,40 +1,663 @@
-from typing import Union
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Type, Union
 
-from src.api.figures.figure import Bishop, King, Knight, Pawn, Queen, Rook
+from src.api.figures.board import STANDARD_BOARD, Board, parse_board_size
+from src.api.figures.figure import (
+    Amazon,
+    Archbishop,
+    Bishop,
+    Camel,
+    Chancellor,
+    Figure,
+    King,
+    Knight,
+    Nightrider,
+    Pawn,
+    Queen,
+    Rook,
+    Zebra,
+)
+from src.api.figures.paths import (
+    get_distance,
+    iter_shortest_paths,
+    list_reachable_squares,
+)
+from src.api.figures.perft import PerftLimitError, run_perft
+from src.api.figures.position import (
+    BLACK,
+    COLORS,
+    FIGURE_NAMES,
+    WHITE,
+    Position,
+)
+from src.api.figures.tours import iter_tours
+from src.api.figures.transposition import lookup_legal_moves, perft_table
+from src.api.figures.utils import SQUARE_NAMES, list_squares_from_mask
+from src.api.moves.cache import moves_cache
 
-chess_figures = {"rook", "king", "queen", "pawn", "knight", "bishop"}
+# Names, aliases and symbols of the chess figures, looked up case-insensitively
+figures_registry: Dict[str, Type[Figure]] = {}
 
 
-def check_if_valid_chess_figure(chess_figure: str) -> bool:
+def register_figure(figure_class: Type[Figure], names: Iterable[str]):
     """
-    Helper method to check if the chess figure name is valid
+    Helper method to register the figure class under its names, so the new figures
+    can be served by the API without changing the lookup. Cached responses are
+    dropped as they might answer the names as not existing. No name is registered
+    if any of them belongs to another figure
+
+    :param figure_class: class of the figure
+    :param names: names, aliases and symbols of the figure
+    :raises ValueError: if a name is registered for another figure
+    """
+    names = tuple(names)
+    for name in names:
+        registered_class = figures_registry.get(name.casefold())
+        if registered_class is not None and registered_class is not figure_class:
+            raise ValueError(f"Chess figure - {name} - is already registered.")
+    for name in names:
+        figures_registry[name.casefold()] = figure_class
+    moves_cache.clear()
+
+
+def get_figure_class(chess_figure: str) -> Optional[Type[Figure]]:
+    """
+    Helper method to retrieve the figure class by its name, alias or symbol
+
+    :param chess_figure: string representation of the chess figure
+    :return: class of the figure, None if the chess figure name is not valid
+    """
+    return figures_registry.get(chess_figure.casefold())
+
+
+class QueryError(ValueError):
+    """Error of the query answered with its status code"""
+
+    def __init__(self, message: str, status: int):
+        super().__init__(message)
+        self.status = status
+
+
+def resolve_board(
+    board_size: Optional[str],
+    fields: Iterable[str] = (),
+) -> Tuple[Board, Tuple[int, ...]]:
+    """
+    Helper method to retrieve the board of given size and the squares of the fields
+
+    :param board_size: size of the board as <files>x<ranks>, 8x8 if not given
+    :param fields: fields on the board
+    :return: board and the squares of the fields
+    :raises QueryError: 400 if the board size is not valid, 409 if a field does
+        not exist
+    """
+    try:
+        board = (
+            STANDARD_BOARD
+            if board_size is None
+            else parse_board_size(board_size=board_size)
+        )
+    except ValueError:
+        raise QueryError(message="Board size is not valid.", status=400)
+    try:
+        squares = tuple(board.field_to_square(field=field) for field in fields)
+    except ValueError:
+        raise QueryError(message="Field does not exist.", status=409)
+    return board, squares
+
+
+register_figure(figure_class=King, names=("king", "k", "\u2654", "\u265a"))
+register_figure(figure_class=Queen, names=("queen", "q", "\u2655", "\u265b"))
+register_figure(figure_class=Rook, names=("rook", "r", "\u2656", "\u265c"))
+register_figure(figure_class=Bishop, names=("bishop", "b", "\u2657", "\u265d"))
+register_figure(figure_class=Knight, names=("knight", "n", "\u2658", "\u265e"))
+register_figure(figure_class=Pawn, names=("pawn", "p", "\u2659", "\u265f"))
+# Fairy figures of the chess variants
+register_figure(figure_class=Amazon, names=("amazon",))
+register_figure(figure_class=Archbishop, names=("archbishop", "cardinal", "princess"))
+register_figure(figure_class=Chancellor, names=("chancellor", "marshal", "empress"))
+register_figure(figure_class=Camel, names=("camel",))
+register_figure(figure_class=Zebra, names=("zebra",))
+register_figure(figure_class=Nightrider, names=("nightrider",))
+
+
+def get_move_validity(
+    chess_figure: str,
+    curr_field: str,
+    dest_field: str,
+    board_size: Optional[str] = None,
+) -> Tuple[Dict[str, str], int]:
+    """
+    Helper method to check if the dest move is valid for current field and chess figure
+
+    :param chess_figure: string representation of the chess figure
+    :param curr_field: current field of the figure
+    :param dest_field: desired destination field of the figure
+    :param board_size: size of the board as <files>x<ranks>, 8x8 if not given
+    :return: response object with the validity of the move and its status code
+    """
+    response_object = {
+        "figure": chess_figure,
+        "currentField": curr_field,
+        "destField": dest_field,
+        "error": "null",
+        "move": "invalid",
+    }
+
+    figure_class = get_figure_class(chess_figure=chess_figure)
+    if figure_class is None:
+        response_object["error"] = f"Chess figure - {chess_figure} - does not exist."
+        return response_object, 404
+
+    try:
+        board, (square,) = resolve_board(board_size=board_size, fields=(curr_field,))
+    except QueryError as error:
+        response_object["error"] = str(error)
+        return response_object, error.status
+    figure = figure_class.at(square=square, board=board)
+
+    dest_square = board.fields_to_squares.get(dest_field)
+    if dest_square is None or not figure.validate_move(dest_square=dest_square):
+        response_object["error"] = "Current move is not permitted."
+        return response_object, 200
+
+    response_object["move"] = "valid"
+    return response_object, 200
+
+
+def get_available_moves(
+    chess_figure: str,
+    curr_field: str,
+    board_size: Optional[str] = None,
+) -> Tuple[Dict[str, Union[str, List[str]]], int]:
+    """
+    Helper method to retrieve available moves for current field and chess figure
+
+    :param chess_figure: string representation of the chess figure
+    :param curr_field: current field of the figure
+    :param board_size: size of the board as <files>x<ranks>, 8x8 if not given
+    :return: response object with the available moves and its status code
+    """
+    response_object: Dict[str, Union[str, List[str]]] = {
+        "figure": chess_figure,
+        "currentField": curr_field,
+        "error": "null",
+        "availableMoves": [],
+    }
+
+    figure_class = get_figure_class(chess_figure=chess_figure)
+    if figure_class is None:
+        response_object["error"] = f"Chess figure - {chess_figure} - does not exist."
+        return response_object, 404
+
+    try:
+        board, (square,) = resolve_board(board_size=board_size, fields=(curr_field,))
+    except QueryError as error:
+        response_object["error"] = str(error)
+        return response_object, error.status
+    figure = figure_class.at(square=square, board=board)
+
+    response_object["availableMoves"] = figure.list_available_fields()
+
+    return response_object, 200
+
+
+def get_move_validity_batch(moves: Any, batch_limit: int) -> Tuple[Dict[str, Any], int]:
+    """
+    Helper method to check if the dest moves are valid for a list of fields and
+    chess figures
+
+    :param moves: decoded request body, expected to be a list of moves
+    :param batch_limit: the highest number of moves in the batch
+    :return: response object with the results of the moves and its status code
+    """
+    response_object: Dict[str, Any] = {"error": "null", "results": []}
+
+    if not isinstance(moves, list):
+        response_object["error"] = "Request body must be a list of moves."
+        return response_object, 400
+
+    if len(moves) > batch_limit:
+        response_object["error"] = f"Batch exceeds the limit of {batch_limit}."
+        return response_object, 413
+
+    for move in moves:
+        if not isinstance(move, dict) or not all(
+            isinstance(move.get(key), str)
+            for key in ("figure", "currentField", "destField")
+        ):
+            response_object["results"].append(
+                {"error": "Move request is not valid.", "status": 400},
+            )
+            continue
+        result, status = get_move_validity(
+            chess_figure=move["figure"],
+            curr_field=move["currentField"],
+            dest_field=move["destField"],
+        )
+        result["status"] = status
+        response_object["results"].append(result)
+
+    return response_object, 200
+
+
+def get_available_moves_batch(
+    queries: Any,
+    batch_limit: int,
+) -> Tuple[Dict[str, Any], int]:
+    """
+    Helper method to retrieve available moves for a list of fields and chess
+    figures, or for all fields of the figure if the whole board is requested
+
+    :param queries: decoded request body, expected to be a list of fields
+    :param batch_limit: the highest number of fields in the batch
+    :return: response object with the results of the fields and its status code
+    """
+    response_object: Dict[str, Any] = {"error": "null", "results": []}
+
+    if isinstance(queries, dict) and queries.get("wholeBoard") is True:
+        if not isinstance(queries.get("figure"), str):
+            response_object["error"] = "Request body must name the figure."
+            return response_object, 400
+        queries = [
+            {"figure": queries["figure"], "currentField": field}
+            for field in SQUARE_NAMES
+        ]
+    if not isinstance(queries, list):
+        response_object["error"] = "Request body must be a list of fields."
+        return response_object, 400
+
+    if len(queries) > batch_limit:
+        response_object["error"] = f"Batch exceeds the limit of {batch_limit}."
+        return response_object, 413
+
+    for query in queries:
+        if not isinstance(query, dict) or not all(
+            isinstance(query.get(key), str) for key in ("figure", "currentField")
+        ):
+            response_object["results"].append(
+                {"error": "Moves request is not valid.", "status": 400},
+            )
+            continue
+        result, status = get_available_moves(
+            chess_figure=query["figure"],
+            curr_field=query["currentField"],
+        )
+        result["status"] = status
+        response_object["results"].append(result)
+
+    return response_object, 200
+
+
+def get_origin_fields(
+    chess_figure: str,
+    dest_field: str,
+    board_size: Optional[str] = None,
+) -> Tuple[Dict[str, Union[str, List[str]]], int]:
+    """
+    Helper method to retrieve the fields from which the chess figure moves to
+    the destination field
+
+    :param chess_figure: string representation of the chess figure
+    :param dest_field: destination field of the figure
+    :param board_size: size of the board as <files>x<ranks>, 8x8 if not given
+    :return: response object with the origin fields and its status code
+    """
+    response_object: Dict[str, Union[str, List[str]]] = {
+        "figure": chess_figure,
+        "destField": dest_field,
+        "error": "null",
+        "originFields": [],
+    }
+
+    figure_class = get_figure_class(chess_figure=chess_figure)
+    if figure_class is None:
+        response_object["error"] = f"Chess figure - {chess_figure} - does not exist."
+        return response_object, 404
+
+    try:
+        board, (dest_square,) = resolve_board(
+            board_size=board_size, fields=(dest_field,)
+        )
+    except QueryError as error:
+        response_object["error"] = str(error)
+        return response_object, error.status
+    figure = figure_class.at(square=dest_square, board=board)
+
+    response_object["originFields"] = [
+        board.square_names[origin] for origin in figure.list_origins()
+    ]
+
+    return response_object, 200
+
+
+def get_tours(
+    chess_figure: str,
+    curr_field: str,
+    closed: bool = False,
+    tours: str = "1",
+    tours_limit: int = 100,
+    search_limit: Optional[int] = None,
+    board_size: Optional[str] = None,
+) -> Tuple[Dict[str, Any], int]:
+    """
+    Helper method to retrieve the tours of the chess figure visiting every field
+    of the board once. Tours are found lazily while the response is consumed
 
     :param chess_figure: string representation of the chess figure
-    :return: True if valid, False if not
+    :param curr_field: starting field of the figure
+    :param closed: True if the tours should end one move from the starting field
+    :param tours: number of tours represented in string
+    :param tours_limit: the highest number of tours
+    :param search_limit: the highest number of moves tried by the search
+    :param board_size: size of the board as <files>x<ranks>, 8x8 if not given
+    :return: response object with the generator of the tours and its status code
     """
-    return chess_figure in chess_figures
+    response_object: Dict[str, Any] = {
+        "figure": chess_figure,
+        "currentField": curr_field,
+        "error": "null",
+        "tours": iter(()),
+    }
+
+    figure_class = get_figure_class(chess_figure=chess_figure)
+    if figure_class is None:
+        response_object["error"] = f"Chess figure - {chess_figure} - does not exist."
+        return response_object, 404
+
+    if not (tours.isascii() and tours.isdigit()) or not 0 < int(tours) <= tours_limit:
+        response_object["error"] = f"Tours must be a number from 1 to {tours_limit}."
+        return response_object, 400
 
+    try:
+        board, (square,) = resolve_board(board_size=board_size, fields=(curr_field,))
+    except QueryError as error:
+        response_object["error"] = str(error)
+        return response_object, error.status
 
-def get_figure_by_name(
+    found_tours = iter_tours(
+        square=square,
+        figure_class=figure_class,
+        closed=closed,
+        board=board,
+        search_limit=search_limit,
+    )
+    response_object["tours"] = (
+        [board.square_names[step] for step in tour]
+        for tour in islice(found_tours, int(tours))
+    )
+    return response_object, 200
+
+
+def get_shortest_paths(
     chess_figure: str,
     curr_field: str,
-) -> Union[Pawn, King, Queen, Knight, Bishop, Rook]:
+    dest_field: str,
+    all_paths: bool = False,
+    paths_limit: int = 100,
+    board_size: Optional[str] = None,
+) -> Tuple[Dict[str, Any], int]:
     """
-    Helper method to retrieve the object by name and create
+    Helper method to retrieve the minimal number of moves and the shortest paths
+    of the chess figure between the fields
 
     :param chess_figure: string representation of the chess figure
-    :param curr_field: current field of the object
-    :return: The object of figure based on the chess figure name
-    """
-    if chess_figure == "pawn":
-        return Pawn(field=curr_field)
-    elif chess_figure == "king":
-        return King(field=curr_field)
-    elif chess_figure == "queen":
-        return Queen(field=curr_field)
-    elif chess_figure == "knight":
-        return Knight(field=curr_field)
-    elif chess_figure == "bishop":
-        return Bishop(field=curr_field)
+    :param curr_field: current field of the figure
+    :param dest_field: destination field of the figure
+    :param all_paths: True if all shortest paths should be listed, not only one
+    :param paths_limit: the highest number of listed paths
+    :param board_size: size of the board as <files>x<ranks>, 8x8 if not given
+    :return: response object with the shortest paths and its status code
+    """
+    response_object: Dict[str, Any] = {
+        "figure": chess_figure,
+        "currentField": curr_field,
+        "destField": dest_field,
+        "error": "null",
+        "moves": None,
+        "paths": [],
+    }
+
+    figure_class = get_figure_class(chess_figure=chess_figure)
+    if figure_class is None:
+        response_object["error"] = f"Chess figure - {chess_figure} - does not exist."
+        return response_object, 404
+
+    try:
+        board, (square, dest_square) = resolve_board(
+            board_size=board_size,
+            fields=(curr_field, dest_field),
+        )
+    except QueryError as error:
+        response_object["error"] = str(error)
+        return response_object, error.status
+
+    moves = get_distance(
+        figure_class=figure_class,
+        square=square,
+        dest_square=dest_square,
+        board=board,
+    )
+    if moves == -1:
+        response_object["error"] = "Destination field is not reachable."
+        return response_object, 200
+
+    paths = iter_shortest_paths(
+        figure_class=figure_class,
+        square=square,
+        dest_square=dest_square,
+        board=board,
+    )
+    response_object["moves"] = moves
+    response_object["paths"] = [
+        [board.square_names[step] for step in path]
+        for path in islice(paths, paths_limit if all_paths else 1)
+    ]
+    return response_object, 200
+
+
+def get_reachable_fields(
+    chess_figure: str,
+    curr_field: str,
+    moves: str,
+    board_size: Optional[str] = None,
+) -> Tuple[Dict[str, Any], int]:
+    """
+    Helper method to retrieve the fields reachable by the chess figure within
+    the number of moves
+
+    :param chess_figure: string representation of the chess figure
+    :param curr_field: current field of the figure
+    :param moves: maximal number of moves represented in string
+    :param board_size: size of the board as <files>x<ranks>, 8x8 if not given
+    :return: response object with the reachable fields and its status code
+    """
+    response_object: Dict[str, Any] = {
+        "figure": chess_figure,
+        "currentField": curr_field,
+        "moves": None,
+        "error": "null",
+        "reachableFields": [],
+    }
+
+    figure_class = get_figure_class(chess_figure=chess_figure)
+    if figure_class is None:
+        response_object["error"] = f"Chess figure - {chess_figure} - does not exist."
+        return response_object, 404
+
+    if not (moves.isascii() and moves.isdigit()):
+        response_object["error"] = "Moves must be a non-negative number."
+        return response_object, 400
+    response_object["moves"] = int(moves)
+
+    try:
+        board, (square,) = resolve_board(board_size=board_size, fields=(curr_field,))
+    except QueryError as error:
+        response_object["error"] = str(error)
+        return response_object, error.status
+
+    response_object["reachableFields"] = [
+        board.square_names[reachable]
+        for reachable in list_reachable_squares(
+            figure_class=figure_class,
+            square=square,
+            moves=int(moves),
+            board=board,
+        )
+    ]
+    return response_object, 200
+
+
+def get_position_moves(fen: str) -> Tuple[Dict[str, Any], int]:
+    """
+    Helper method to retrieve available moves and captures of every piece in position
+
+    :param fen: position in the Forsyth-Edwards Notation
+    :return: response object with the moves of the pieces and its status code
+    """
+    response_object: Dict[str, Any] = {"fen": fen, "error": "null", "pieces": []}
+
+    try:
+        position = Position(fen=fen)
+    except ValueError:
+        response_object["error"] = "FEN is not valid."
+        return response_object, 400
+
+    for square, piece in position.list_pieces():
+        moves_mask = position.moves_mask(square=square)
+        captures_mask = position.captures_mask(square=square)
+        response_object["pieces"].append(
+            {
+                "figure": FIGURE_NAMES[piece.lower()],
+                "color": COLORS[BLACK if piece.islower() else WHITE],
+                "currentField": SQUARE_NAMES[square],
+                "availableMoves": [
+                    SQUARE_NAMES[move] for move in list_squares_from_mask(moves_mask)
+                ],
+                "captures": [
+                    SQUARE_NAMES[capture]
+                    for capture in list_squares_from_mask(captures_mask)
+                ],
+            },
+        )
+
+    return response_object, 200
+
+
+def get_attack_map(fen: str) -> Tuple[Dict[str, Any], int]:
+    """
+    Helper method to retrieve the attackers of every square of position for both colors
+
+    :param fen: position in the Forsyth-Edwards Notation
+    :return: response object with the attackers of the squares and its status code
+    """
+    response_object: Dict[str, Any] = {"fen": fen, "error": "null", "squares": []}
+
+    try:
+        position = Position(fen=fen)
+    except ValueError:
+        response_object["error"] = "FEN is not valid."
+        return response_object, 400
+
+    white_attackers, black_attackers = position.attack_map()
+    for square, field in enumerate(SQUARE_NAMES):
+        response_object["squares"].append(
+            {
+                "field": field,
+                "piece": position.board[square],
+                "whiteCount": len(white_attackers[square]),
+                "blackCount": len(black_attackers[square]),
+                "whiteAttackers": [
+                    SQUARE_NAMES[attacker] for attacker in white_attackers[square]
+                ],
+                "blackAttackers": [
+                    SQUARE_NAMES[attacker] for attacker in black_attackers[square]
+                ],
+            },
+        )
+
+    return response_object, 200
+
+
+def get_legal_moves(fen: str) -> Tuple[Dict[str, Any], int]:
+    """
+    Helper method to retrieve all legal moves of the side to move in position
+
+    :param fen: position in the Forsyth-Edwards Notation
+    :return: response object with the legal moves and its status code
+    """
+    response_object: Dict[str, Any] = {
+        "fen": fen,
+        "error": "null",
+        "sideToMove": None,
+        "check": False,
+        "legalMoves": [],
+    }
+
+    try:
+        position = Position(fen=fen)
+    except ValueError:
+        response_object["error"] = "FEN is not valid."
+        return response_object, 400
+
+    response_object["sideToMove"] = COLORS[position.side_to_move]
+    response_object["check"] = position.is_in_check(color=position.side_to_move)
+    response_object["legalMoves"] = lookup_legal_moves(position=position)
+
+    return response_object, 200
+
+
+def get_perft(
+    fen: str,
+    depth: str,
+    max_depth: int,
+    search_limit: Optional[int] = None,
+) -> Tuple[Dict[str, Any], int]:
+    """
+    Helper method to count perft nodes of position and measure the nodes per second
+
+    :param fen: position in the Forsyth-Edwards Notation
+    :param depth: number of plies to enumerate represented in string
+    :param max_depth: the highest depth allowed to enumerate
+    :param search_limit: the highest number of positions whose moves are
+        generated, unlimited if None
+    :return: response object with the node count and its status code
+    """
+    response_object: Dict[str, Any] = {
+        "fen": fen,
+        "depth": None,
+        "error": "null",
+        "nodes": 0,
+        "seconds": 0.0,
+        "nodesPerSecond": 0,
+    }
+
+    if not (depth.isascii() and depth.isdigit()) or int(depth) > max_depth:
+        response_object["error"] = f"Depth must be a number from 0 to {max_depth}."
+        return response_object, 400
+    response_object["depth"] = int(depth)
+
+    try:
+        nodes, seconds = run_perft(
+            fen=fen,
+            depth=int(depth),
+            table=perft_table,
+            search_limit=search_limit,
+        )
+    except ValueError:
+        response_object["error"] = "FEN is not valid."
+        return response_object, 400
+    except PerftLimitError as error:
+        response_object["error"] = str(error)
+        return response_object, 400
+
+    response_object["nodes"] = nodes
+    # Counts read from the table are not timed, they do not measure the engine
+    if seconds is None:
+        response_object["seconds"] = None
+        response_object["nodesPerSecond"] = None
     else:
-        return Rook(field=curr_field)
+        response_object["seconds"] = seconds
+        response_object["nodesPerSecond"] = int(nodes / seconds) if seconds else 0
+
+    return response_object, 200
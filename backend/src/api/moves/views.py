@@ -1,5 +1,25 @@
-from flask_restx import Namespace, Resource, fields
-from src.api.moves.utils import check_if_valid_chess_figure, get_figure_by_name
+from typing import Any, Dict, Optional, Tuple
+
+from flask import Response, current_app, request, stream_with_context
+from flask_restx import Model, Namespace, Resource, fields, marshal
+from src.api.figures.tours import SearchLimitError
+from src.api.metrics import metrics
+from src.api.moves.cache import CachedResponse, moves_cache
+from src.api.moves.serializers import TemplateEncoder, serialize
+from src.api.moves.utils import (
+    get_attack_map,
+    get_available_moves,
+    get_available_moves_batch,
+    get_legal_moves,
+    get_move_validity,
+    get_move_validity_batch,
+    get_origin_fields,
+    get_perft,
+    get_position_moves,
+    get_reachable_fields,
+    get_shortest_paths,
+    get_tours,
+)
 
 moves_namespace = Namespace("figure")
 
@@ -14,6 +34,31 @@ move_validity_fields = moves_namespace.model(
     },
 )
 
+move_validity_request_fields = moves_namespace.model(
+    "Move Validity Request",
+    {
+        "figure": fields.String(required=True),
+        "currentField": fields.String(required=True),
+        "destField": fields.String(required=True),
+    },
+)
+
+move_validity_batch_fields = moves_namespace.model(
+    "Move Validity Batch",
+    {
+        "results": fields.List(
+            fields.Nested(
+                moves_namespace.inherit(
+                    "Move Validity Result",
+                    move_validity_fields,
+                    {"status": fields.Integer},
+                ),
+            ),
+        ),
+        "error": fields.String,
+    },
+)
+
 available_moves_fields = moves_namespace.model(
     "Available Moves",
     {
@@ -24,75 +69,465 @@ available_moves_fields = moves_namespace.model(
     },
 )
 
+available_moves_request_fields = moves_namespace.model(
+    "Available Moves Request",
+    {
+        "figure": fields.String(required=True),
+        "currentField": fields.String(required=True),
+    },
+)
+
+available_moves_batch_fields = moves_namespace.model(
+    "Available Moves Batch",
+    {
+        "results": fields.List(
+            fields.Nested(
+                moves_namespace.inherit(
+                    "Available Moves Result",
+                    available_moves_fields,
+                    {"status": fields.Integer},
+                ),
+            ),
+        ),
+        "error": fields.String,
+    },
+)
+
+position_moves_fields = moves_namespace.model(
+    "Position Moves",
+    {
+        "pieces": fields.List(
+            fields.Nested(
+                moves_namespace.model(
+                    "Piece Moves",
+                    {
+                        "availableMoves": fields.List(fields.String),
+                        "captures": fields.List(fields.String),
+                        "figure": fields.String,
+                        "color": fields.String,
+                        "currentField": fields.String,
+                    },
+                ),
+            ),
+        ),
+        "error": fields.String,
+        "fen": fields.String,
+    },
+)
+
+legal_moves_fields = moves_namespace.model(
+    "Legal Moves",
+    {
+        "legalMoves": fields.List(
+            fields.String(description="Move in UCI notation, e.g. e7e8q"),
+        ),
+        "sideToMove": fields.String,
+        "check": fields.Boolean,
+        "error": fields.String,
+        "fen": fields.String,
+    },
+)
+
+shortest_paths_fields = moves_namespace.model(
+    "Shortest Paths",
+    {
+        "paths": fields.List(fields.List(fields.String)),
+        "moves": fields.Integer(description="Minimal number of moves"),
+        "error": fields.String,
+        "figure": fields.String,
+        "currentField": fields.String,
+        "destField": fields.String,
+    },
+)
+
+origin_fields_fields = moves_namespace.model(
+    "Origin Fields",
+    {
+        "originFields": fields.List(fields.String),
+        "error": fields.String,
+        "figure": fields.String,
+        "destField": fields.String,
+    },
+)
+
+tour_fields = moves_namespace.model(
+    "Tour",
+    {
+        "tour": fields.List(fields.String),
+        "error": fields.String,
+        "figure": fields.String,
+        "currentField": fields.String,
+    },
+)
+# Tours are streamed one per line, so they are never indented
+tour_encoder = TemplateEncoder(model=tour_fields)
+
+reachable_fields_fields = moves_namespace.model(
+    "Reachable Fields",
+    {
+        "reachableFields": fields.List(fields.String),
+        "moves": fields.Integer,
+        "error": fields.String,
+        "figure": fields.String,
+        "currentField": fields.String,
+    },
+)
+
+attack_map_fields = moves_namespace.model(
+    "Attack Map",
+    {
+        "squares": fields.List(
+            fields.Nested(
+                moves_namespace.model(
+                    "Square Attackers",
+                    {
+                        "field": fields.String,
+                        "piece": fields.String(description="FEN letter of the piece"),
+                        "whiteCount": fields.Integer,
+                        "blackCount": fields.Integer,
+                        "whiteAttackers": fields.List(fields.String),
+                        "blackAttackers": fields.List(fields.String),
+                    },
+                ),
+            ),
+        ),
+        "error": fields.String,
+        "fen": fields.String,
+    },
+)
+
+perft_fields = moves_namespace.model(
+    "Perft",
+    {
+        "nodes": fields.Integer,
+        "seconds": fields.Float,
+        "nodesPerSecond": fields.Integer,
+        "depth": fields.Integer,
+        "error": fields.String,
+        "fen": fields.String,
+    },
+)
+
+
+def get_cached_moves_response(
+    chess_figure: str,
+    curr_field: str,
+    dest_field: Optional[str] = None,
+    board_size: Optional[str] = None,
+) -> CachedResponse:
+    """
+    Retrieve the serialized move validity, or available moves if there is no
+    destination field, from the cache, computing it on the cache miss
+
+    :param chess_figure: string representation of the chess figure
+    :param curr_field: current field of the figure
+    :param dest_field: desired destination field of the figure
+    :param board_size: size of the board as <files>x<ranks>, 8x8 if not given
+    :return: cached response with its status code and ETag
+    """
+    key = (chess_figure, curr_field, dest_field, board_size)
+    cached = moves_cache.get(key=key)
+    if cached is not None:
+        return cached
+
+    with metrics.time_stage(stage="engine"):
+        if dest_field is None:
+            model = available_moves_fields
+            response_object, status = get_available_moves(
+                chess_figure=chess_figure,
+                curr_field=curr_field,
+                board_size=board_size,
+            )
+        else:
+            model = move_validity_fields
+            response_object, status = get_move_validity(
+                chess_figure=chess_figure,
+                curr_field=curr_field,
+                dest_field=dest_field,
+                board_size=board_size,
+            )
+    with metrics.time_stage(stage="serialization"):
+        body = serialize(response_object=response_object, model=model, status=status)
+    return moves_cache.set(key=key, body=body, status=status)
+
+
+def marshal_response(
+    response: Tuple[Dict[str, Any], int],
+    model: Model,
+) -> Tuple[Dict[str, Any], int]:
+    """
+    Marshal the response object with the model, timed as the serialization stage
+
+    :param response: response object and its status code
+    :param model: model of the response
+    :return: marshalled response object and its status code
+    """
+    response_object, status = response
+    with metrics.time_stage(stage="serialization"):
+        return marshal(response_object, model), status
+
+
+def cached_response(cached: CachedResponse) -> Response:
+    """
+    Make the response from the cached one. Successful responses carry strong
+    ETags and are marked as cacheable by clients and proxies, errors are not
+    stored, since figures registered later may turn them into successes
+
+    :param cached: cached response
+    :return: response, 304 if the client already has its current version
+    """
+    response = current_app.response_class(
+        cached.body,
+        status=cached.status,
+        mimetype="application/json",
+    )
+    if cached.status != 200:
+        response.cache_control.no_store = True
+        return response
+    response.set_etag(cached.etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = current_app.config["MOVES_CACHE_MAX_AGE"]
+    return response.make_conditional(request)
+
 
 class ValidChessMove(Resource):
-    @moves_namespace.marshal_with(move_validity_fields)
+    @moves_namespace.response(200, "Success", move_validity_fields)
+    @moves_namespace.doc(
+        params={"board": "Board size as <files>x<ranks>, 8x8 by default"}
+    )
     def get(self, chess_figure: str, curr_field: str, dest_field: str):
         """Checks if the dest move is valid for current field and chess figure"""
-        response_object = {
-            "figure": chess_figure,
-            "currentField": curr_field,
-            "destField": dest_field,
-            "error": "null",
-            "move": "invalid",
-        }
-
-        if not check_if_valid_chess_figure(chess_figure=chess_figure):
-            response_object[
-                "error"
-            ] = f"Chess figure - {chess_figure} - does not exist."
-            return response_object, 404
-
-        try:
-            figure = get_figure_by_name(
+        return cached_response(
+            cached=get_cached_moves_response(
                 chess_figure=chess_figure,
                 curr_field=curr_field,
-            )
-        except ValueError:
-            response_object["error"] = "Field does not exist."
-            return response_object, 409
+                dest_field=dest_field,
+                board_size=request.args.get("board"),
+            ),
+        )
 
-        if not figure.validate_move(dest_field=dest_field):
-            response_object["error"] = "Current move is not permitted."
-            return response_object, 200
 
-        response_object["move"] = "valid"
-        return response_object, 200
+class ValidChessMoveBatch(Resource):
+    @moves_namespace.expect([move_validity_request_fields])
+    @moves_namespace.response(200, "Success", move_validity_batch_fields)
+    def post(self):
+        """Checks if the dest moves are valid for a list of fields and chess figures"""
+        with metrics.time_stage(stage="engine"):
+            response = get_move_validity_batch(
+                moves=request.get_json(silent=True),
+                batch_limit=current_app.config["BATCH_LIMIT"],
+            )
+        return marshal_response(response=response, model=move_validity_batch_fields)
 
 
 class ValidChessMovesList(Resource):
-    @moves_namespace.marshal_with(available_moves_fields)
+    @moves_namespace.response(200, "Success", available_moves_fields)
+    @moves_namespace.doc(
+        params={"board": "Board size as <files>x<ranks>, 8x8 by default"}
+    )
     def get(self, chess_figure: str, curr_field: str):
         """Retrieves available moves for current field and chess figure"""
-        response_object = {
-            "figure": chess_figure,
-            "currentField": curr_field,
-            "error": "null",
-            "availableMoves": [],
-        }
-
-        if not check_if_valid_chess_figure(chess_figure=chess_figure):
-            response_object[
-                "error"
-            ] = f"Chess figure - {chess_figure} - does not exist."
-            return response_object, 404
-
-        try:
-            figure = get_figure_by_name(
+        return cached_response(
+            cached=get_cached_moves_response(
                 chess_figure=chess_figure,
                 curr_field=curr_field,
+                board_size=request.args.get("board"),
+            ),
+        )
+
+
+class ValidChessMovesListBatch(Resource):
+    @moves_namespace.expect([available_moves_request_fields])
+    @moves_namespace.response(200, "Success", available_moves_batch_fields)
+    def post(self):
+        """
+        Retrieves available moves for a list of fields and chess figures.
+        Send {"figure": <figure>, "wholeBoard": true} to list all 64 fields
+        """
+        with metrics.time_stage(stage="engine"):
+            response = get_available_moves_batch(
+                queries=request.get_json(silent=True),
+                batch_limit=current_app.config["BATCH_LIMIT"],
             )
-        except ValueError:
-            response_object["error"] = "Field does not exist."
-            return response_object, 409
+        return marshal_response(response=response, model=available_moves_batch_fields)
 
-        available_moves = figure.list_available_moves()
-        if available_moves:
-            response_object["availableMoves"] = available_moves
 
-        return response_object, 200
+class OriginFields(Resource):
+    @moves_namespace.doc(
+        params={"board": "Board size as <files>x<ranks>, 8x8 by default"},
+    )
+    @moves_namespace.response(200, "Success", origin_fields_fields)
+    def get(self, chess_figure: str, dest_field: str):
+        """Retrieves the fields from which the figure moves to the destination field"""
+        with metrics.time_stage(stage="engine"):
+            response = get_origin_fields(
+                chess_figure=chess_figure,
+                dest_field=dest_field,
+                board_size=request.args.get("board"),
+            )
+        return marshal_response(response=response, model=origin_fields_fields)
 
 
+class ShortestPaths(Resource):
+    @moves_namespace.doc(
+        params={
+            "all": "List all shortest paths if true, one path by default",
+            "board": "Board size as <files>x<ranks>, 8x8 by default",
+        },
+    )
+    @moves_namespace.response(200, "Success", shortest_paths_fields)
+    def get(self, chess_figure: str, curr_field: str, dest_field: str):
+        """Retrieves the minimal number of moves and shortest paths between fields"""
+        with metrics.time_stage(stage="engine"):
+            response = get_shortest_paths(
+                chess_figure=chess_figure,
+                curr_field=curr_field,
+                dest_field=dest_field,
+                all_paths=request.args.get("all", "").lower() == "true",
+                paths_limit=current_app.config["SHORTEST_PATHS_LIMIT"],
+                board_size=request.args.get("board"),
+            )
+        return marshal_response(response=response, model=shortest_paths_fields)
+
+
+class ReachableFields(Resource):
+    @moves_namespace.doc(
+        params={
+            "moves": "Maximal number of moves",
+            "board": "Board size as <files>x<ranks>, 8x8 by default",
+        },
+    )
+    @moves_namespace.response(200, "Success", reachable_fields_fields)
+    def get(self, chess_figure: str, curr_field: str):
+        """Retrieves the fields reachable within the number of moves"""
+        with metrics.time_stage(stage="engine"):
+            response = get_reachable_fields(
+                chess_figure=chess_figure,
+                curr_field=curr_field,
+                moves=request.args.get("moves", ""),
+                board_size=request.args.get("board"),
+            )
+        return marshal_response(response=response, model=reachable_fields_fields)
+
+
+class Tours(Resource):
+    @moves_namespace.response(200, "Success", tour_fields)
+    @moves_namespace.doc(
+        params={
+            "closed": "Tours ending one move from the starting field if true",
+            "tours": "Number of tours, 1 by default",
+            "board": "Board size as <files>x<ranks>, 8x8 by default",
+        },
+    )
+    def get(self, chess_figure: str, curr_field: str):
+        """Streams the tours of the figure visiting every field once as JSON lines"""
+        response_object, status = get_tours(
+            chess_figure=chess_figure,
+            curr_field=curr_field,
+            closed=request.args.get("closed", "").lower() == "true",
+            tours=request.args.get("tours", "1"),
+            tours_limit=current_app.config["TOURS_LIMIT"],
+            search_limit=current_app.config["TOURS_SEARCH_LIMIT"],
+            board_size=request.args.get("board"),
+        )
+        if status != 200:
+            return Response(
+                tour_encoder.encode(response_object={**response_object, "tour": []}),
+                status=status,
+                mimetype="application/json",
+            )
+
+        def stream_tours():
+            record = {"figure": chess_figure, "currentField": curr_field}
+            try:
+                for tour in response_object["tours"]:
+                    yield tour_encoder.encode(
+                        response_object={**record, "error": "null", "tour": tour},
+                    )
+            except SearchLimitError as error:
+                # Tells the client the search stopped, not that no more tours exist
+                yield tour_encoder.encode(
+                    response_object={**record, "error": str(error), "tour": []},
+                )
+
+        return Response(
+            stream_with_context(stream_tours()),
+            mimetype="application/x-ndjson",
+        )
+
+
+class PositionMovesList(Resource):
+    @moves_namespace.doc(params={"fen": "Position in Forsyth-Edwards Notation"})
+    @moves_namespace.response(200, "Success", position_moves_fields)
+    def get(self):
+        """Retrieves available moves and captures of every piece in the position"""
+        with metrics.time_stage(stage="engine"):
+            response = get_position_moves(fen=request.args.get("fen", ""))
+        return marshal_response(response=response, model=position_moves_fields)
+
+
+class LegalMovesList(Resource):
+    @moves_namespace.doc(params={"fen": "Position in Forsyth-Edwards Notation"})
+    @moves_namespace.response(200, "Success", legal_moves_fields)
+    def get(self):
+        """Retrieves all legal moves of the side to move in the position"""
+        with metrics.time_stage(stage="engine"):
+            response = get_legal_moves(fen=request.args.get("fen", ""))
+        return marshal_response(response=response, model=legal_moves_fields)
+
+
+class AttackMap(Resource):
+    @moves_namespace.doc(params={"fen": "Position in Forsyth-Edwards Notation"})
+    @moves_namespace.response(200, "Success", attack_map_fields)
+    def get(self):
+        """Retrieves the attackers of every square of the position for both colors"""
+        with metrics.time_stage(stage="engine"):
+            response = get_attack_map(fen=request.args.get("fen", ""))
+        return marshal_response(response=response, model=attack_map_fields)
+
+
+class Perft(Resource):
+    @moves_namespace.doc(
+        params={
+            "fen": "Position in Forsyth-Edwards Notation",
+            "depth": "Number of plies to enumerate",
+        },
+    )
+    @moves_namespace.response(200, "Success", perft_fields)
+    def get(self):
+        """Counts the leaf nodes of the legal move tree of the position"""
+        with metrics.time_stage(stage="engine"):
+            response = get_perft(
+                fen=request.args.get("fen", ""),
+                depth=request.args.get("depth", ""),
+                max_depth=current_app.config["PERFT_MAX_DEPTH"],
+                search_limit=current_app.config["PERFT_SEARCH_LIMIT"],
+            )
+        return marshal_response(response=response, model=perft_fields)
+
+
+moves_namespace.add_resource(ValidChessMoveBatch, "/batch/validity")
+moves_namespace.add_resource(ValidChessMovesListBatch, "/batch/moves")
+moves_namespace.add_resource(PositionMovesList, "/position")
+moves_namespace.add_resource(LegalMovesList, "/position/legal-moves")
+moves_namespace.add_resource(AttackMap, "/position/attacks")
+moves_namespace.add_resource(Perft, "/position/perft")
+moves_namespace.add_resource(
+    ShortestPaths,
+    "/<string:chess_figure>/<string:curr_field>/<string:dest_field>/path",
+)
+moves_namespace.add_resource(
+    OriginFields,
+    "/<string:chess_figure>/<string:dest_field>/origins",
+)
+moves_namespace.add_resource(
+    Tours,
+    "/<string:chess_figure>/<string:curr_field>/tours",
+)
+moves_namespace.add_resource(
+    ReachableFields,
+    "/<string:chess_figure>/<string:curr_field>/reachable",
+)
 moves_namespace.add_resource(
     ValidChessMove,
     "/<string:chess_figure>/<string:curr_field>/<string:dest_field>",
@@ -0,0 +1,471 @@
+"""ASGI application serving the figure routes of the moves API on the asyncio loop"""
+import asyncio
+import json
+import sys
+import threading
+from io import BytesIO
+from time import perf_counter
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+from flask import Flask
+from src import create_app
+from src.api import api
+from src.api.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE
+from src.api.metrics import figure_label, metrics
+from src.api.moves.cache import CachedResponse
+from src.api.moves.utils import get_position_moves
+from src.api.moves.views import get_cached_moves_response
+from werkzeug.exceptions import HTTPException
+from werkzeug.routing import Rule
+
+WEBSOCKET_PATH = "/api/v1/ws"
+# Endpoints of the figure routes answered on the event loop, the other routes
+# of the flask application are served by its WSGI application in a thread
+VALIDITY_ENDPOINT = "figure_valid_chess_move"
+AVAILABLE_MOVES_ENDPOINT = "figure_valid_chess_moves_list"
+
+INVALID_QUERY_ANSWER = json.dumps({"error": "Query is not valid."})
+INTERNAL_ERROR_BODY = json.dumps({"message": "Internal Server Error"}).encode()
+
+Receive = Callable[[], Awaitable[dict]]
+Send = Callable[[dict], Awaitable[None]]
+
+
+class MovesASGIApp:
+    """
+    ASGI application exposing the routes of the flask application and the
+    websocket channel streaming the figure queries on a single connection.
+    The figure routes are answered on the event loop by the same cached engine
+    as the flask views, the other routes by the flask application in a thread
+    """
+
+    def __init__(self, flask_app: Flask):
+        self.flask_app = flask_app
+        self.metrics_path = flask_app.config.get("METRICS_PATH", "/metrics")
+        self.cache_control = (
+            f"public, max-age={flask_app.config['MOVES_CACHE_MAX_AGE']}".encode()
+        )
+        self.url_adapter = flask_app.url_map.bind("localhost")
+        self.batch_limit = flask_app.config["BATCH_LIMIT"]
+        with flask_app.test_request_context():
+            self.swagger_body = json.dumps(api.__schema__).encode()
+
+    async def __call__(self, scope: dict, receive: Receive, send: Send):
+        if scope["type"] == "lifespan":
+            await self.handle_lifespan(receive=receive, send=send)
+        elif scope["type"] == "http":
+            await self.handle_http(scope=scope, receive=receive, send=send)
+        elif scope["type"] == "websocket":
+            await self.handle_websocket(scope=scope, receive=receive, send=send)
+
+    @staticmethod
+    async def handle_lifespan(receive: Receive, send: Send):
+        """
+        Acknowledge the startup and shutdown of the server
+
+        :param receive: ASGI receive channel
+        :param send: ASGI send channel
+        """
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def handle_http(self, scope: dict, receive: Receive, send: Send):
+        """
+        Answer the figure routes of the moves namespace on the event loop and
+        pass the other requests to the flask application
+
+        :param scope: ASGI connection scope
+        :param receive: ASGI receive channel
+        :param send: ASGI send channel
+        """
+        start = perf_counter()
+        path = scope["path"]
+        if path == "/swagger.json":
+            await self.send_response(send=send, status=200, body=self.swagger_body)
+            return
+        if path == self.metrics_path:
+            await self.send_response(
+                send=send,
+                status=200,
+                body=metrics.render().encode(),
+                content_type=METRICS_CONTENT_TYPE.encode(),
+            )
+            return
+
+        matched = self.match_route(path=path, method=scope["method"])
+        if matched is None:
+            await self.handle_wsgi(scope=scope, receive=receive, send=send)
+            return
+        rule, route = matched
+
+        query = parse_qs(
+            scope.get("query_string", b"").decode("latin-1"),
+            keep_blank_values=True,
+        )
+        with self.flask_app.app_context():
+            cached = get_cached_moves_response(
+                chess_figure=route["chess_figure"],
+                curr_field=route["curr_field"],
+                dest_field=route.get("dest_field"),
+                board_size=query["board"][0] if "board" in query else None,
+            )
+        status = await self.send_cached_response(
+            send=send,
+            cached=cached,
+            if_none_match=dict(scope["headers"]).get(b"if-none-match"),
+            head=scope["method"] == "HEAD",
+        )
+        metrics.observe_request(
+            route=rule.rule,
+            method=scope["method"],
+            figure=figure_label(chess_figure=route["chess_figure"]),
+            status=status,
+            duration=perf_counter() - start,
+        )
+
+    async def handle_wsgi(self, scope: dict, receive: Receive, send: Send):
+        """
+        Serve the request by the WSGI application of flask in a thread, sending
+        the chunks of the body as they are produced, e.g. of the streamed tours
+
+        :param scope: ASGI connection scope
+        :param receive: ASGI receive channel
+        :param send: ASGI send channel
+        """
+        body = b""
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            body += message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+        loop = asyncio.get_running_loop()
+        chunks: asyncio.Queue = asyncio.Queue()
+        response_start: Dict[str, Any] = {}
+        # Set when the response is no longer sent, e.g. the client disconnected
+        stopped = threading.Event()
+
+        def start_response(status: str, headers: List[Tuple[str, str]], exc_info=None):
+            response_start["status"] = int(status.split(" ", 1)[0])
+            response_start["headers"] = [
+                (name.lower().encode("latin-1"), value.encode("latin-1"))
+                for name, value in headers
+            ]
+
+        def put_chunk(chunk: Optional[bytes]):
+            try:
+                loop.call_soon_threadsafe(chunks.put_nowait, chunk)
+            except RuntimeError:
+                # The loop was closed after the connection was dropped
+                stopped.set()
+
+        def run_wsgi():
+            # The response is produced and closed in a single thread, so the
+            # contexts pushed by the streamed responses stay in that thread
+            iterable = None
+            try:
+                iterable = self.flask_app.wsgi_app(
+                    build_environ(scope=scope, body=body),
+                    start_response,
+                )
+                for chunk in iterable:
+                    if stopped.is_set():
+                        break
+                    if chunk:
+                        put_chunk(chunk=chunk)
+            finally:
+                if hasattr(iterable, "close"):
+                    iterable.close()
+                put_chunk(chunk=None)
+
+        running = loop.run_in_executor(None, run_wsgi)
+        try:
+            await self.send_wsgi_response(
+                send=send,
+                chunks=chunks,
+                response_start=response_start,
+            )
+        finally:
+            stopped.set()
+        await running
+
+    async def send_wsgi_response(
+        self,
+        send: Send,
+        chunks: asyncio.Queue,
+        response_start: Dict[str, Any],
+    ):
+        """
+        Send the response of the WSGI application as its chunks are queued
+
+        :param send: ASGI send channel
+        :param chunks: queue of the body chunks ended by None
+        :param response_start: status and headers, empty if not started
+        """
+        chunk = await chunks.get()
+        if not response_start:
+            # The application raised before starting the response, the error
+            # is answered and then raised to the server to be logged
+            await self.send_response(
+                send=send,
+                status=500,
+                body=INTERNAL_ERROR_BODY,
+                headers=[(b"cache-control", b"no-store")],
+            )
+            return
+        await send(
+            {
+                "type": "http.response.start",
+                "status": response_start["status"],
+                "headers": response_start["headers"],
+            },
+        )
+        while chunk is not None:
+            await send({"type": "http.response.body", "body": chunk, "more_body": True})
+            chunk = await chunks.get()
+        await send({"type": "http.response.body", "body": b""})
+
+    async def handle_websocket(self, scope: dict, receive: Receive, send: Send):
+        """
+        Answer the stream of queries sent on the websocket connection. Every text
+        message is a query object or a list of at most BATCH_LIMIT of them,
+        answered by a single message. Queries are answered in a thread, so long
+        lists and positions do not block the other connections
+
+        :param scope: ASGI connection scope
+        :param receive: ASGI receive channel
+        :param send: ASGI send channel
+        """
+        if scope["path"] != WEBSOCKET_PATH:
+            await send({"type": "websocket.close", "code": 1008})
+            return
+
+        loop = asyncio.get_running_loop()
+        while True:
+            message = await receive()
+            if message["type"] == "websocket.connect":
+                await send({"type": "websocket.accept"})
+            elif message["type"] == "websocket.receive":
+                payload = message.get("text")
+                if payload is None:
+                    payload = message.get("bytes")
+                try:
+                    queries = json.loads(payload) if payload else None
+                except ValueError:
+                    queries = None
+                if isinstance(queries, list) and len(queries) > self.batch_limit:
+                    answer = json.dumps(
+                        {"error": f"Batch exceeds the limit of {self.batch_limit}."},
+                    )
+                else:
+                    answer = await loop.run_in_executor(
+                        None,
+                        self.answer_message,
+                        queries,
+                    )
+                await send({"type": "websocket.send", "text": answer})
+            elif message["type"] == "websocket.disconnect":
+                return
+
+    def answer_message(self, queries: Any) -> str:
+        """
+        Answer the decoded websocket message within the flask application context
+
+        :param queries: decoded query object or list of them
+        :return: JSON representation of the answer
+        """
+        with self.flask_app.app_context():
+            if isinstance(queries, list):
+                return "[" + ", ".join(map(self.answer_query, queries)) + "]"
+            return self.answer_query(query=queries)
+
+    @staticmethod
+    def answer_query(query: Any) -> str:
+        """
+        Answer the websocket query with the validity of the move if destination
+        field is given, the available moves of the figure or of every piece of
+        the position if FEN is given. Figure queries may name the board size
+
+        :param query: decoded query object
+        :return: JSON representation of the answer
+        """
+        if isinstance(query, dict) and isinstance(query.get("fen"), str):
+            response_object, _ = get_position_moves(fen=query["fen"])
+            return json.dumps(response_object)
+        if (
+            not isinstance(query, dict)
+            or not all(
+                isinstance(query.get(key), str) for key in ("figure", "currentField")
+            )
+            or not isinstance(query.get("destField", ""), str)
+            or not isinstance(query.get("board", ""), str)
+        ):
+            return INVALID_QUERY_ANSWER
+        cached = get_cached_moves_response(
+            chess_figure=query["figure"],
+            curr_field=query["currentField"],
+            dest_field=query.get("destField"),
+            board_size=query.get("board"),
+        )
+        return cached.body.decode().rstrip("\n")
+
+    def match_route(
+        self,
+        path: str,
+        method: str,
+    ) -> Optional[Tuple[Rule, Dict[str, str]]]:
+        """
+        Match the path to the routes of validity and available moves with the
+        rules of the flask application
+
+        :param path: decoded path of the request
+        :param method: HTTP method of the request
+        :return: matched rule and its arguments, None if it is another route
+        """
+        if method not in ("GET", "HEAD"):
+            return None
+        try:
+            rule, arguments = self.url_adapter.match(
+                path_info=path,
+                method=method,
+                return_rule=True,
+            )
+        except HTTPException:
+            return None
+        if rule.endpoint not in (VALIDITY_ENDPOINT, AVAILABLE_MOVES_ENDPOINT):
+            return None
+        return rule, arguments
+
+    async def send_cached_response(
+        self,
+        send: Send,
+        cached: CachedResponse,
+        if_none_match: Optional[bytes],
+        head: bool,
+    ) -> int:
+        """
+        Send the cached response, successful ones with their ETag and Cache-Control
+        headers, errors marked as not to be stored
+
+        :param send: ASGI send channel
+        :param cached: cached response
+        :param if_none_match: value of the If-None-Match header of the request
+        :param head: True if the body should be omitted
+        :return: status code of the sent response
+        """
+        if cached.status != 200:
+            await self.send_response(
+                send=send,
+                status=cached.status,
+                body=cached.body,
+                headers=[(b"cache-control", b"no-store")],
+                head=head,
+            )
+            return cached.status
+        etag = f'"{cached.etag}"'.encode()
+        headers = [(b"etag", etag), (b"cache-control", self.cache_control)]
+        if if_none_match is not None and (
+            if_none_match.strip() == b"*"
+            or etag in (tag.strip() for tag in if_none_match.split(b","))
+        ):
+            await self.send_response(send=send, status=304, body=b"", headers=headers)
+            return 304
+        await self.send_response(
+            send=send,
+            status=cached.status,
+            body=cached.body,
+            headers=headers,
+            head=head,
+        )
+        return cached.status
+
+    @staticmethod
+    async def send_response(
+        send: Send,
+        status: int,
+        body: bytes,
+        headers: Optional[List[Tuple[bytes, bytes]]] = None,
+        head: bool = False,
+        content_type: bytes = b"application/json",
+    ):
+        """
+        Send the response, JSON by default
+
+        :param send: ASGI send channel
+        :param status: status code of the response
+        :param body: serialized body of the response
+        :param headers: additional headers of the response
+        :param head: True if the body should be omitted
+        :param content_type: content type of the body
+        """
+        response_headers = [
+            (b"content-type", content_type),
+            (b"content-length", str(len(body)).encode()),
+            *(headers or []),
+        ]
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status,
+                "headers": response_headers,
+            },
+        )
+        await send({"type": "http.response.body", "body": b"" if head else body})
+
+
+def build_environ(scope: dict, body: bytes) -> Dict[str, Any]:
+    """
+    Helper method to build the WSGI environment of the ASGI HTTP request
+
+    :param scope: ASGI connection scope
+    :param body: body of the request
+    :return: WSGI environment
+    """
+    server = scope.get("server") or ("localhost", 80)
+    environ = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": scope.get("root_path", "").encode().decode("latin-1"),
+        "PATH_INFO": scope["path"].encode().decode("latin-1"),
+        "QUERY_STRING": scope.get("query_string", b"").decode("latin-1"),
+        "SERVER_NAME": server[0],
+        "SERVER_PORT": str(server[1]),
+        "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+        "CONTENT_LENGTH": str(len(body)),
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": BytesIO(body),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": False,
+        "wsgi.run_once": False,
+    }
+    for name, value in scope["headers"]:
+        key = name.decode("latin-1").upper().replace("-", "_")
+        if key == "CONTENT_LENGTH":
+            continue
+        if key != "CONTENT_TYPE":
+            key = f"HTTP_{key}"
+        value = value.decode("latin-1")
+        environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+
+def create_asgi_app(flask_app: Optional[Flask] = None) -> MovesASGIApp:
+    """
+    Create the ASGI application sharing the configuration of the flask application
+
+    :param flask_app: configured flask application, created if not given
+    :return: ASGI application
+    """
+    return MovesASGIApp(flask_app=flask_app or create_app())
+
+
+app = create_asgi_app()
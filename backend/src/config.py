@@ -1,8 +1,25 @@
 """Configuration file for dev, testing and production environment"""
+import os
 
 
 class BaseConfig:
     TESTING = False
+    SERVER_BIND = os.getenv("SERVER_BIND", "0.0.0.0:5000")
+    SERVER_WORKERS = 1
+    SERVER_THREADS = 1
+    SERVER_KEEPALIVE = 2
+    SERVER_TIMEOUT = 30
+    BATCH_LIMIT = 1000
+    PERFT_MAX_DEPTH = 3
+    PERFT_SEARCH_LIMIT = 10000
+    SHORTEST_PATHS_LIMIT = 100
+    TOURS_LIMIT = 100
+    TOURS_SEARCH_LIMIT = 200000
+    MOVES_CACHE_SIZE = 4096
+    MOVES_CACHE_MAX_AGE = 31536000
+    METRICS_PATH = "/metrics"
+    TRANSPOSITION_TABLE_SIZE = 65536
+    LEGAL_MOVES_TABLE_SIZE = 4096
 
 
 class DevelopmentConfig(BaseConfig):
@@ -14,4 +31,7 @@ class TestingConfig(BaseConfig):
 
 
 class ProductionConfig(BaseConfig):
-    pass
+    SERVER_WORKERS = int(os.getenv("SERVER_WORKERS", 2 * (os.cpu_count() or 1) + 1))
+    SERVER_THREADS = int(os.getenv("SERVER_THREADS", 4))
+    SERVER_KEEPALIVE = int(os.getenv("SERVER_KEEPALIVE", 5))
+    SERVER_TIMEOUT = int(os.getenv("SERVER_TIMEOUT", 30))
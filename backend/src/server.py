@@ -0,0 +1,29 @@
+"""Production WSGI server running the application in pre-forked gunicorn workers"""
+from gunicorn.app.base import BaseApplication
+
+
+class ProductionServer(BaseApplication):
+    """Gunicorn application configured from the server settings of the flask app"""
+
+    def __init__(self, app):
+        self.application = app
+        super(ProductionServer, self).__init__()
+
+    def load_config(self):
+        config = self.application.config
+        threads = config["SERVER_THREADS"]
+        settings = {
+            "bind": config["SERVER_BIND"],
+            "workers": config["SERVER_WORKERS"],
+            "threads": threads,
+            "worker_class": "gthread" if threads > 1 else "sync",
+            "keepalive": config["SERVER_KEEPALIVE"],
+            "timeout": config["SERVER_TIMEOUT"],
+            # Move tables are built once in the master and shared by the workers
+            "preload_app": True,
+        }
+        for key, value in settings.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        return self.application
@@ -0,0 +1,304 @@
+import asyncio
+import json
+
+import pytest
+from src.asgi import create_asgi_app
+
+
+def asgi_get(test_app, path, method="GET", headers=(), query_string=b"", body=b""):
+    """
+    Send the HTTP request to the ASGI application and collect the response
+
+    :return: status code, headers and body of the response
+    """
+    asgi_app = create_asgi_app(flask_app=test_app)
+    scope = {
+        "type": "http",
+        "method": method,
+        "path": path,
+        "headers": headers,
+        "query_string": query_string,
+    }
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(asgi_app(scope, receive, send))
+    start, *bodies = messages
+    return (
+        start["status"],
+        dict(start["headers"]),
+        b"".join(message["body"] for message in bodies),
+    )
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        "/api/v1/knight/d4/f5",
+        "/api/v1/king/d4/d7",
+        "/api/v1/king/d9/d7",
+        "/api/v1/kingy/d4/d5",
+        "/api/v1/queen/d4",
+        "/api/v1/pawn/a1",
+        "/api/v1/pawny/a1",
+    ],
+)
+def test_asgi_same_as_wsgi(test_app, path):
+    client = test_app.test_client()
+    resp = client.get(path)
+    status, headers, body = asgi_get(test_app, path)
+    assert status == resp.status_code
+    assert body == resp.data
+    assert (
+        headers[b"etag"].decode() if b"etag" in headers else None
+    ) == resp.headers.get("ETag")
+    assert headers[b"cache-control"].decode() == resp.headers["Cache-Control"]
+    assert headers[b"content-type"] == b"application/json"
+
+
+@pytest.mark.parametrize(
+    "path, query_string",
+    [
+        ["/api/v1/knight/d4/f5", b"board="],
+        ["/api/v1/knight/d4", b"board="],
+        ["/api/v1/knight/d4", b"board=10x10"],
+        ["/api/v1/knight/d4", b"board=1x"],
+    ],
+)
+def test_asgi_board_same_as_wsgi(test_app, path, query_string):
+    client = test_app.test_client()
+    resp = client.get(path, query_string=query_string)
+    status, _, body = asgi_get(test_app, path, query_string=query_string)
+    assert status == resp.status_code
+    assert body == resp.data
+
+
+def test_asgi_not_modified(test_app):
+    status, headers, body = asgi_get(test_app, "/api/v1/rook/a1/a8")
+    assert json.loads(body)["move"] == "valid"
+    status, _, body = asgi_get(
+        test_app,
+        "/api/v1/rook/a1/a8",
+        headers=[(b"if-none-match", headers[b"etag"])],
+    )
+    assert status == 304
+    assert body == b""
+
+
+@pytest.mark.parametrize(
+    "path, method, status_code",
+    [
+        ["/api/v1/rook", "GET", 404],
+        ["/api/v1/rook/a1/a2/a3", "GET", 404],
+        ["/api/v1//a1", "GET", 404],
+        ["/other/rook/a1", "GET", 404],
+        ["/api/v1/rook/a1", "POST", 405],
+    ],
+)
+def test_asgi_unknown_route(test_app, path, method, status_code):
+    client = test_app.test_client()
+    resp = client.open(path, method=method)
+    status, _, body = asgi_get(test_app, path, method=method)
+    assert status == resp.status_code == status_code
+    assert body == resp.data
+
+
+@pytest.mark.parametrize(
+    "path, method, query_string, body",
+    [
+        ["/api/v1/batch/validity", "POST", b"", [["knight", "d4", "f5"]]],
+        ["/api/v1/batch/moves", "POST", b"", [["rook", "a1"]]],
+        ["/api/v1/position/legal-moves", "GET", b"fen=8/8/8/8/8/8/8/K6k+w", None],
+        ["/api/v1/position/attacks", "GET", b"fen=8/8/8/8/8/8/8/K6k+w", None],
+        ["/api/v1/position/perft", "GET", b"fen=8/8/8/8/8/8/8/K6k+w&depth=2", None],
+        ["/api/v1/knight/b1/h8/path", "GET", b"", None],
+        ["/api/v1/knight/e4/origins", "GET", b"", None],
+        ["/api/v1/knight/a1/reachable", "GET", b"moves=2", None],
+        ["/api/v1/knight/a1/tours", "GET", b"tours=2", None],
+        ["/api/v1/position/legal-moves", "GET", b"", None],
+    ],
+)
+def test_asgi_flask_routes(test_app, path, method, query_string, body):
+    client = test_app.test_client()
+    resp = client.open(
+        path,
+        method=method,
+        query_string=query_string,
+        json=body,
+    )
+    status, headers, asgi_body = asgi_get(
+        test_app,
+        path,
+        method=method,
+        query_string=query_string,
+        headers=[(b"content-type", b"application/json")] if body else [],
+        body=json.dumps(body).encode() if body else b"",
+    )
+    assert status == resp.status_code
+    assert headers[b"content-type"].decode() == resp.headers["Content-Type"]
+    if path.endswith("perft"):
+        assert json.loads(asgi_body)["nodes"] == json.loads(resp.data)["nodes"]
+    else:
+        assert asgi_body == resp.data
+
+
+def test_asgi_flask_route_error(test_app, monkeypatch):
+    def wsgi_app(environ, start_response):
+        raise RuntimeError("Route failed.")
+
+    monkeypatch.setattr(test_app, "wsgi_app", wsgi_app)
+    asgi_app = create_asgi_app(flask_app=test_app)
+    scope = {"type": "http", "method": "GET", "path": "/api/v1/ping", "headers": []}
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(asyncio.wait_for(asgi_app(scope, receive, send), timeout=5))
+    start, body = messages
+    assert start["status"] == 500
+    assert (b"cache-control", b"no-store") in start["headers"]
+    assert json.loads(body["body"]) == {"message": "Internal Server Error"}
+
+
+def test_asgi_stream_disconnect(test_app):
+    asgi_app = create_asgi_app(flask_app=test_app)
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/api/v1/knight/a1/tours",
+        "headers": [],
+        "query_string": b"tours=5",
+    }
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            raise OSError("Connection lost.")
+        messages.append(message)
+
+    with pytest.raises(OSError):
+        asyncio.run(asyncio.wait_for(asgi_app(scope, receive, send), timeout=5))
+    assert [message["type"] for message in messages] == ["http.response.start"]
+
+
+def test_asgi_swagger(test_app):
+    status, _, body = asgi_get(test_app, "/swagger.json")
+    schema = json.loads(body)
+    assert status == 200
+    assert "Move Validity" in schema["definitions"]
+    assert "Available Moves" in schema["definitions"]
+
+
+def asgi_websocket(test_app, texts, path="/api/v1/ws"):
+    """
+    Send the text messages on the websocket connection to the ASGI application
+
+    :return: messages sent by the application
+    """
+    asgi_app = create_asgi_app(flask_app=test_app)
+    incoming = [{"type": "websocket.connect"}]
+    incoming += [
+        {
+            "type": "websocket.receive",
+            **(text if isinstance(text, dict) else {"text": text}),
+        }
+        for text in texts
+    ]
+    incoming.append({"type": "websocket.disconnect", "code": 1000})
+    messages = []
+
+    async def receive():
+        return incoming.pop(0)
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(asgi_app({"type": "websocket", "path": path}, receive, send))
+    return messages
+
+
+def test_websocket_queries(test_app):
+    messages = asgi_websocket(
+        test_app,
+        [
+            json.dumps({"figure": "knight", "currentField": "d4", "destField": "f5"}),
+            json.dumps({"figure": "king", "currentField": "h1"}),
+            json.dumps(
+                [
+                    {"figure": "rook", "currentField": "a1", "destField": "h8"},
+                    {"figure": "rooky", "currentField": "a1"},
+                    {"figure": "rook"},
+                ],
+            ),
+            json.dumps({"fen": "K7/8/8/8/8/8/8/R6k w - - 0 1"}),
+            "not json",
+        ],
+    )
+    assert messages[0] == {"type": "websocket.accept"}
+    answers = [json.loads(message["text"]) for message in messages[1:]]
+    assert len(answers) == 5
+    assert answers[0]["move"] == "valid"
+    assert sorted(answers[1]["availableMoves"]) == ["g1", "g2", "h2"]
+    assert answers[2][0]["error"] == "Current move is not permitted."
+    assert answers[2][1]["error"] == "Chess figure - rooky - does not exist."
+    assert answers[2][2]["error"] == "Query is not valid."
+    assert answers[3]["pieces"][0]["captures"] == ["h1"]
+    assert answers[4]["error"] == "Query is not valid."
+
+
+def test_websocket_empty_and_binary_messages(test_app):
+    messages = asgi_websocket(
+        test_app,
+        [
+            "",
+            {"bytes": json.dumps({"figure": "king", "currentField": "h1"}).encode()},
+            {"text": None, "bytes": b""},
+            {},
+        ],
+    )
+    answers = [json.loads(message["text"]) for message in messages[1:]]
+    assert len(answers) == 4
+    assert answers[0]["error"] == "Query is not valid."
+    assert sorted(answers[1]["availableMoves"]) == ["g1", "g2", "h2"]
+    assert answers[2]["error"] == "Query is not valid."
+    assert answers[3]["error"] == "Query is not valid."
+
+
+def test_websocket_batch_limit(test_app, monkeypatch):
+    monkeypatch.setitem(test_app.config, "BATCH_LIMIT", 2)
+    query = {"figure": "king", "currentField": "h1"}
+    messages = asgi_websocket(
+        test_app,
+        [json.dumps([query] * 2), json.dumps([query] * 3)],
+    )
+    answers = [json.loads(message["text"]) for message in messages[1:]]
+    assert len(answers[0]) == 2
+    assert answers[1] == {"error": "Batch exceeds the limit of 2."}
+
+
+def test_websocket_unknown_path(test_app):
+    messages = asgi_websocket(test_app, [], path="/api/v1/other")
+    assert messages == [{"type": "websocket.close", "code": 1008}]
+
+
+def test_asgi_board_size(test_app):
+    status, _, body = asgi_get(
+        test_app,
+        "/api/v1/rook/j10",
+        query_string=b"board=10x10",
+    )
+    assert status == 200
+    assert len(json.loads(body)["availableMoves"]) == 18
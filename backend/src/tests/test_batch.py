@@ -0,0 +1,132 @@
+import json
+
+import pytest
+
+
+def test_batch_validity(test_app):
+    client = test_app.test_client()
+    moves = [
+        {"figure": "knight", "currentField": "d4", "destField": "f5"},
+        {"figure": "king", "currentField": "d4", "destField": "d7"},
+        {"figure": "rook", "currentField": "d9", "destField": "d7"},
+        {"figure": "kingy", "currentField": "d4", "destField": "d5"},
+    ]
+    resp = client.post("/api/v1/batch/validity", json=moves)
+    data = json.loads(resp.data.decode())
+    assert resp.status_code == 200
+    assert data["error"] == "null"
+    assert [result["move"] for result in data["results"]] == [
+        "valid",
+        "invalid",
+        "invalid",
+        "invalid",
+    ]
+    assert [result["status"] for result in data["results"]] == [200, 200, 409, 404]
+    assert data["results"][0]["figure"] == "knight"
+    assert data["results"][0]["currentField"] == "d4"
+    assert data["results"][0]["destField"] == "f5"
+    assert data["results"][1]["error"] == "Current move is not permitted."
+    assert data["results"][2]["error"] == "Field does not exist."
+    assert data["results"][3]["error"] == "Chess figure - kingy - does not exist."
+
+
+@pytest.mark.parametrize(
+    "move",
+    [
+        {"figure": "knight", "currentField": "d4"},
+        {"figure": "knight", "currentField": "d4", "destField": 5},
+        "knight",
+    ],
+)
+def test_batch_validity_invalid_move_request(test_app, move):
+    client = test_app.test_client()
+    resp = client.post("/api/v1/batch/validity", json=[move])
+    data = json.loads(resp.data.decode())
+    assert resp.status_code == 200
+    assert data["results"][0]["status"] == 400
+    assert data["results"][0]["error"] == "Move request is not valid."
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [{"figure": "knight", "currentField": "d4", "destField": "f5"}, "moves", None],
+)
+def test_batch_validity_invalid_payload(test_app, payload):
+    client = test_app.test_client()
+    resp = client.post("/api/v1/batch/validity", json=payload)
+    data = json.loads(resp.data.decode())
+    assert resp.status_code == 400
+    assert data["results"] == []
+    assert data["error"] == "Request body must be a list of moves."
+
+
+def test_batch_validity_limit(test_app):
+    client = test_app.test_client()
+    limit = test_app.config["BATCH_LIMIT"]
+    moves = [{"figure": "king", "currentField": "d4", "destField": "d5"}] * (limit + 1)
+    resp = client.post("/api/v1/batch/validity", json=moves)
+    data = json.loads(resp.data.decode())
+    assert resp.status_code == 413
+    assert data["results"] == []
+    assert data["error"] == f"Batch exceeds the limit of {limit}."
+
+
+def test_batch_moves(test_app):
+    client = test_app.test_client()
+    queries = [
+        {"figure": "king", "currentField": "h1"},
+        {"figure": "pawn", "currentField": "a1"},
+        {"figure": "rook", "currentField": "a9"},
+        {"figure": "rooky", "currentField": "a1"},
+        {"figure": "rook"},
+    ]
+    resp = client.post("/api/v1/batch/moves", json=queries)
+    data = json.loads(resp.data.decode())
+    assert resp.status_code == 200
+    assert data["error"] == "null"
+    assert [result["status"] for result in data["results"]] == [
+        200,
+        200,
+        409,
+        404,
+        400,
+    ]
+    assert sorted(data["results"][0]["availableMoves"]) == ["g1", "g2", "h2"]
+    assert data["results"][0]["figure"] == "king"
+    assert data["results"][0]["currentField"] == "h1"
+    assert data["results"][1]["availableMoves"] == []
+    assert data["results"][2]["error"] == "Field does not exist."
+    assert data["results"][3]["error"] == "Chess figure - rooky - does not exist."
+    assert data["results"][4]["error"] == "Moves request is not valid."
+
+
+def test_batch_moves_whole_board(test_app):
+    client = test_app.test_client()
+    resp = client.post(
+        "/api/v1/batch/moves",
+        json={"figure": "knight", "wholeBoard": True},
+    )
+    data = json.loads(resp.data.decode())
+    assert resp.status_code == 200
+    assert len(data["results"]) == 64
+    assert data["results"][0]["currentField"] == "a1"
+    assert sorted(data["results"][0]["availableMoves"]) == ["b3", "c2"]
+    assert data["results"][63]["currentField"] == "h8"
+    assert sum(len(result["availableMoves"]) for result in data["results"]) == 336
+
+
+@pytest.mark.parametrize(
+    "payload, error",
+    [
+        [{"wholeBoard": True}, "Request body must name the figure."],
+        [{"figure": "knight"}, "Request body must be a list of fields."],
+        [None, "Request body must be a list of fields."],
+    ],
+)
+def test_batch_moves_invalid_payload(test_app, payload, error):
+    client = test_app.test_client()
+    resp = client.post("/api/v1/batch/moves", json=payload)
+    data = json.loads(resp.data.decode())
+    assert resp.status_code == 400
+    assert data["results"] == []
+    assert data["error"] == error
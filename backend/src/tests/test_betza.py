@@ -0,0 +1,132 @@
+import json
+
+import pytest
+from src.api.figures.betza import compile_betza
+from src.api.figures.figure import (
+    Amazon,
+    Camel,
+    Figure,
+    Nightrider,
+    create_figure_class,
+)
+from src.api.figures.utils import field_to_square, square_to_field
+
+
+def available_fields(figure_class, field):
+    return {
+        square_to_field(square=square)
+        for square in figure_class.at(
+            field_to_square(field=field)
+        ).list_available_moves()
+    }
+
+
+@pytest.mark.parametrize(
+    "notation, leaps, max_range",
+    [
+        ["W", {(0, 1), (1, 0), (0, -1), (-1, 0)}, 1],
+        ["FF", {(1, 1), (1, -1), (-1, 1), (-1, -1)}, 0],
+        ["W3", {(0, 1), (1, 0), (0, -1), (-1, 0)}, 3],
+        ["fW", {(1, 0)}, 1],
+        ["vW", {(1, 0), (-1, 0)}, 1],
+        ["sW", {(0, 1), (0, -1)}, 1],
+        ["fsW", {(1, 0), (0, 1), (0, -1)}, 1],
+        ["flF", {(1, -1)}, 1],
+        ["fN", {(1, 2), (1, -2), (2, 1), (2, -1)}, 1],
+        ["ffN", {(2, 1), (2, -1)}, 1],
+        ["fsN", {(1, 2), (1, -2)}, 1],
+    ],
+)
+def test_compile_atoms(notation, leaps, max_range):
+    (movement,) = compile_betza(notation=notation)
+    assert set(movement.leaps) == leaps
+    assert movement.max_range == max_range
+
+
+@pytest.mark.parametrize(
+    "notation, leaps, max_range",
+    [
+        ["fK", {(1, 0), (1, 1), (1, -1)}, 1],
+        ["fQ", {(1, 0), (1, 1), (1, -1)}, 0],
+        ["R4", {(0, 1), (1, 0), (0, -1), (-1, 0)}, 4],
+        ["lB", {(1, -1), (-1, -1)}, 0],
+    ],
+)
+def test_compile_shorthands(notation, leaps, max_range):
+    movements = compile_betza(notation=notation)
+    assert {leap for movement in movements for leap in movement.leaps} == leaps
+    assert {movement.max_range for movement in movements} == {max_range}
+
+
+def test_compile_modes():
+    push, capture, double_step = compile_betza(notation="fmWfcFifmnD")
+    assert (push.moves, push.captures, push.initial) == (True, False, False)
+    assert (capture.moves, capture.captures) == (False, True)
+    assert double_step.initial and double_step.leaps == ((2, 0),)
+
+
+@pytest.mark.parametrize("notation", ["X", "f", "Wx", "xW", "w", "Kx", "xR"])
+def test_compile_invalid_notation(notation):
+    with pytest.raises(ValueError):
+        compile_betza(notation=notation)
+
+
+@pytest.mark.parametrize(
+    "notation, expected_notation",
+    [
+        ["K", "WF"],
+        ["Q", "RB"],
+        ["R", "WW"],
+        ["B", "FF"],
+        ["QN", "WWFFN"],
+        ["fK", "fWfF"],
+        ["fQ", "fWWfFF"],
+        ["KF", "WF"],
+        ["sR", "sWW"],
+        ["R4", "W4"],
+        ["B2", "F2"],
+        ["fsQ3", "fsW3fsF3"],
+        ["KK", "WWFF"],
+    ],
+)
+def test_compound_notation(notation, expected_notation):
+    figure_class = create_figure_class(name="Compound", betza=notation)
+    expected_class = create_figure_class(name="Expected", betza=expected_notation)
+    assert figure_class.moves_masks == expected_class.moves_masks
+
+
+def test_fairy_figures_tables():
+    assert available_fields(figure_class=Camel, field="a1") == {"b4", "d2"}
+    assert available_fields(figure_class=Nightrider, field="a1") == {
+        "b3",
+        "c5",
+        "d7",
+        "c2",
+        "e3",
+        "g4",
+    }
+    assert len(Amazon.at(field_to_square(field="d4")).list_available_moves()) == 35
+    assert issubclass(Amazon, Figure)
+    assert Amazon.at(0) is Amazon.at(0)
+
+
+@pytest.mark.parametrize(
+    "chess_figure, curr_field, dest_field, expected",
+    [
+        ["amazon", "a1", "h8", "valid"],
+        ["amazon", "a1", "b3", "valid"],
+        ["archbishop", "d4", "d5", "invalid"],
+        ["cardinal", "d4", "e6", "valid"],
+        ["chancellor", "d4", "d8", "valid"],
+        ["marshal", "d4", "e5", "invalid"],
+        ["camel", "d4", "e7", "valid"],
+        ["zebra", "d4", "f7", "valid"],
+        ["nightrider", "a1", "d7", "valid"],
+    ],
+)
+def test_fairy_figures_moves(test_app, chess_figure, curr_field, dest_field, expected):
+    client = test_app.test_client()
+    resp = client.get(f"/api/v1/{chess_figure}/{curr_field}/{dest_field}")
+    data = json.loads(resp.data.decode())
+    assert resp.status_code == 200
+    assert data["move"] == expected
@@ -0,0 +1,156 @@
+import json
+
+import pytest
+from src.api.figures.board import (
+    MAX_CACHED_BOARDS,
+    STANDARD_BOARD,
+    BoardCache,
+    build_board,
+    get_board,
+    parse_board_size,
+)
+from src.api.figures.figure import Knight, Pawn, Queen
+from src.api.figures.utils import SQUARE_NAMES
+from src.api.moves.utils import QueryError, resolve_board
+
+
+def test_standard_board():
+    assert get_board(files=8, ranks=8) is STANDARD_BOARD
+    assert STANDARD_BOARD.size == 64
+    assert STANDARD_BOARD.square_names == SQUARE_NAMES
+    assert STANDARD_BOARD.square_masks[63] == 1 << 63
+
+
+@pytest.mark.parametrize(
+    "board_size, files, ranks",
+    [["10x10", 10, 10], ["9x9", 9, 9], ["10X8", 10, 8], ["26x26", 26, 26]],
+)
+def test_parse_board_size(board_size, files, ranks):
+    board = parse_board_size(board_size=board_size)
+    assert (board.files, board.ranks) == (files, ranks)
+    assert board is get_board(files=files, ranks=ranks)
+
+
+@pytest.mark.parametrize("board_size", ["", "10", "x10", "10x", "0x8", "27x8", "ax8"])
+def test_invalid_board_size(board_size):
+    with pytest.raises(ValueError):
+        parse_board_size(board_size=board_size)
+
+
+def test_board_geometry():
+    board = get_board(files=10, ranks=10)
+    assert board.size == 100
+    assert board.field_to_square(field="j10") == 99
+    assert board.square_names[10] == "a2"
+    assert board.square_to_indexes(square=99) == (9, 9)
+    assert board.check_if_figure_in_board(row=9, col=9)
+    assert not board.check_if_figure_in_board(row=10, col=0)
+    with pytest.raises(ValueError):
+        board.field_to_square(field="k1")
+
+
+def test_figure_tables_on_board():
+    board = get_board(files=10, ranks=10)
+    tables = Queen.tables(board=board)
+    assert len(tables.moves_masks) == 100
+    assert len(tables.available_moves_table[0]) == 27
+    assert Queen.tables(board=board) is tables
+    assert Queen.tables(board=STANDARD_BOARD).moves_masks == Queen.moves_masks
+
+    board = get_board(files=9, ranks=9)
+    knight = Knight.at(square=board.field_to_square(field="i9"), board=board)
+    assert knight is Knight.at(square=80, board=board)
+    assert {board.square_names[move] for move in knight.list_available_moves()} == {
+        "g8",
+        "h7",
+    }
+    pawn = Pawn.at(square=board.field_to_square(field="e2"), board=board)
+    assert pawn.validate_move(dest_square=board.field_to_square(field="e4"))
+    assert Pawn.tables(board=board).available_moves_table[4] == ()
+
+
+@pytest.mark.parametrize(
+    "path, expected",
+    [
+        ["/api/v1/knight/j10/h9?board=10x10", "valid"],
+        ["/api/v1/rook/a1/a9?board=9x9", "valid"],
+        ["/api/v1/rook/a1/a9", "invalid"],
+        ["/api/v1/chancellor/e5/i5?board=9x9", "valid"],
+    ],
+)
+def test_move_validity_on_board(test_app, path, expected):
+    client = test_app.test_client()
+    resp = client.get(path)
+    data = json.loads(resp.data.decode())
+    assert resp.status_code == 200
+    assert data["move"] == expected
+
+
+def test_available_moves_on_board(test_app):
+    client = test_app.test_client()
+    resp = client.get("/api/v1/king/j10?board=10x10")
+    data = json.loads(resp.data.decode())
+    assert resp.status_code == 200
+    assert set(data["availableMoves"]) == {"i10", "i9", "j9"}
+
+
+@pytest.mark.parametrize(
+    "path, status, error",
+    [
+        ["/api/v1/king/a1?board=8by8", 400, "Board size is not valid."],
+        ["/api/v1/king/a1/a2?board=100x100", 400, "Board size is not valid."],
+        ["/api/v1/king/j10?board=9x9", 409, "Field does not exist."],
+    ],
+)
+def test_invalid_board(test_app, path, status, error):
+    client = test_app.test_client()
+    resp = client.get(path)
+    data = json.loads(resp.data.decode())
+    assert resp.status_code == status
+    assert data["error"] == error
+
+
+def test_resolve_board():
+    board, squares = resolve_board(board_size="10x10", fields=("a1", "j10"))
+    assert board is get_board(files=10, ranks=10)
+    assert squares == (0, 99)
+    assert resolve_board(board_size=None) == (STANDARD_BOARD, ())
+    with pytest.raises(QueryError) as error:
+        resolve_board(board_size="10", fields=("a1",))
+    assert (str(error.value), error.value.status) == ("Board size is not valid.", 400)
+    with pytest.raises(QueryError) as error:
+        resolve_board(board_size=None, fields=("a1", "j10"))
+    assert (str(error.value), error.value.status) == ("Field does not exist.", 409)
+
+
+def test_board_tables_are_bounded():
+    for files in range(2, 14):
+        board = get_board(files=files, ranks=4)
+        Knight.at(square=0, board=board)
+    assert Knight.board_tables.get(board=STANDARD_BOARD) is not None
+    assert len(Knight.board_tables) <= MAX_CACHED_BOARDS + 1
+    assert len(Knight.instances) <= MAX_CACHED_BOARDS + 1
+    assert Knight.board_tables.get(board=get_board(files=2, ranks=4)) is None
+    assert Knight.board_tables.get(board=get_board(files=13, ranks=4)) is not None
+
+
+def test_boards_are_bounded():
+    for ranks in range(1, 27):
+        assert get_board(files=3, ranks=ranks).size == 3 * ranks
+    assert build_board.cache_info().currsize <= MAX_CACHED_BOARDS
+    assert get_board(files=3, ranks=26) is get_board(files=3, ranks=26)
+    assert get_board() is STANDARD_BOARD
+
+
+def test_board_cache_eviction():
+    cache = BoardCache(max_size=2)
+    boards = [get_board(files=files, ranks=3) for files in (3, 4, 5)]
+    cache.set(board=STANDARD_BOARD, value="standard")
+    cache.set(board=boards[0], value=0)
+    cache.set(board=boards[1], value=1)
+    assert cache.get(board=boards[0]) == 0
+    cache.set(board=boards[2], value=2)
+    assert cache.get(board=boards[1]) is None
+    assert cache.get(board=boards[0]) == 0
+    assert cache.get(board=STANDARD_BOARD) == "standard"
+    assert len(cache) == 3
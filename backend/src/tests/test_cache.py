@@ -0,0 +1,62 @@
+import json
+
+import pytest
+from src.api.moves.cache import ResponseCache, moves_cache
+
+
+@pytest.mark.parametrize(
+    "url, status_code",
+    [
+        ["/api/v1/knight/d4/f5", 200],
+        ["/api/v1/knight/d4", 200],
+        ["/api/v1/knighty/d4", 404],
+        ["/api/v1/knight/d9/f5", 409],
+    ],
+)
+def test_cached_response(test_app, url, status_code):
+    moves_cache.clear()
+    client = test_app.test_client()
+    resp = client.get(url)
+    assert resp.status_code == status_code
+    if status_code == 200:
+        assert resp.headers["ETag"]
+        assert "public" in resp.headers["Cache-Control"]
+        assert f"max-age={test_app.config['MOVES_CACHE_MAX_AGE']}" in (
+            resp.headers["Cache-Control"]
+        )
+    else:
+        assert "ETag" not in resp.headers
+        assert resp.headers["Cache-Control"] == "no-store"
+    assert moves_cache.info()["misses"] == 1
+
+    cached_resp = client.get(url)
+    assert cached_resp.status_code == status_code
+    assert cached_resp.data == resp.data
+    assert cached_resp.headers.get("ETag") == resp.headers.get("ETag")
+    assert cached_resp.headers["Cache-Control"] == resp.headers["Cache-Control"]
+    assert moves_cache.info()["hits"] == 1
+
+
+def test_cached_response_not_modified(test_app):
+    client = test_app.test_client()
+    resp = client.get("/api/v1/queen/d4/h8")
+    data = json.loads(resp.data.decode())
+    assert data["move"] == "valid"
+
+    resp = client.get(
+        "/api/v1/queen/d4/h8",
+        headers={"If-None-Match": resp.headers["ETag"]},
+    )
+    assert resp.status_code == 304
+    assert resp.data == b""
+
+
+def test_response_cache_eviction():
+    cache = ResponseCache(max_size=2)
+    cache.set(key="a", body=b"a", status=200)
+    cache.set(key="b", body=b"b", status=200)
+    assert cache.get(key="a").body == b"a"
+    cache.set(key="c", body=b"c", status=200)
+    assert cache.get(key="b") is None
+    assert cache.get(key="c").etag == cache.set(key="d", body=b"c", status=200).etag
+    assert cache.info() == {"hits": 2, "misses": 1, "size": 2, "maxSize": 2}
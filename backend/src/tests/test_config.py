@@ -12,3 +12,5 @@ def test_testing_config(test_app):
 def test_production_config(test_app):
     test_app.config.from_object("src.config.ProductionConfig")
     assert not test_app.config["TESTING"]
+    assert test_app.config["SERVER_WORKERS"] > 1
+    assert test_app.config["SERVER_THREADS"] >= 1
@@ -0,0 +1,182 @@
+import json
+import sys
+
+import pytest
+from src.api.figures.figure import Bishop, King, Knight, Pawn, Queen, Rook
+from src.api.figures.position import move_to_uci
+from src.api.figures.utils import (
+    SQUARE_MASKS,
+    field_to_square,
+    list_squares_from_mask,
+    square_to_field,
+)
+
+
+@pytest.mark.parametrize(
+    "figure_class",
+    [King, Knight, Rook, Bishop, Queen, Pawn],
+)
+def test_available_moves_table(figure_class):
+    assert len(figure_class.moves_masks) == 64
+    for square in range(64):
+        figure = figure_class(square=square)
+        moves = figure.list_available_moves()
+        assert isinstance(moves, tuple)
+        assert moves == list_squares_from_mask(mask=figure_class.moves_masks[square])
+        assert [figure.validate_move(dest_square=dest) for dest in range(64)] == [
+            dest in moves for dest in range(64)
+        ]
+
+
+@pytest.mark.parametrize(
+    "field, square",
+    [["a1", 0], ["h1", 7], ["a8", 56], ["h8", 63], ["d4", 27]],
+)
+def test_field_square_conversion(field, square):
+    assert field_to_square(field=field) == square
+    assert square_to_field(square=square) == field
+    assert SQUARE_MASKS[square] == 1 << square
+
+
+@pytest.mark.parametrize("field", ["a0", "i1", "h9", "d40", "", "a-1"])
+def test_invalid_field_conversion(field):
+    with pytest.raises(ValueError):
+        field_to_square(field=field)
+
+
+def king_rule(row_delta, col_delta, curr_row):
+    return max(abs(row_delta), abs(col_delta)) == 1
+
+
+def knight_rule(row_delta, col_delta, curr_row):
+    return {abs(row_delta), abs(col_delta)} == {1, 2}
+
+
+def rook_rule(row_delta, col_delta, curr_row):
+    return (row_delta == 0) != (col_delta == 0)
+
+
+def bishop_rule(row_delta, col_delta, curr_row):
+    return row_delta != 0 and abs(row_delta) == abs(col_delta)
+
+
+def queen_rule(row_delta, col_delta, curr_row):
+    return rook_rule(row_delta, col_delta, curr_row) or bishop_rule(
+        row_delta,
+        col_delta,
+        curr_row,
+    )
+
+
+def pawn_rule(row_delta, col_delta, curr_row):
+    if curr_row == 0 or col_delta != 0:
+        return False
+    return row_delta == 1 or (curr_row == 1 and row_delta == 2)
+
+
+@pytest.mark.parametrize(
+    "figure_class, rule",
+    [
+        [King, king_rule],
+        [Knight, knight_rule],
+        [Rook, rook_rule],
+        [Bishop, bishop_rule],
+        [Queen, queen_rule],
+        [Pawn, pawn_rule],
+    ],
+)
+def test_validate_move_matches_geometry(figure_class, rule):
+    for curr_square in range(64):
+        figure = figure_class(square=curr_square)
+        curr_row, curr_col = divmod(curr_square, 8)
+        for dest_square in range(64):
+            dest_row, dest_col = divmod(dest_square, 8)
+            assert figure.validate_move(dest_square=dest_square) == rule(
+                dest_row - curr_row,
+                dest_col - curr_col,
+                curr_row,
+            )
+
+
+@pytest.mark.parametrize(
+    "figure_class",
+    [King, Knight, Rook, Bishop, Queen, Pawn],
+)
+def test_figure_flyweight(figure_class):
+    figure = figure_class.at(square=27)
+    assert figure is figure_class.at(square=27)
+    assert figure is not figure_class.at(square=28)
+    assert figure.square == 27
+    assert not hasattr(figure, "__dict__")
+    with pytest.raises(AttributeError):
+        figure.square = 28
+    with pytest.raises(ValueError):
+        figure_class.at(square=64)
+
+
+def test_field_names_are_shared():
+    queen = Queen.at(square=field_to_square(field="d4"))
+    fields = queen.list_available_fields()
+    assert len(fields) == 27
+    for square, field in zip(queen.list_available_moves(), fields):
+        assert field is square_to_field(square=square)
+        assert field is sys.intern("".join(field))
+    assert queen.list_available_fields() is fields
+
+
+def test_uci_names_are_shared():
+    move = (field_to_square(field="e2"), field_to_square(field="e4"), None)
+    assert move_to_uci(move=move) == "e2e4"
+    assert move_to_uci(move=move) is move_to_uci(move=move)
+    assert move_to_uci(move=(52, 60, "Q")) == "e7e8q"
+
+
+@pytest.mark.parametrize(
+    "figure_class",
+    [King, Knight, Rook, Bishop, Queen, Pawn],
+)
+def test_origins_table(figure_class):
+    for dest_square in range(64):
+        origins = figure_class.at(square=dest_square).list_origins()
+        assert origins == tuple(
+            square
+            for square in range(64)
+            if figure_class.at(square=square).validate_move(dest_square=dest_square)
+        )
+
+
+@pytest.mark.parametrize(
+    "chess_figure, dest_field, board, origin_fields",
+    [
+        ["knight", "a1", "", ["c2", "b3"]],
+        ["pawn", "e4", "", ["e2", "e3"]],
+        ["pawn", "e1", "", []],
+        ["bishop", "a1", "", ["b2", "c3", "d4", "e5", "f6", "g7", "h8"]],
+        ["knight", "j10", "?board=10x10", ["i8", "h9"]],
+    ],
+)
+def test_origin_fields(test_app, chess_figure, dest_field, board, origin_fields):
+    client = test_app.test_client()
+    resp = client.get(f"/api/v1/{chess_figure}/{dest_field}/origins{board}")
+    data = json.loads(resp.data.decode())
+    assert resp.status_code == 200
+    assert data["originFields"] == origin_fields
+    assert data["destField"] == dest_field
+    assert data["error"] == "null"
+
+
+@pytest.mark.parametrize(
+    "url, status, error",
+    [
+        ["/api/v1/dragon/a1/origins", 404, "Chess figure - dragon - does not exist."],
+        ["/api/v1/knight/i9/origins", 409, "Field does not exist."],
+        ["/api/v1/knight/a1/origins?board=8", 400, "Board size is not valid."],
+    ],
+)
+def test_origin_fields_errors(test_app, url, status, error):
+    client = test_app.test_client()
+    resp = client.get(url)
+    data = json.loads(resp.data.decode())
+    assert resp.status_code == status
+    assert data["error"] == error
+    assert data["originFields"] == []
@@ -0,0 +1,61 @@
+import pytest
+from src.api.metrics import Histogram, metrics
+from src.api.moves.cache import moves_cache
+from src.tests.test_asgi import asgi_get
+
+
+@pytest.fixture
+def clean_metrics():
+    metrics.clear()
+    moves_cache.clear()
+    yield metrics
+    metrics.clear()
+
+
+def test_histogram_buckets():
+    histogram = Histogram(buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 5.0):
+        histogram.observe(value=value)
+    assert histogram.render(name="latency", labels='route="/"') == [
+        'latency_bucket{route="/",le="0.1"} 1',
+        'latency_bucket{route="/",le="1.0"} 2',
+        'latency_bucket{route="/",le="+Inf"} 3',
+        'latency_sum{route="/"} 5.55',
+        'latency_count{route="/"} 3',
+    ]
+
+
+def test_metrics_endpoint(test_app, clean_metrics):
+    client = test_app.test_client()
+    client.get("/api/v1/knight/d4")
+    client.get("/api/v1/knight/d4")
+    client.get("/api/v1/N/d4")
+    client.get("/api/v1/king/d4/d5")
+    client.get("/api/v1/dragon/d4")
+    client.get("/api/v1/position?fen=8/8/8/8/8/8/8/K6k%20w%20-%20-%200%201")
+
+    resp = client.get("/metrics")
+    text = resp.data.decode()
+    assert resp.status_code == 200
+    assert resp.content_type.startswith("text/plain; version=0.0.4")
+    assert 'chess_api_requests_total{figure="knight",status="200"} 3' in text
+    assert 'chess_api_requests_total{figure="king",status="200"} 1' in text
+    assert 'chess_api_requests_total{figure="unknown",status="404"} 1' in text
+    assert 'chess_api_requests_total{figure="",status="200"} 1' in text
+    assert (
+        "chess_api_request_duration_seconds_count{"
+        'route="/api/v1/<string:chess_figure>/<string:curr_field>",method="GET"} 4'
+    ) in text
+    assert 'chess_api_stage_duration_seconds_count{stage="engine"} 5' in text
+    assert 'chess_api_stage_duration_seconds_count{stage="serialization"} 5' in text
+    assert "chess_api_cache_hits_total 1" in text
+    assert "chess_api_cache_misses_total 4" in text
+    assert "chess_api_cache_hit_ratio 0.2" in text
+
+
+def test_asgi_metrics(test_app, clean_metrics):
+    asgi_get(test_app, "/api/v1/rook/a1")
+    status, headers, body = asgi_get(test_app, "/metrics")
+    assert status == 200
+    assert headers[b"content-type"].startswith(b"text/plain")
+    assert b'chess_api_requests_total{figure="rook",status="200"} 1' in body
@@ -0,0 +1,167 @@
+import json
+
+import pytest
+from src.api.figures.board import get_board
+from src.api.figures.figure import Bishop, King, Knight, Rook
+from src.api.figures.paths import (
+    get_distance,
+    get_shortest_path,
+    iter_shortest_paths,
+    list_reachable_squares,
+)
+from src.api.figures.utils import field_to_square
+
+
+@pytest.mark.parametrize(
+    "figure_class, curr_field, dest_field, expected",
+    [
+        [Knight, "b1", "h8", 5],
+        [Knight, "a1", "b2", 4],
+        [Knight, "d4", "d4", 0],
+        [King, "a1", "h8", 7],
+        [Rook, "a1", "h8", 2],
+        [Bishop, "a1", "h8", 1],
+        [Bishop, "a1", "h1", -1],
+    ],
+)
+def test_distance(figure_class, curr_field, dest_field, expected):
+    assert (
+        get_distance(
+            figure_class=figure_class,
+            square=field_to_square(field=curr_field),
+            dest_square=field_to_square(field=dest_field),
+        )
+        == expected
+    )
+
+
+def test_shortest_paths_are_legal_and_distinct():
+    square = field_to_square(field="b1")
+    dest_square = field_to_square(field="h8")
+    paths = list(
+        iter_shortest_paths(
+            figure_class=Knight,
+            square=square,
+            dest_square=dest_square,
+        ),
+    )
+    assert len(paths) == len(set(paths)) == 19
+    for path in paths:
+        assert len(path) == 6
+        assert (path[0], path[-1]) == (square, dest_square)
+        for step, next_step in zip(path, path[1:]):
+            assert next_step in Knight.available_moves_table[step]
+
+
+def test_shortest_path_of_unreachable_square():
+    assert (
+        get_shortest_path(
+            figure_class=Bishop,
+            square=field_to_square(field="a1"),
+            dest_square=field_to_square(field="a2"),
+        )
+        is None
+    )
+
+
+def test_reachable_squares():
+    square = field_to_square(field="a1")
+    assert list_reachable_squares(figure_class=Knight, square=square, moves=0) == ()
+    assert list_reachable_squares(figure_class=Knight, square=square, moves=1) == (
+        field_to_square(field="c2"),
+        field_to_square(field="b3"),
+    )
+    assert (
+        len(list_reachable_squares(figure_class=Knight, square=square, moves=6)) == 63
+    )
+    assert (
+        len(list_reachable_squares(figure_class=Bishop, square=square, moves=9)) == 31
+    )
+
+
+def test_distance_on_larger_board():
+    board = get_board(files=10, ranks=10)
+    assert (
+        get_distance(
+            figure_class=King,
+            square=board.field_to_square(field="a1"),
+            dest_square=board.field_to_square(field="j10"),
+            board=board,
+        )
+        == 9
+    )
+
+
+def test_shortest_paths_endpoint(test_app):
+    client = test_app.test_client()
+    resp = client.get("/api/v1/knight/b1/h8/path")
+    data = json.loads(resp.data.decode())
+    assert resp.status_code == 200
+    assert data["moves"] == 5
+    assert len(data["paths"]) == 1
+    assert data["paths"][0][0] == "b1"
+    assert data["paths"][0][-1] == "h8"
+
+    resp = client.get("/api/v1/knight/b1/h8/path?all=true")
+    data = json.loads(resp.data.decode())
+    assert len(data["paths"]) == 19
+
+
+def test_shortest_paths_endpoint_limit(test_app):
+    client = test_app.test_client()
+    resp = client.get("/api/v1/king/a1/h1/path?all=true")
+    data = json.loads(resp.data.decode())
+    assert resp.status_code == 200
+    assert data["moves"] == 7
+    assert len(data["paths"]) == test_app.config["SHORTEST_PATHS_LIMIT"]
+
+
+def test_shortest_paths_endpoint_unreachable(test_app):
+    client = test_app.test_client()
+    resp = client.get("/api/v1/bishop/a1/h1/path")
+    data = json.loads(resp.data.decode())
+    assert resp.status_code == 200
+    assert data["moves"] is None
+    assert data["paths"] == []
+    assert data["error"] == "Destination field is not reachable."
+
+
+@pytest.mark.parametrize(
+    "url, status, error",
+    [
+        ["/api/v1/dragon/a1/h1/path", 404, "Chess figure - dragon - does not exist."],
+        ["/api/v1/knight/a1/i9/path", 409, "Field does not exist."],
+        ["/api/v1/knight/a1/h1/path?board=1x", 400, "Board size is not valid."],
+        [
+            "/api/v1/knight/a1/reachable?moves=-1",
+            400,
+            "Moves must be a non-negative number.",
+        ],
+        ["/api/v1/knight/a1/reachable", 400, "Moves must be a non-negative number."],
+        [
+            "/api/v1/knight/a1/reachable?moves=²",
+            400,
+            "Moves must be a non-negative number.",
+        ],
+    ],
+)
+def test_paths_endpoint_errors(test_app, url, status, error):
+    client = test_app.test_client()
+    resp = client.get(url)
+    data = json.loads(resp.data.decode())
+    assert resp.status_code == status
+    assert data["error"] == error
+
+
+def test_reachable_fields_endpoint(test_app):
+    client = test_app.test_client()
+    resp = client.get("/api/v1/knight/a1/reachable?moves=1")
+    data = json.loads(resp.data.decode())
+    assert resp.status_code == 200
+    assert data["moves"] == 1
+    assert data["reachableFields"] == ["c2", "b3"]
+
+    resp = client.get("/api/v1/knight/i10/reachable?moves=1&board=10x10")
+    data = json.loads(resp.data.decode())
+    assert resp.status_code == 200
+    assert sorted(data["reachableFields"]) == ["g9", "h8", "j8"]
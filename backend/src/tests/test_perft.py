@@ -0,0 +1,97 @@
+import json
+
+import pytest
+from manage import perft_command
+from src.api.figures.perft import REFERENCE_POSITIONS, PerftLimitError, perft
+from src.api.figures.position import Position
+from src.api.figures.transposition import perft_table
+
+
+@pytest.mark.parametrize("name, fen, expected", REFERENCE_POSITIONS)
+def test_perft_reference_positions(name, fen, expected):
+    position = Position(fen=fen)
+    for depth, expected_nodes in enumerate(expected[:2], 1):
+        assert perft(position=position, depth=depth) == expected_nodes
+    assert position.to_fen() == fen
+
+
+def test_perft_endpoint(test_app):
+    perft_table.clear()
+    client = test_app.test_client()
+    name, fen, expected = REFERENCE_POSITIONS[1]
+    resp = client.get("/api/v1/position/perft", query_string={"fen": fen, "depth": 2})
+    data = json.loads(resp.data.decode())
+    assert resp.status_code == 200
+    assert data["fen"] == fen
+    assert data["depth"] == 2
+    assert data["nodes"] == expected[1]
+    assert data["nodesPerSecond"] > 0
+    assert data["error"] == "null"
+
+    resp = client.get("/api/v1/position/perft", query_string={"fen": fen, "depth": 2})
+    data = json.loads(resp.data.decode())
+    assert resp.status_code == 200
+    assert data["nodes"] == expected[1]
+    assert data["seconds"] is None
+    assert data["nodesPerSecond"] is None
+
+
+def test_perft_search_limit():
+    name, fen, expected = REFERENCE_POSITIONS[0]
+    position = Position(fen=fen)
+    assert perft(position=position, depth=2, search_limit=21) == expected[1]
+    with pytest.raises(PerftLimitError):
+        perft(position=position, depth=3, search_limit=21)
+    assert position.to_fen() == fen
+
+
+def test_perft_endpoint_search_limit(test_app, monkeypatch):
+    perft_table.clear()
+    monkeypatch.setitem(test_app.config, "PERFT_SEARCH_LIMIT", 10)
+    client = test_app.test_client()
+    name, fen, expected = REFERENCE_POSITIONS[0]
+    resp = client.get("/api/v1/position/perft", query_string={"fen": fen, "depth": 2})
+    data = json.loads(resp.data.decode())
+    assert resp.status_code == 400
+    assert data["nodes"] == 0
+    assert data["error"] == "Perft search limit reached."
+
+
+@pytest.mark.parametrize(
+    "fen, depth, error",
+    [
+        ["8/8/8/8/8/8/8/8 w - - 0 1", "a", "Depth must be a number from 0 to 3."],
+        ["8/8/8/8/8/8/8/8 w - - 0 1", "4", "Depth must be a number from 0 to 3."],
+        ["8/8/8/8/8/8/8/8 w - - 0 1", "-1", "Depth must be a number from 0 to 3."],
+        ["8/8/8/8/8/8/8/8 w - - 0 1", "²", "Depth must be a number from 0 to 3."],
+        ["8/8/8/8/8/8/8/8 x - - 0 1", "1", "FEN is not valid."],
+        ["4k3/8/4P3/3P4/8/8/8/4K3 w - e6 0 1", "2", "FEN is not valid."],
+    ],
+)
+def test_perft_endpoint_invalid(test_app, fen, depth, error):
+    client = test_app.test_client()
+    resp = client.get(
+        "/api/v1/position/perft",
+        query_string={"fen": fen, "depth": depth},
+    )
+    data = json.loads(resp.data.decode())
+    assert resp.status_code == 400
+    assert data["nodes"] == 0
+    assert data["error"] == error
+
+
+def test_perft_command(test_app):
+    runner = test_app.test_cli_runner()
+    result = runner.invoke(perft_command, ["--depth", "1"])
+    assert result.exit_code == 0
+    assert "FAIL" not in result.output
+    assert result.output.count(" ok") == len(REFERENCE_POSITIONS)
+
+    name, fen, expected = REFERENCE_POSITIONS[0]
+    result = runner.invoke(perft_command, ["--fen", fen, "--depth", "2"])
+    assert result.exit_code == 0
+    assert result.output.startswith(f"nodes {expected[1]} ")
+
+    result = runner.invoke(perft_command, ["--depth", "0"])
+    assert result.exit_code == 0
+    assert result.output == "total 0 nodes (0 nps)\n"
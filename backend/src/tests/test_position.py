@@ -0,0 +1,231 @@
+import json
+
+import pytest
+from src.api.figures.position import BLACK, WHITE, Position
+
+
+def get_piece(data, field):
+    return next(piece for piece in data["pieces"] if piece["currentField"] == field)
+
+
+def test_position_moves(test_app):
+    client = test_app.test_client()
+    fen = "8/8/3p4/8/1R1B1rk1/8/3P4/K7 w - - 0 1"
+    resp = client.get("/api/v1/position", query_string={"fen": fen})
+    data = json.loads(resp.data.decode())
+    assert resp.status_code == 200
+    assert data["fen"] == fen
+    assert data["error"] == "null"
+    assert len(data["pieces"]) == 7
+
+    rook = get_piece(data, "b4")
+    assert rook["figure"] == "rook"
+    assert rook["color"] == "white"
+    assert sorted(rook["availableMoves"]) == sorted(
+        ["b1", "b2", "b3", "a4", "c4", "b5", "b6", "b7", "b8"],
+    )
+    assert rook["captures"] == []
+
+    bishop = get_piece(data, "d4")
+    assert "b6" in bishop["availableMoves"]
+    assert "a7" in bishop["availableMoves"]
+    assert "c3" in bishop["availableMoves"]
+    assert "b2" in bishop["availableMoves"]
+    assert "a1" not in bishop["availableMoves"]
+
+    black_rook = get_piece(data, "f4")
+    assert black_rook["color"] == "black"
+    assert "e4" in black_rook["availableMoves"]
+    assert "g4" not in black_rook["availableMoves"]
+    assert black_rook["captures"] == ["d4"]
+
+
+@pytest.mark.parametrize(
+    "fen, field, available_moves, captures",
+    [
+        [
+            "7k/8/8/8/8/2p1p3/3P4/K7 w - - 0 1",
+            "d2",
+            ["c3", "d3", "d4", "e3"],
+            ["c3", "e3"],
+        ],
+        ["7k/8/8/8/8/3p4/3P4/K7 w - - 0 1", "d2", [], []],
+        ["7k/8/8/8/3p4/8/3P4/K7 w - - 0 1", "d2", ["d3"], []],
+        ["7k/3p4/8/8/8/8/8/K7 b - - 0 1", "d7", ["d5", "d6"], []],
+        ["7k/8/8/8/3p4/4P3/8/K7 b - - 0 1", "d4", ["d3", "e3"], ["e3"]],
+    ],
+)
+def test_position_pawn_moves(test_app, fen, field, available_moves, captures):
+    client = test_app.test_client()
+    resp = client.get("/api/v1/position", query_string={"fen": fen})
+    data = json.loads(resp.data.decode())
+    assert resp.status_code == 200
+    pawn = get_piece(data, field)
+    assert sorted(pawn["availableMoves"]) == available_moves
+    assert sorted(pawn["captures"]) == captures
+
+
+@pytest.mark.parametrize(
+    "fen",
+    [
+        "",
+        "8/8/8/8/8/8/8 w - - 0 1",
+        "8/8/8/8/8/8/8/9 w - - 0 1",
+        "8/8/8/8/8/8/8/7X w - - 0 1",
+        "8/8/8/8/8/8/8/P7 w - - 0 1",
+    ],
+)
+def test_position_invalid_fen(test_app, fen):
+    client = test_app.test_client()
+    resp = client.get("/api/v1/position", query_string={"fen": fen})
+    data = json.loads(resp.data.decode())
+    assert resp.status_code == 400
+    assert data["pieces"] == []
+    assert data["error"] == "FEN is not valid."
+
+
+@pytest.mark.parametrize(
+    "fen, side_to_move, check, legal_moves_count",
+    [
+        [
+            "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+            "white",
+            False,
+            20,
+        ],
+        [
+            "rnb1kbnr/pppp1ppp/8/4p3/6Pq/5P2/PPPPP2P/RNBQKBNR w KQkq - 1 3",
+            "white",
+            True,
+            0,
+        ],
+        [
+            "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq -",
+            "white",
+            False,
+            48,
+        ],
+        ["8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - -", "white", False, 14],
+        ["4k3/8/8/8/8/8/8/4K3 b - - 0 1", "black", False, 5],
+    ],
+)
+def test_legal_moves(test_app, fen, side_to_move, check, legal_moves_count):
+    client = test_app.test_client()
+    resp = client.get("/api/v1/position/legal-moves", query_string={"fen": fen})
+    data = json.loads(resp.data.decode())
+    assert resp.status_code == 200
+    assert data["fen"] == fen
+    assert data["error"] == "null"
+    assert data["sideToMove"] == side_to_move
+    assert data["check"] == check
+    assert len(data["legalMoves"]) == legal_moves_count
+
+
+@pytest.mark.parametrize(
+    "fen, included, excluded",
+    [
+        ["r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1", ["e1g1", "e1c1"], []],
+        ["r3k2r/8/8/8/8/8/8/R3K2R w - - 0 1", [], ["e1g1", "e1c1"]],
+        ["r3k2r/8/8/8/8/8/5r2/R3K2R w KQ - 0 1", ["e1c1"], ["e1g1"]],
+        ["4k3/8/8/3pP3/8/8/8/4K3 w - d6 0 1", ["e5d6"], []],
+        ["4k3/8/8/8/3Pp3/8/8/4K3 b - d3 0 1", ["e4d3", "e4e3"], []],
+        ["4k3/1P6/8/8/8/8/8/4K3 w - - 0 1", ["b7b8q", "b7b8r", "b7b8b", "b7b8n"], []],
+        ["4k3/4r3/8/8/8/8/4B3/4K3 w - - 0 1", [], ["e2d3", "e2f3"]],
+    ],
+)
+def test_legal_moves_special(test_app, fen, included, excluded):
+    client = test_app.test_client()
+    resp = client.get("/api/v1/position/legal-moves", query_string={"fen": fen})
+    data = json.loads(resp.data.decode())
+    assert resp.status_code == 200
+    for move in included:
+        assert move in data["legalMoves"]
+    for move in excluded:
+        assert move not in data["legalMoves"]
+
+
+@pytest.mark.parametrize(
+    "fen",
+    [
+        "8/8/8/8/8/8/8/8 x - - 0 1",
+        "8/8/8/8/8/8/8/8 w KX - 0 1",
+        "8/8/8/8/8/8/8/8 w - e5 0 1",
+        "8/8/8/8/8/8/3PP3/4K2k w - e3 0 1",
+        "8/8/8/8/8/8/8/8 b - e6 0 1",
+        "8/8/8/8/8/8/8/8 w - - a 1",
+        "4k3/8/8/4P3/8/8/8/4K3 w - e6 0 1",
+        "4k3/8/4P3/3P4/8/8/8/4K3 w - e6 0 1",
+        "4k3/8/8/3P4/8/8/8/4K3 w - e6 0 1",
+        "4k3/4p3/8/3Pp3/8/8/8/4K3 w - e6 0 1",
+        "8/8/8/8/8/8/8/4K3 w - - 0 1",
+        "4k3/8/8/8/8/8/8/3KK3 w - - 0 1",
+        "4k3/8/8/8/8/8/8/4K3 w K - 0 1",
+        "r3k3/8/8/8/8/8/8/R4K2 w Q - 0 1",
+        "4k2r/8/8/8/8/8/8/R3K3 w q - 0 1",
+    ],
+)
+def test_legal_moves_invalid_fen(test_app, fen):
+    client = test_app.test_client()
+    resp = client.get("/api/v1/position/legal-moves", query_string={"fen": fen})
+    data = json.loads(resp.data.decode())
+    assert resp.status_code == 400
+    assert data["legalMoves"] == []
+    assert data["error"] == "FEN is not valid."
+
+
+def get_square(data, field):
+    return next(square for square in data["squares"] if square["field"] == field)
+
+
+def test_attack_map(test_app):
+    client = test_app.test_client()
+    fen = "4k3/8/3p4/8/1R1B1rq1/8/3P4/K7 w - - 0 1"
+    resp = client.get("/api/v1/position/attacks", query_string={"fen": fen})
+    data = json.loads(resp.data.decode())
+    assert resp.status_code == 200
+    assert data["error"] == "null"
+    assert len(data["squares"]) == 64
+
+    e5 = get_square(data, "e5")
+    assert sorted(e5["whiteAttackers"]) == ["d4"]
+    assert sorted(e5["blackAttackers"]) == ["d6"]
+    assert (e5["whiteCount"], e5["blackCount"]) == (1, 1)
+
+    f5 = get_square(data, "f5")
+    assert sorted(f5["blackAttackers"]) == ["f4", "g4"]
+
+    d4 = get_square(data, "d4")
+    assert d4["piece"] == "B"
+    assert sorted(d4["whiteAttackers"]) == ["b4"]
+    assert sorted(d4["blackAttackers"]) == ["f4"]
+
+    c3 = get_square(data, "c3")
+    assert sorted(c3["whiteAttackers"]) == ["d2", "d4"]
+    assert get_square(data, "g4")["piece"] == "q"
+    assert get_square(data, "h7")["whiteCount"] == 0
+
+
+@pytest.mark.parametrize(
+    "fen",
+    [
+        "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+        "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+    ],
+)
+def test_attack_map_matches_attacked_squares(fen):
+    position = Position(fen=fen)
+    attackers = position.attack_map()
+    for color in (WHITE, BLACK):
+        for square in range(64):
+            assert bool(attackers[color][square]) == position.is_square_attacked(
+                square=square,
+                color=color,
+            )
+
+
+def test_attack_map_invalid_fen(test_app):
+    client = test_app.test_client()
+    resp = client.get("/api/v1/position/attacks", query_string={"fen": "8/8 w"})
+    data = json.loads(resp.data.decode())
+    assert resp.status_code == 400
+    assert data["error"] == "FEN is not valid."
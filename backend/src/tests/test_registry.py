@@ -0,0 +1,63 @@
+import json
+
+import pytest
+from src.api.figures.board import STANDARD_BOARD, Board
+from src.api.figures.figure import Figure, King
+from src.api.moves.cache import moves_cache
+from src.api.moves.utils import figures_registry, get_figure_class, register_figure
+
+
+class Wazir(Figure):
+    """Class of Wazir's fairy figure moving one square orthogonally"""
+
+    __slots__ = ()
+
+    betza = "W"
+
+    def __init__(self, square: int, board: Board = STANDARD_BOARD):
+        super(Wazir, self).__init__(square=square, board=board)
+
+
+@pytest.mark.parametrize(
+    "chess_figure, curr_field, dest_field",
+    [
+        ["King", "d4", "e5"],
+        ["KNIGHT", "d4", "f5"],
+        ["n", "d4", "f5"],
+        ["Q", "a1", "h8"],
+        ["♖", "a1", "a8"],
+        ["♝", "a1", "h8"],
+        ["♟", "a2", "a4"],
+    ],
+)
+def test_figure_aliases(test_app, chess_figure, curr_field, dest_field):
+    client = test_app.test_client()
+    resp = client.get(f"/api/v1/{chess_figure}/{curr_field}/{dest_field}")
+    data = json.loads(resp.data.decode())
+    assert resp.status_code == 200
+    assert data["figure"] == chess_figure
+    assert data["move"] == "valid"
+
+
+def test_register_figure(test_app):
+    client = test_app.test_client()
+    resp = client.get("/api/v1/wazir/a1")
+    assert resp.status_code == 404
+
+    register_figure(figure_class=Wazir, names=("wazir", "w"))
+    try:
+        assert get_figure_class(chess_figure="Wazir") is Wazir
+        resp = client.get("/api/v1/wazir/a1")
+        data = json.loads(resp.data.decode())
+        assert resp.status_code == 200
+        assert sorted(data["availableMoves"]) == ["a2", "b1"]
+        with pytest.raises(ValueError):
+            register_figure(figure_class=Wazir, names=("king",))
+        assert get_figure_class(chess_figure="king") is King
+        with pytest.raises(ValueError):
+            register_figure(figure_class=Wazir, names=("vazir", "king"))
+        assert get_figure_class(chess_figure="vazir") is None
+    finally:
+        del figures_registry["wazir"]
+        del figures_registry["w"]
+        moves_cache.clear()
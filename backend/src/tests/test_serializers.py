@@ -0,0 +1,50 @@
+import pytest
+from flask_restx import marshal
+from flask_restx.representations import output_json
+from src.api.moves.serializers import serialize
+from src.api.moves.utils import get_available_moves, get_move_validity
+from src.api.moves.views import available_moves_fields, move_validity_fields
+
+
+@pytest.mark.parametrize(
+    "chess_figure, curr_field, dest_field",
+    [
+        ["queen", "d4", "h8"],
+        ["queen", "d4", "h7"],
+        ["pawn", "a1", "a2"],
+        ["queeny", "d4", "h8"],
+        ["knight", "z9", "a1"],
+        ['kn"ight\\', "d4", "é5"],
+        ["♘", "d4", "\n"],
+    ],
+)
+def test_serialize_same_as_marshal(test_app, chess_figure, curr_field, dest_field):
+    for response_object, status, model in (
+        (
+            *get_move_validity(
+                chess_figure=chess_figure,
+                curr_field=curr_field,
+                dest_field=dest_field,
+            ),
+            move_validity_fields,
+        ),
+        (
+            *get_available_moves(chess_figure=chess_figure, curr_field=curr_field),
+            available_moves_fields,
+        ),
+    ):
+        expected = output_json(marshal(response_object, model), status).get_data()
+        assert serialize(response_object, model=model, status=status) == expected
+
+
+def test_serialize_debug_fallback(test_app):
+    response_object, status = get_available_moves(
+        chess_figure="king",
+        curr_field="a1",
+    )
+    test_app.debug = True
+    try:
+        body = serialize(response_object, model=available_moves_fields, status=status)
+    finally:
+        test_app.debug = False
+    assert body.startswith(b'{\n    "availableMoves": [')
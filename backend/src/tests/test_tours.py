@@ -0,0 +1,166 @@
+import json
+from itertools import islice
+
+import pytest
+from src.api.figures.board import get_board
+from src.api.figures.figure import (
+    Bishop,
+    King,
+    Knight,
+    Pawn,
+    Queen,
+    Rook,
+    create_figure_class,
+)
+from src.api.figures.tours import SearchLimitError, find_tour, iter_tours
+
+
+def check_tour(tour, figure_class, board, closed):
+    assert sorted(tour) == list(range(board.size))
+    for square, next_square in zip(tour, tour[1:]):
+        assert (
+            next_square
+            in figure_class.at(
+                square=square,
+                board=board,
+            ).list_available_moves()
+        )
+    if closed:
+        assert (
+            tour[0]
+            in figure_class.at(
+                square=tour[-1],
+                board=board,
+            ).list_available_moves()
+        )
+
+
+@pytest.mark.parametrize("square", [0, 1, 27, 36, 63])
+@pytest.mark.parametrize("closed", [False, True])
+def test_knight_tour(square, closed):
+    board = get_board(files=8, ranks=8)
+    tour = find_tour(square=square, closed=closed)
+    assert tour[0] == square
+    check_tour(tour=tour, figure_class=Knight, board=board, closed=closed)
+
+
+@pytest.mark.parametrize("figure_class", [King, Rook, Queen])
+def test_piece_tour(figure_class):
+    board = get_board(files=8, ranks=8)
+    tour = find_tour(square=0, figure_class=figure_class, closed=True)
+    check_tour(tour=tour, figure_class=figure_class, board=board, closed=True)
+
+
+def test_tours_are_distinct():
+    board = get_board(files=8, ranks=8)
+    tours = list(islice(iter_tours(square=0), 50))
+    assert len(tours) == len(set(tours)) == 50
+    for tour in tours:
+        check_tour(tour=tour, figure_class=Knight, board=board, closed=False)
+
+
+def test_tours_on_other_boards():
+    board = get_board(files=5, ranks=5)
+    tours = list(iter_tours(square=0, board=board, closed=True))
+    assert tours == []
+    tour = find_tour(square=0, board=board)
+    check_tour(tour=tour, figure_class=Knight, board=board, closed=False)
+    assert find_tour(square=0, board=get_board(files=4, ranks=4)) is None
+
+
+@pytest.mark.parametrize("figure_class", [Bishop, Pawn])
+def test_no_tour_of_unreachable_squares(figure_class):
+    assert find_tour(square=8, figure_class=figure_class) is None
+
+
+@pytest.mark.parametrize("betza, square", [["fWlN", 2], ["bWrN", 6], ["lWfN", 2]])
+def test_tour_of_directional_figure(betza, square):
+    figure_class = create_figure_class(name="Directional", betza=betza)
+    board = get_board(files=3, ranks=3)
+    tour = find_tour(square=square, figure_class=figure_class, board=board)
+    check_tour(tour=tour, figure_class=figure_class, board=board, closed=False)
+
+
+def test_tour_search_limit():
+    assert find_tour(square=0, search_limit=10) is None
+    assert find_tour(square=0, search_limit=63) is not None
+    tours = iter_tours(square=0, search_limit=100)
+    assert next(tours) is not None
+    with pytest.raises(SearchLimitError):
+        list(tours)
+
+
+def test_tour_of_single_square():
+    board = get_board(files=1, ranks=1)
+    assert list(iter_tours(square=0, board=board, closed=True)) == [(0,)]
+
+
+def test_tours_endpoint(test_app):
+    client = test_app.test_client()
+    resp = client.get("/api/v1/knight/a1/tours?tours=3&closed=true")
+    assert resp.status_code == 200
+    assert resp.mimetype == "application/x-ndjson"
+    lines = resp.data.decode().splitlines()
+    assert len(lines) == 3
+    for line in lines:
+        data = json.loads(line)
+        assert data["figure"] == "knight"
+        assert data["currentField"] == "a1"
+        assert data["error"] == "null"
+        assert len(set(data["tour"])) == 64
+        assert data["tour"][0] == "a1"
+        assert data["tour"][-1] in ("b3", "c2")
+
+
+def test_tours_endpoint_without_tours(test_app):
+    client = test_app.test_client()
+    resp = client.get("/api/v1/knight/a1/tours?board=4x4")
+    assert resp.status_code == 200
+    assert resp.data == b""
+
+
+def test_tours_endpoint_search_limit(test_app):
+    client = test_app.test_client()
+    search_limit = test_app.config["TOURS_SEARCH_LIMIT"]
+    test_app.config["TOURS_SEARCH_LIMIT"] = 100
+    try:
+        resp = client.get("/api/v1/knight/a1/tours?tours=100")
+    finally:
+        test_app.config["TOURS_SEARCH_LIMIT"] = search_limit
+    assert resp.status_code == 200
+    lines = [json.loads(line) for line in resp.data.decode().splitlines()]
+    assert all(len(line["tour"]) == 64 for line in lines[:-1])
+    assert lines[-1]["error"] == "Search limit reached."
+    assert lines[-1]["tour"] == []
+
+
+@pytest.mark.parametrize(
+    "url, status, error",
+    [
+        ["/api/v1/dragon/a1/tours", 404, "Chess figure - dragon - does not exist."],
+        ["/api/v1/knight/i9/tours", 409, "Field does not exist."],
+        ["/api/v1/knight/a1/tours?board=0x0", 400, "Board size is not valid."],
+        [
+            "/api/v1/knight/a1/tours?tours=0",
+            400,
+            "Tours must be a number from 1 to 100.",
+        ],
+        [
+            "/api/v1/knight/a1/tours?tours=a",
+            400,
+            "Tours must be a number from 1 to 100.",
+        ],
+        [
+            "/api/v1/knight/a1/tours?tours=²",
+            400,
+            "Tours must be a number from 1 to 100.",
+        ],
+    ],
+)
+def test_tours_endpoint_errors(test_app, url, status, error):
+    client = test_app.test_client()
+    resp = client.get(url)
+    data = json.loads(resp.data.decode())
+    assert resp.status_code == status
+    assert data["error"] == error
+    assert data["tour"] == []
@@ -0,0 +1,111 @@
+import random
+
+import pytest
+from src.api.figures.perft import REFERENCE_POSITIONS, perft
+from src.api.figures.position import Position
+from src.api.figures.transposition import (
+    TranspositionTable,
+    legal_moves_table,
+    lookup_legal_moves,
+)
+from src.api.figures.utils import field_to_square
+
+INITIAL_FEN = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+
+
+def play(position, *moves):
+    for move in moves:
+        position.make_move(
+            move=(
+                field_to_square(field=move[:2]),
+                field_to_square(field=move[2:]),
+                None,
+            ),
+        )
+
+
+@pytest.mark.parametrize("name, fen, expected", REFERENCE_POSITIONS)
+def test_incremental_hash(name, fen, expected):
+    position = Position(fen=fen)
+    initial_hash = position.hash
+    assert initial_hash == position.compute_hash()
+    rng = random.Random(name)
+    for _ in range(10):
+        played = 0
+        for _ in range(30):
+            moves = position.generate_legal_moves()
+            if not moves:
+                break
+            position.make_move(move=rng.choice(moves))
+            played += 1
+            assert position.hash == position.compute_hash()
+        for _ in range(played):
+            position.unmake_move()
+        assert position.hash == initial_hash
+
+
+def test_transpositions_share_hash():
+    first, second = Position(fen=INITIAL_FEN), Position(fen=INITIAL_FEN)
+    play(first, "g1f3", "g8f6", "b1c3")
+    play(second, "b1c3", "g8f6", "g1f3")
+    assert first.hash == second.hash
+    play(first, "f6g8", "f3g1", "g8f6", "g1f3")
+    assert first.hash == second.hash
+    play(first, "f6g8")
+    assert first.hash != second.hash
+
+
+def test_hash_distinguishes_state():
+    hashes = {
+        Position(fen=fen).hash
+        for fen in (
+            INITIAL_FEN,
+            "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR b KQkq - 0 1",
+            "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w Kkq - 0 1",
+            "rnbqkbnr/ppp1pppp/8/3pP3/8/8/PPPP1PPP/RNBQKBNR w KQkq d6 0 3",
+            "rnbqkbnr/ppp1pppp/8/3pP3/8/8/PPPP1PPP/RNBQKBNR w KQkq - 0 3",
+        )
+    }
+    assert len(hashes) == 5
+
+
+def test_replacement_policy():
+    table = TranspositionTable(size=4)
+    table.set(key=1, depth=3, value="deep")
+    table.set(key=5, depth=1, value="shallow")
+    assert table.get(key=1, depth=3) == "deep"
+    assert table.get(key=5, depth=1) == "shallow"
+    table.set(key=9, depth=2, value="newest")
+    assert table.get(key=1, depth=3) == "deep"
+    assert table.get(key=5, depth=1) is None
+    assert table.get(key=9, depth=2) == "newest"
+    assert table.get(key=1, depth=2) is None
+    table.set(key=13, depth=4, value="deeper")
+    assert table.get(key=13, depth=4) == "deeper"
+    assert table.info() == {"hits": 5, "misses": 2, "size": 2, "maxSize": 8}
+    table.clear()
+    assert table.get(key=13, depth=4) is None
+
+
+@pytest.mark.parametrize(
+    "name, fen, expected",
+    [REFERENCE_POSITIONS[0], REFERENCE_POSITIONS[2]],
+)
+def test_perft_with_table(name, fen, expected):
+    table = TranspositionTable(size=1024)
+    position = Position(fen=fen)
+    assert perft(position=position, depth=3, table=table) == expected[2]
+    assert perft(position=position, depth=3, table=table) == expected[2]
+    assert table.hits > 0
+
+
+def test_lookup_legal_moves():
+    legal_moves_table.clear()
+    position = Position(fen=INITIAL_FEN)
+    moves = lookup_legal_moves(position=position)
+    assert len(moves) == 20
+    assert "e2e4" in moves
+    assert lookup_legal_moves(position=position) == moves
+    assert legal_moves_table.info()["hits"] == 1
+    assert legal_moves_table.info()["maxSize"] == 2 * 4096
+    assert legal_moves_table.get(key=position.hash, depth=1) == " ".join(moves)
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+from src.api.figures.figure import Knight, Pawn
+from src.api.figures.vectorized import (
+    FIGURE_CODES,
+    FIGURES,
+    mobility_counts,
+    mobility_maps,
+    validity_masks,
+)
+
+
+def test_mobility_counts_match_figures():
+    rng = np.random.default_rng(seed=0)
+    figures = rng.integers(0, len(FIGURES), size=2000)
+    squares = rng.integers(0, 64, size=2000)
+    counts = mobility_counts(figures=figures, squares=squares)
+    assert counts.shape == (2000,)
+    assert counts.tolist() == [
+        len(FIGURES[figure].at(square=square).list_available_moves())
+        for figure, square in zip(figures.tolist(), squares.tolist())
+    ]
+
+
+def test_mobility_maps_match_figures():
+    figures = np.full(64, FIGURE_CODES[Knight])
+    maps = mobility_maps(figures=figures, squares=np.arange(64))
+    assert maps.shape == (64, 64)
+    for square in range(64):
+        assert (
+            tuple(np.flatnonzero(maps[square]))
+            == Knight.at(square=square).list_available_moves()
+        )
+
+
+def test_validity_masks_match_figures():
+    rng = np.random.default_rng(seed=1)
+    figures = rng.integers(0, len(FIGURES), size=2000)
+    squares = rng.integers(0, 64, size=2000)
+    dest_squares = rng.integers(0, 64, size=2000)
+    valid = validity_masks(figures=figures, squares=squares, dest_squares=dest_squares)
+    assert valid.dtype == bool
+    assert valid.tolist() == [
+        FIGURES[figure].at(square=square).validate_move(dest_square=dest)
+        for figure, square, dest in zip(
+            figures.tolist(), squares.tolist(), dest_squares.tolist()
+        )
+    ]
+
+
+def test_broadcast_samples():
+    counts = mobility_counts(figures=FIGURE_CODES[Pawn], squares=[0, 8, 16])
+    assert counts.tolist() == [0, 2, 1]
+
+
+@pytest.mark.parametrize(
+    "figures, squares, dest_squares",
+    [
+        [[0, -1], [0, 0], [1, 1]],
+        [[0, 99], [0, 0], [1, 1]],
+        [[0], [64], [1]],
+        [[0], [0], [64]],
+    ],
+)
+def test_invalid_samples(figures, squares, dest_squares):
+    with pytest.raises(ValueError):
+        validity_masks(figures=figures, squares=squares, dest_squares=dest_squares)